@@ -0,0 +1,60 @@
+"""Aggregation benchmark: time and peak memory to compute the sum, mean and standard deviation of a
+stream of masses.
+
+Compares a list of Mass reduced in Python with the operators of Quantity, the streaming
+aggregators fed by a generator (pyquantity.aggregation.aggregate), which keep only their state
+and one chunk, and the same aggregators fed by a QuantityArray.
+
+Usage (from the root of the repository):
+	python -m benchmarks.aggregation [--count N]
+"""
+import argparse
+import math
+import random
+import time
+import tracemalloc
+
+from pyquantity import QuantityArray
+from pyquantity.commonQuantity import Mass
+from pyquantity.aggregation import Sum, MeanVariance, aggregate
+
+
+def measure(name: str, run):
+	tracemalloc.start()
+	start = time.perf_counter()
+	run()
+	elapsed = time.perf_counter() - start
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	print(f"{name:<36}{elapsed * 1e3:>12,.1f}{peak / 2**20:>12,.2f}")
+
+
+def readings(count: int):
+	random.seed(0)
+	return (Mass(random.gauss(70., 10.)) for _ in range(count))
+
+
+def reduce_list(count: int):
+	masses = list(readings(count))
+	total = masses[0] * 0
+	for mass in masses:
+		total += mass
+	mean = total / len(masses)
+	deviation = math.sqrt(sum((mass - mean).value ** 2 for mass in masses) / len(masses))
+	return total, mean, deviation
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--count', type=int, default=500_000, help="number of readings")
+	args = parser.parse_args()
+	array = QuantityArray.from_quantities(readings(args.count))
+
+	print(f"{'aggregation':<36}{'ms':>12}{'peak MiB':>12}")
+	measure('list of Mass, Python loop', lambda: reduce_list(args.count))
+	measure('aggregate(generator)', lambda: aggregate(readings(args.count), Sum(), MeanVariance()))
+	measure('aggregators on a QuantityArray', lambda: (Sum().add(array), MeanVariance().add(array)))
+
+
+if __name__ == '__main__':
+	main()
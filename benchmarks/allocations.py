@@ -0,0 +1,76 @@
+"""Allocation benchmark of unary and in-place operations on quantities.
+
+For each operation, reports the time per operation, the number of memory blocks
+still allocated per operation (results kept alive) and the peak of temporary memory
+per operation (results discarded). The "deepcopy" rows reproduce the previous
+implementation of unary operations for comparison.
+
+Usage (from the root of the repository):
+	python -m benchmarks.allocations [--count N]
+"""
+import argparse
+import copy
+import operator
+import sys
+import time
+import tracemalloc
+
+from pyquantity.commonQuantity import Time
+
+
+def deepcopy_neg(q):
+	"""Unary operation as implemented before: deep copy of the quantity and of its unit"""
+	new = copy.deepcopy(q)
+	new._value = operator.neg(q._value)
+	return new
+
+
+def accumulate(q, count: int):
+	acc = Time(0.)
+	for _ in range(count):
+		acc += q
+	return acc
+
+
+def accumulate_scalar(count: int):
+	acc = Time(0.)
+	for _ in range(count):
+		acc += 1.5
+		acc *= 1.
+	return acc
+
+
+def measure(name: str, run, count: int):
+	"""'run(count)' must perform 'count' operations and return what it keeps alive"""
+	start = time.perf_counter()
+	run(count)
+	elapsed = time.perf_counter() - start
+
+	blocks = sys.getallocatedblocks()
+	kept = run(count)
+	retained = (sys.getallocatedblocks() - blocks) / count
+	del kept
+
+	tracemalloc.start()
+	run(count)
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	print(f"{name:<26}{elapsed / count * 1e9:>10.0f}{retained:>14.2f}{peak / count:>14.2f}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--count', type=int, default=100_000, help="number of operations per measure")
+	args = parser.parse_args()
+
+	q = Time(1.5)
+	print(f"{'operation':<26}{'ns/op':>10}{'blocks/op':>14}{'peak B/op':>14}")
+	measure('-q (deepcopy)', lambda n: [deepcopy_neg(q) for _ in range(n)], args.count)
+	measure('-q', lambda n: [-q for _ in range(n)], args.count)
+	measure('abs(q)', lambda n: [abs(q) for _ in range(n)], args.count)
+	measure('acc += q (loop)', lambda n: accumulate(q, n), args.count)
+	measure('acc += x; acc *= y (loop)', accumulate_scalar, args.count)
+
+
+if __name__ == '__main__':
+	main()
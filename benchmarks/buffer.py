@@ -0,0 +1,43 @@
+"""Buffer benchmark: time to wrap a block of float64 samples as quantities, and to export them.
+
+Compares one Quantity per sample, QuantityArray(values) (a copy) and QuantityArray.from_buffer
+(no copy), then float() per element with np.asarray (no copy).
+
+Usage (from the root of the repository):
+	python -m benchmarks.buffer [--megabytes N]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from pyquantity import BaseUnit, Quantity, QuantityArray
+
+
+def measure(name: str, run, megabytes: float):
+	start = time.perf_counter()
+	run()
+	elapsed = time.perf_counter() - start
+	print(f"{name:<40}{elapsed * 1e3:>12,.3f}{megabytes / elapsed:>14,.0f}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--megabytes', type=int, default=64, help="size of the block of samples")
+	args = parser.parse_args()
+
+	second = BaseUnit.second()
+	block = bytearray(np.random.default_rng(0).random(args.megabytes * 2**20 // 8).tobytes())
+	samples = memoryview(block).cast('d')
+	wrapped = QuantityArray.from_buffer(block, second)
+
+	print(f"{'operation':<40}{'ms':>12}{'MB/s':>14}")
+	measure('wrap: Quantity per sample', lambda: [Quantity(value, second) for value in samples], args.megabytes)
+	measure('wrap: QuantityArray(values)', lambda: QuantityArray(samples, second), args.megabytes)
+	measure('wrap: QuantityArray.from_buffer', lambda: QuantityArray.from_buffer(block, second), args.megabytes)
+	measure('export: float() per element', lambda: [float(quantity) for quantity in wrapped], args.megabytes)
+	measure('export: np.asarray', lambda: np.asarray(wrapped), args.megabytes)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,54 @@
+"""Converters benchmark: compiled conversion functions and prefix views against the accessors.
+
+Reads the values of a list of quantities in kilo with the accessor 'k' and with a PrefixView,
+converts floats from °F to K with Unit.convert_from and with a compiled converter, and an array
+with conversion.REGISTRY.convert and with a vectorized compiled converter.
+
+Usage (from the root of the repository):
+	python -m benchmarks.converters [--count N]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from pyquantity import PrefixEnum, BaseUnit, DerivedUnit
+from pyquantity.conversion import REGISTRY
+from pyquantity.commonQuantity import Lenght
+from pyquantity.converters import PrefixView, compile_converter
+
+
+def measure(name: str, run, count: int):
+	start = time.perf_counter()
+	run()
+	elapsed = time.perf_counter() - start
+	print(f"{name:<36}{elapsed / count * 1e9:>12,.1f}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--count', type=int, default=200_000, help="number of values")
+	args = parser.parse_args()
+
+	random.seed(0)
+	quantities = [Lenght(random.uniform(0., 1e4)) for _ in range(args.count)]
+	temperatures = [random.uniform(-40., 120.) for _ in range(args.count)]
+	array = np.array(temperatures)
+	kilo = PrefixView(PrefixEnum.kilo)
+	fahrenheit, kelvin = DerivedUnit.fahrenheit(), BaseUnit.kelvin()
+	to_kelvin = compile_converter(fahrenheit, kelvin)
+	to_kelvin_array = compile_converter(fahrenheit, kelvin, vectorized=True)
+
+	print(f"{'conversion':<36}{'ns/value':>12}")
+	measure('quantity.k', lambda: [quantity.k for quantity in quantities], args.count)
+	measure('PrefixView(kilo)(quantity)', lambda: [kilo(quantity) for quantity in quantities], args.count)
+	measure('PrefixView(kilo).values', lambda: kilo.values(quantities), args.count)
+	measure('kelvin.convert_from', lambda: [kelvin.convert_from(value, fahrenheit) for value in temperatures], args.count)
+	measure('compile_converter', lambda: [to_kelvin(value) for value in temperatures], args.count)
+	measure('REGISTRY.convert (array)', lambda: REGISTRY.convert(array, fahrenheit, kelvin), args.count)
+	measure('compile_converter (vectorized)', lambda: to_kelvin_array(array), args.count)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,57 @@
+"""pandas benchmark: a column of Quantity objects (object dtype) against a QuantityDtype column.
+
+Times a sort, a groupby mean, a comparison with a quantity and a conversion to another prefix of
+a column of lengths with mixed prefixes. With the object dtype, each step calls the operators of
+Quantity per element; with the QuantityDtype, it runs on the float64 values.
+
+Usage (from the root of the repository):
+	python -m benchmarks.dataframe [--count N] [--groups N]
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from pyquantity import Quantity, parse_quantity, parse_unit
+import pyquantity.pandasExtension  # noqa: F401, registers the dtype and the '.pq' accessor
+
+
+def measure(name: str, run):
+	start = time.perf_counter()
+	run()
+	elapsed = time.perf_counter() - start
+	print(f"{name:<40}{elapsed * 1e3:>12,.1f}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--count', type=int, default=200_000, help="number of quantities")
+	parser.add_argument('--groups', type=int, default=100, help="number of groups")
+	args = parser.parse_args()
+
+	random.seed(0)
+	units = [parse_unit(expression) for expression in ('mm', 'm', 'km')]
+	quantities = []
+	for _ in range(args.count):
+		prefix, unit = random.choice(units)
+		quantities.append(Quantity(random.uniform(0, 1e3), unit, prefix=prefix))
+	keys = [random.randrange(args.groups) for _ in range(args.count)]
+	threshold = parse_quantity('1 m')
+
+	objects = pd.DataFrame({'key': keys, 'length': pd.Series(quantities, dtype=object)})
+	typed = pd.DataFrame({'key': keys, 'length': pd.Series(quantities, dtype='quantity[m]')})
+
+	print(f"{'operation':<40}{'ms':>12}")
+	measure('object: sort_values', lambda: objects['length'].sort_values())
+	measure('quantity: sort_values', lambda: typed['length'].sort_values())
+	measure('object: groupby mean', lambda: objects.groupby('key')['length'].agg(lambda group: sum(group, Quantity(0., group.iloc[0].unit)) / len(group)))
+	measure('quantity: groupby mean', lambda: typed.groupby('key')['length'].mean())
+	measure('object: < 1 m', lambda: objects['length'] < threshold)
+	measure('quantity: < 1 m', lambda: typed['length'] < threshold)
+	measure('object: values in km', lambda: objects['length'].map(lambda quantity: quantity.k))
+	measure('quantity: values in km', lambda: typed['length'].pq.magnitude('k'))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,52 @@
+"""Expression benchmark: eager arithmetic on quantities compared with lazy expressions.
+
+The formula ((a + b) * 2 - a) / t is evaluated on QuantityArray of several sizes and on
+Quantity, eagerly (one temporary per operation) and with a compiled lazy expression.
+
+Usage (from the root of the repository):
+	python -m benchmarks.expression [--sizes 1000 100000 1000000] [--number N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from pyquantity import BaseUnit, Quantity, QuantityArray, lazy
+
+
+def formula(a, b, t):
+	return ((a + b) * 2 - a) / t
+
+
+def measure(name: str, function, number: int):
+	seconds = min(timeit.repeat(function, number=number, repeat=5)) / number
+	print(f"{name:<36}{seconds * 1e6:>14,.1f}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100_000, 1_000_000], help="sizes of arrays")
+	parser.add_argument('--number', type=int, default=20, help="evaluations per measure")
+	args = parser.parse_args()
+
+	metre, second = BaseUnit.metre(), BaseUnit.second()
+	print(f"{'evaluation':<36}{'µs/eval':>14}")
+
+	a, b, t = Quantity(1.5, metre, base_prefix='kilo'), Quantity(20., metre), Quantity(3., second)
+	expression = formula(*lazy(a, b, t))
+	expression.evaluate()
+	measure('scalars: eager', lambda: formula(a, b, t), args.number * 1000)
+	measure('scalars: lazy', expression.evaluate, args.number * 1000)
+
+	generator = np.random.default_rng(0)
+	for size in args.sizes:
+		a = QuantityArray(generator.random(size), metre, base_prefix='kilo')
+		b = QuantityArray(generator.random(size), metre)
+		t = QuantityArray(generator.random(size) + 1., second)
+		expression = formula(*lazy(a, b, t))
+		measure(f"{size:,} values: eager", lambda: formula(a, b, t), args.number)
+		measure(f"{size:,} values: lazy", expression.evaluate, args.number)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,57 @@
+"""Import time benchmark of the package, measured with `python -X importtime`.
+
+Compares `import pyquantity` (lazy submodules) with the import of the modules which
+`import pyquantity` loaded before the submodules were lazy (errors, unit, quantity and
+commonQuantity), and with the access to every lazy attribute, which also imports NumPy and
+pandas. The modules imported at the startup of the interpreter are not counted.
+
+Usage (from the root of the repository):
+	python -m benchmarks.import_time [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = {
+	'import pyquantity': "import pyquantity",
+	'import pyquantity + commonQuantity (before)': "import pyquantity.commonQuantity",
+	'import pyquantity + all attributes': "import pyquantity\nfor name in pyquantity._LAZY_ATTRIBUTES: getattr(pyquantity, name)",
+}
+
+
+def import_time(statement: str) -> float:
+	"""Return the cumulative import time (ms) of the modules imported by 'statement'"""
+	result = subprocess.run(
+		[sys.executable, '-X', 'importtime', '-c', statement],
+		cwd=ROOT, capture_output=True, text=True, check=True)
+	total = 0
+	for line in result.stderr.splitlines():
+		# "import time: self [us] | cumulative | imported package", top-level modules are not indented
+		if not line.startswith('import time:') or 'cumulative' in line:
+			continue
+		_, cumulative, name = line[len('import time:'):].split('|')
+		if not name.startswith('  '):
+			total += int(cumulative)
+	return total / 1000
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--repeat', type=int, default=10, help="number of interpreters started per measure")
+	args = parser.parse_args()
+
+	# modules imported by the interpreter at startup (site, encodings...)
+	startup = statistics.median(import_time('pass') for _ in range(args.repeat))
+	print(f"{'statement':<46}{'median (ms)':>12}{'min (ms)':>10}")
+	for name, statement in STATEMENTS.items():
+		times = [import_time(statement) - startup for _ in range(args.repeat)]
+		print(f"{name:<46}{statistics.median(times):>12.1f}{min(times):>10.1f}")
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,75 @@
+"""Ingestion benchmark: rows/sec to read columns of quantities from a CSV file.
+
+Compares a naive loop which builds one Quantity per cell with read_quantity_columns,
+which resolves units once per column and yields chunks.
+
+Usage (from the root of the repository):
+	python -m benchmarks.ingestion [--rows N] [--chunk-size N]
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+from pyquantity import Quantity, parse_unit, read_quantity_columns
+
+
+HEADER = ['time [ms]', 'distance [km]', 'mass [kg]']
+
+
+def write_csv(path: str, rows: int):
+	random.seed(0)
+	with open(path, 'w', newline='') as file:
+		writer = csv.writer(file)
+		writer.writerow(HEADER)
+		for _ in range(rows):
+			writer.writerow([f"{random.uniform(0, 1e3):.6f}" for _ in HEADER])
+
+
+def naive(path: str) -> int:
+	"""Split the unit of each header by hand and build a Quantity per cell"""
+	count = 0
+	with open(path, newline='') as file:
+		rows = csv.reader(file)
+		header = next(rows)
+		units = [parse_unit(cell[cell.index('[') + 1:-1]) for cell in header]
+		for row in rows:
+			quantities = [Quantity(float(cell), unit, prefix=prefix) for cell, (prefix, unit) in zip(row, units)]
+			count += 1
+	return count
+
+
+def chunked(path: str, chunk_size: int, as_array: bool) -> int:
+	count = 0
+	for chunk in read_quantity_columns(path, chunk_size=chunk_size, as_array=as_array):
+		count += len(chunk['time'])
+	return count
+
+
+def measure(name: str, run, rows: int):
+	start = time.perf_counter()
+	count = run()
+	elapsed = time.perf_counter() - start
+	assert count == rows, (count, rows)
+	print(f"{name:<36}{rows / elapsed:>14,.0f}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--rows', type=int, default=200_000, help="number of rows of the CSV file")
+	parser.add_argument('--chunk-size', type=int, default=65536, help="rows per chunk")
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory() as directory:
+		path = os.path.join(directory, 'data.csv')
+		write_csv(path, args.rows)
+		print(f"{'reader':<36}{'rows/sec':>14}")
+		measure('naive Quantity(...) per cell', lambda: naive(path), args.rows)
+		measure('read_quantity_columns (arrays)', lambda: chunked(path, args.chunk_size, True), args.rows)
+		measure('read_quantity_columns (quantities)', lambda: chunked(path, args.chunk_size, False), args.rows)
+
+
+if __name__ == '__main__':
+	main()
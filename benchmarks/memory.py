@@ -0,0 +1,66 @@
+"""Memory benchmark: bytes per instance of quantities and units.
+
+The "before" column measures the same classes without `__slots__` (a subclass that
+gets a `__dict__` per instance), the "after" column the classes of the package.
+The last line measures quantities built with a unit given as a str, which is interned.
+
+Usage (from the root of the repository):
+	python -m benchmarks.memory [--count N]
+"""
+import argparse
+import tracemalloc
+
+from pyquantity import Quantity, Unit, BaseUnit, DerivedUnit
+from pyquantity.commonQuantity import Time, Lenght, Mass, AbsoluteTemperature, CelsiusTemperature
+
+
+def with_dict(cls):
+	"""Return a subclass of 'cls' which has a __dict__, like the classes before __slots__"""
+	return type(cls.__name__, (cls,), {})
+
+
+FACTORIES = {
+	'Quantity': lambda cls: cls(1.5, BaseUnit.metre()),
+	'Time': lambda cls: cls(1.5),
+	'Lenght': lambda cls: cls(1.5),
+	'Mass': lambda cls: cls(1.5),
+	'AbsoluteTemperature': lambda cls: cls(1.5),
+	'CelsiusTemperature': lambda cls: cls(1.5),
+	'Unit': lambda cls: cls('Metre', 'm', description="The base unit of lenght"),
+	'BaseUnit': lambda cls: cls('Metre', 'm', description="The base unit of lenght"),
+	'DerivedUnit': lambda cls: cls('Celcius', '°C', description="The unit of Celcius temperature"),
+}
+
+CLASSES = (Quantity, Time, Lenght, Mass, AbsoluteTemperature, CelsiusTemperature, Unit, BaseUnit, DerivedUnit)
+
+
+def bytes_per_instance(factory, cls, count: int) -> float:
+	tracemalloc.start()
+	before = tracemalloc.get_traced_memory()[0]
+	instances = [factory(cls) for _ in range(count)]
+	after = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	# the list of instances holds one pointer per instance
+	return (after - before) / count - 8
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--count', type=int, default=100_000, help="number of instances created per class")
+	args = parser.parse_args()
+
+	print(f"{'class':<22}{'before (B)':>12}{'after (B)':>12}{'saved':>8}")
+	for cls in CLASSES:
+		factory = FACTORIES[cls.__name__]
+		before = bytes_per_instance(factory, with_dict(cls), args.count)
+		after = bytes_per_instance(factory, cls, args.count)
+		print(f"{cls.__name__:<22}{before:>12.1f}{after:>12.1f}{1 - after / before:>8.0%}")
+
+	# a unit given as a str is interned: all the quantities share one Unit
+	quantities = [Quantity(1.5, 'm') for _ in range(args.count)]
+	print(f"\nQuantity(1.5, 'm'): {bytes_per_instance(lambda cls: cls(1.5, 'm'), Quantity, args.count):.1f} B per instance, "
+		f"{len({id(quantity.unit) for quantity in quantities})} distinct Unit for {args.count} quantities")
+
+
+if __name__ == '__main__':
+	main()
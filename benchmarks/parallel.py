@@ -0,0 +1,47 @@
+"""Parallel benchmark: values/sec to convert and reduce a large QuantityArray.
+
+Compares the serial path (in the current process) with the process pool of
+pyquantity.parallel for several numbers of workers. The pool is created once, out of the measures.
+
+Usage (from the root of the repository):
+	python -m benchmarks.parallel [--values N] [--workers 1 2 4] [--chunk-size N]
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import time
+
+import numpy as np
+
+from pyquantity import BaseUnit, DerivedUnit, QuantityArray
+from pyquantity.parallel import DEFAULT_CHUNK_SIZE, parallel_convert, parallel_reduce
+
+
+def measure(name: str, run, values: int):
+	start = time.perf_counter()
+	run()
+	elapsed = time.perf_counter() - start
+	print(f"{name:<36}{values / elapsed:>16,.0f}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--values', type=int, default=20_000_000, help="number of values")
+	parser.add_argument('--workers', type=int, nargs='+', default=[2, 4], help="numbers of workers")
+	parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="values per chunk")
+	args = parser.parse_args()
+
+	temperatures = QuantityArray(np.random.default_rng(0).random(args.values) * 300., BaseUnit.kelvin())
+	celcius = DerivedUnit.celcius()
+
+	print(f"{'operation':<36}{'values/sec':>16}")
+	measure('convert: serial', lambda: parallel_convert(temperatures, celcius, chunk_size=args.chunk_size, workers=1), args.values)
+	measure('mean: serial', lambda: parallel_reduce(temperatures, 'mean', chunk_size=args.chunk_size, workers=1), args.values)
+	for workers in args.workers:
+		with ProcessPoolExecutor(max_workers=workers) as executor:
+			executor.submit(int).result()  # start the pool
+			measure(f"convert: {workers} workers", lambda: parallel_convert(temperatures, celcius, chunk_size=args.chunk_size, threshold=0, executor=executor), args.values)
+			measure(f"mean: {workers} workers", lambda: parallel_reduce(temperatures, 'mean', chunk_size=args.chunk_size, threshold=0, executor=executor), args.values)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,59 @@
+"""Serialization benchmark: size and round-trip time of quantities with pickle, JSON and the
+binary format of pyquantity.wire.
+
+Each quantity is serialized alone (one message per reading), then the whole batch at once.
+
+Usage (from the root of the repository):
+	python -m benchmarks.serialization [--count N]
+"""
+import argparse
+import json
+import pickle
+import random
+import time
+
+from pyquantity import Quantity, QuantityArray, get_unit
+from pyquantity.commonQuantity import Lenght
+from pyquantity.wire import pack, unpack
+
+
+def to_json(quantity: Quantity) -> dict:
+	return {'value': quantity.value, 'unit': quantity.unit.symbol, 'base_prefix': quantity.base_prefix.name}
+
+
+def from_json(data: dict) -> Quantity:
+	return Quantity(data['value'], get_unit(data['unit']), base_prefix=data['base_prefix'])
+
+
+def measure(name: str, dumps, loads, items, count: int):
+	start = time.perf_counter()
+	messages = [dumps(item) for item in items]
+	for message in messages:
+		loads(message)
+	elapsed = time.perf_counter() - start
+	size = sum(len(message) for message in messages)
+	print(f"{name:<32}{size / count:>16,.1f}{elapsed / count * 1e6:>16,.3f}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--count', type=int, default=100_000, help="number of quantities")
+	args = parser.parse_args()
+
+	random.seed(0)
+	quantities = [Lenght(random.uniform(0., 1e3)) for _ in range(args.count)]
+	array = QuantityArray.from_quantities(quantities)
+	dump_json = lambda data: json.dumps(data).encode('utf-8')
+
+	print(f"{'serialization':<32}{'bytes/quantity':>16}{'µs/quantity':>16}")
+	measure('pickle, one per quantity', pickle.dumps, pickle.loads, quantities, args.count)
+	measure('JSON, one per quantity', lambda q: dump_json(to_json(q)), lambda m: from_json(json.loads(m)), quantities, args.count)
+	measure('wire, one per quantity', pack, unpack, quantities, args.count)
+	measure('pickle, list', pickle.dumps, pickle.loads, [quantities], args.count)
+	measure('JSON, list', lambda qs: dump_json([to_json(q) for q in qs]), lambda m: [from_json(d) for d in json.loads(m)], [quantities], args.count)
+	measure('wire, list', pack, unpack, [quantities], args.count)
+	measure('wire, QuantityArray', pack, unpack, [array], args.count)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,43 @@
+"""Sorting benchmark: time to sort a list of quantities with mixed prefixes.
+
+Compares sorted() on the comparison operators, sorted() with Quantity.sort_key and
+sorted_quantities, which normalizes all the values in one pass then sorts plain floats.
+
+Usage (from the root of the repository):
+	python -m benchmarks.sorting [--count N]
+"""
+import argparse
+import random
+import time
+
+from pyquantity import Quantity, parse_unit
+from pyquantity.sorting import sorted_quantities
+
+
+def measure(name: str, run):
+	start = time.perf_counter()
+	run()
+	elapsed = time.perf_counter() - start
+	print(f"{name:<36}{elapsed * 1e3:>12,.1f}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--count', type=int, default=200_000, help="number of quantities")
+	args = parser.parse_args()
+
+	random.seed(0)
+	units = [parse_unit(expression) for expression in ('mm', 'm', 'km')]
+	quantities = []
+	for _ in range(args.count):
+		prefix, unit = random.choice(units)
+		quantities.append(Quantity(random.uniform(0, 1e3), unit, prefix=prefix))
+
+	print(f"{'sort':<36}{'ms':>12}")
+	measure('sorted() with __lt__', lambda: sorted(quantities))
+	measure('sorted(key=Quantity.sort_key)', lambda: sorted(quantities, key=Quantity.sort_key))
+	measure('sorted_quantities', lambda: sorted_quantities(quantities))
+
+
+if __name__ == '__main__':
+	main()
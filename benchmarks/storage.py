@@ -0,0 +1,63 @@
+"""Storage benchmark: size and time to save and open a column of quantities.
+
+Compares pickle of a list of Quantity (one Unit pickled per element), pickle of a QuantityArray
+and the column files of pyquantity.storage, opened with mmap and read by a slice.
+
+Usage (from the root of the repository):
+	python -m benchmarks.storage [--values N]
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+
+from pyquantity import BaseUnit, QuantityArray
+from pyquantity.storage import write_column, open_column
+
+
+def measure(name: str, run) -> float:
+	start = time.perf_counter()
+	run()
+	return time.perf_counter() - start
+
+
+def pickle_dump(path: str, obj):
+	with open(path, 'wb') as file:
+		pickle.dump(obj, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def pickle_load(path: str):
+	with open(path, 'rb') as file:
+		return pickle.load(file)
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--values', type=int, default=1_000_000, help="number of values of the column")
+	args = parser.parse_args()
+
+	lengths = QuantityArray(np.random.default_rng(0).random(args.values), BaseUnit.metre())
+	quantities = lengths.to_quantities()
+
+	print(f"{'format':<28}{'MB':>10}{'write ms':>12}{'open ms':>12}{'slice ms':>12}")
+	with tempfile.TemporaryDirectory() as directory:
+		cases = [
+			('pickle list of Quantity', lambda path: pickle_dump(path, quantities), pickle_load),
+			('pickle QuantityArray', lambda path: pickle_dump(path, lengths), pickle_load),
+			('column file (mmap)', lambda path: write_column(path, lengths), open_column),
+		]
+		for name, write, read in cases:
+			path = os.path.join(directory, name.replace(' ', '_'))
+			write_time = measure(name, lambda: write(path))
+			opened = []
+			open_time = measure(name, lambda: opened.append(read(path)))
+			slice_time = measure(name, lambda: opened[0][args.values // 2:args.values // 2 + 1000])
+			size = os.path.getsize(path) / 2**20
+			print(f"{name:<28}{size:>10.1f}{write_time * 1e3:>12.1f}{open_time * 1e3:>12.1f}{slice_time * 1e3:>12.3f}")
+
+
+if __name__ == '__main__':
+	main()
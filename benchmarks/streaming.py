@@ -0,0 +1,94 @@
+"""Streaming benchmark: conversion of readings put by concurrent producers in an event loop.
+
+Compares a conversion per reading in the producers (a Lenght built from each raw value) with a
+StreamConverter, which converts micro-batches in one vectorized step. The lag is the largest delay
+of a task scheduled every millisecond, i.e. the longest stall of the event loop.
+
+Usage (from the root of the repository):
+	python -m benchmarks.streaming [--count N] [--connections N]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from pyquantity import Quantity, parse_unit
+from pyquantity.commonQuantity import Lenght
+from pyquantity.streaming import StreamConverter
+
+
+SYMBOLS = ('mm', 'm', 'km')
+
+
+async def monitor(lags: list, stop: asyncio.Event):
+	"""Record the lateness of a 1 ms sleep until 'stop' is set"""
+	loop = asyncio.get_running_loop()
+	while not stop.is_set():
+		start = loop.time()
+		await asyncio.sleep(0.001)
+		lags.append(loop.time() - start - 0.001)
+
+
+async def per_reading(readings: list, connections: int) -> int:
+	units = {symbol: parse_unit(symbol) for symbol in SYMBOLS}
+	converted = []
+
+	async def connection(part):
+		for value, symbol in part:
+			prefix, unit = units[symbol]
+			converted.append(Lenght(Quantity(value, unit, prefix=prefix).value))
+			await asyncio.sleep(0)
+
+	await asyncio.gather(*(connection(readings[index::connections]) for index in range(connections)))
+	return len(converted)
+
+
+async def micro_batches(readings: list, connections: int) -> int:
+	converter = StreamConverter(Lenght)
+
+	async def connection(part):
+		for value, symbol in part:
+			await converter.put(value, symbol)
+			await asyncio.sleep(0)
+
+	async def produce():
+		await asyncio.gather(*(connection(readings[index::connections]) for index in range(connections)))
+		converter.close()
+
+	producers = asyncio.ensure_future(produce())
+	count = 0
+	async for batch in converter:
+		count += len(batch)
+	await producers
+	return count
+
+
+async def measure(name: str, function, readings: list, connections: int):
+	lags = []
+	stop = asyncio.Event()
+	watcher = asyncio.ensure_future(monitor(lags, stop))
+	start = time.perf_counter()
+	count = await function(readings, connections)
+	elapsed = time.perf_counter() - start
+	stop.set()
+	await watcher
+	print(f"{name:<28}{count / elapsed:>16,.0f}{max(lags, default=0.) * 1e3:>12,.2f}")
+
+
+async def run(args):
+	random.seed(0)
+	readings = [(random.uniform(0., 1e3), random.choice(SYMBOLS)) for _ in range(args.count)]
+	print(f"{'conversion':<28}{'readings/s':>16}{'lag (ms)':>12}")
+	await measure('one Lenght per reading', per_reading, readings, args.connections)
+	await measure('StreamConverter', micro_batches, readings, args.connections)
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--count', type=int, default=200_000, help="number of readings")
+	parser.add_argument('--connections', type=int, default=100, help="number of concurrent producers")
+	asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+	main()
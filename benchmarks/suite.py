@@ -0,0 +1,203 @@
+"""Benchmark suite of the hot paths of PyQuantity.
+
+Each benchmark reports operations per second (best of several repeats) and the memory
+allocated per operation. Results can be saved as JSON and compared with a stored baseline:
+the script exits with status 1 if a benchmark is slower than the baseline, or allocates more
+memory per operation, by more than the threshold. benchmarks/baseline.json is the reference
+baseline, produced with --save-baseline; speeds depend on the machine, so save a baseline on
+the machine which compares before relying on the ops/sec ratios.
+
+Usage (from the root of the repository):
+	python -m benchmarks.suite [--filter TEXT] [--output results.json]
+	python -m benchmarks.suite --save-baseline
+	python -m benchmarks.suite --compare [--baseline benchmarks/baseline.json] [--threshold 0.15]
+"""
+from typing import Callable, Dict, List, Tuple
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+
+from pyquantity import PrefixEnum, BaseUnit, DerivedUnit, Quantity
+from pyquantity.conversion import REGISTRY
+from pyquantity.converters import PrefixView, compile_converter
+from pyquantity.commonQuantity import Time, Mass, AbsoluteTemperature, CelsiusTemperature
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 0.15  # accepted slowdown (or growth of memory per operation) before a benchmark is a regression
+MEMORY_SLACK = 16.  # bytes per operation accepted above the baseline, for benchmarks which allocate nothing
+REPEAT = 5
+MEMORY_CALLS = 1000
+
+
+def benchmarks() -> List[Tuple[str, Callable[[], object]]]:
+	"""Return the (name, function) of benchmarks. Objects are built once, out of the measures."""
+	metre = BaseUnit.metre()
+	q1 = Quantity(10.3, metre)
+	q2 = Quantity(21.3, metre)
+	time_ = Time(3.)
+	kelvin = AbsoluteTemperature(300.)
+	celcius = CelsiusTemperature(20.)
+	to_kelvin = compile_converter(DerivedUnit.fahrenheit(), BaseUnit.kelvin())
+	kilo = PrefixView(PrefixEnum.kilo)
+
+	return [
+		# Quantity.__init__, one benchmark per branch
+		('init/no prefix', lambda: Quantity(10.5, metre)),
+		('init/prefix value 1', lambda: Quantity(10.5, metre, prefix=PrefixEnum.none)),
+		('init/base prefix', lambda: Quantity(10.5, metre, base_prefix=PrefixEnum.kilo, prefix=PrefixEnum.kilo)),
+		('init/other prefix', lambda: Quantity(10.5, metre, prefix=PrefixEnum.mili)),
+		('init/base prefix str', lambda: Quantity(10.5, metre, base_prefix='kilo')),
+		('init/Time', lambda: Time(10.5)),
+		('init/Mass', lambda: Mass(10.5)),
+		# PrefixEnum
+		('convert_value/Prefix', lambda: PrefixEnum.convert_value(10.5, to_=PrefixEnum.kilo, from_=PrefixEnum.mili)),
+		('convert_value/name', lambda: PrefixEnum.convert_value(10.5, to_='kilo', from_='mili')),
+		('convert_value/symbol', lambda: PrefixEnum.convert_value(10.5, to_='k', from_='m')),
+		('convert_value/value', lambda: PrefixEnum.convert_value(10.5, to_=1e3, from_=1e-3)),
+		('get_prefix/name', lambda: PrefixEnum.get_prefix('kilo')),
+		('get_prefix/symbol', lambda: PrefixEnum.get_prefix('k')),
+		('get_prefix/value', lambda: PrefixEnum.get_prefix(1e3)),
+		# prefix accessors
+		('accessor/k', lambda: q1.k),
+		('accessor/n', lambda: q1.n),
+		('accessor/none', lambda: q1.none),
+		('accessor/set k', lambda: setattr(q1, 'k', 2.)),
+		# conversion registry
+		('registry/lookup', lambda: REGISTRY.lookup(DerivedUnit.fahrenheit(), DerivedUnit.celcius())),
+		('registry/convert', lambda: REGISTRY.convert(70., DerivedUnit.fahrenheit(), DerivedUnit.celcius())),
+		('unit/conversion_to', lambda: metre.conversion_to(BaseUnit.meter())),
+		('hash/quantity', lambda: hash(q1)),
+		('sort_key', lambda: q1.sort_key()),
+		('converter/compiled', lambda: to_kelvin(70.)),
+		('converter/prefix_view', lambda: kilo(q1)),
+		# comparisons
+		('compare/quantity', lambda: q1 < q2),
+		('compare/equal', lambda: q1 == q2),
+		('compare/compatible class', lambda: time_ < Quantity(5., BaseUnit.second())),
+		# arithmetic
+		('arithmetic/add', lambda: q1 + q2),
+		('arithmetic/add float', lambda: q1 + 2.),
+		('arithmetic/mul float', lambda: q1 * 2.),
+		('arithmetic/mul quantity', lambda: q1 * time_),
+		# formatting
+		('format/str', lambda: str(q1)),
+		('format/repr', lambda: repr(q1)),
+		('format/str Mass', lambda: str(Mass(1.5))),
+		# temperatures of commonQuantity
+		('temperature/kelvin.celcius', lambda: kelvin.celcius),
+		('temperature/kelvin.fahrenheit', lambda: kelvin.fahrenheit),
+		('temperature/celcius.kelvin', lambda: celcius.kelvin),
+		('temperature/celcius.fahrenheit', lambda: celcius.fahrenheit),
+		('temperature/Celsius.from_kelvin', lambda: CelsiusTemperature.from_kelvin(300.)),
+		('temperature/Celsius.from_fahrenheit', lambda: CelsiusTemperature.from_fahrenheit(70.)),
+		('temperature/get_absolute_instance', lambda: celcius.get_absolute_instance()),
+		('temperature/from_absolute_instance', lambda: CelsiusTemperature.from_absolute_instance(kelvin)),
+	]
+
+
+def ops_per_second(function: Callable[[], object]) -> float:
+	timer = timeit.Timer(function)
+	number, _ = timer.autorange()
+	return number / min(timer.repeat(repeat=REPEAT, number=number))
+
+
+def bytes_per_operation(function: Callable[[], object]) -> float:
+	"""Return the peak of memory allocated per call, the results being kept alive"""
+	tracemalloc.start()
+	results = [function() for _ in range(MEMORY_CALLS)]
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	del results
+	# the list of results holds one pointer per call
+	return max(peak / MEMORY_CALLS - 8, 0.)
+
+
+def run(name_filter: str = None) -> Dict[str, Dict[str, float]]:
+	results = {}
+	for name, function in benchmarks():
+		if name_filter and name_filter not in name:
+			continue
+		results[name] = {
+			'ops_per_sec': ops_per_second(function),
+			'bytes_per_op': bytes_per_operation(function),
+		}
+		print(f"{name:<40}{results[name]['ops_per_sec']:>16,.0f}{results[name]['bytes_per_op']:>12.1f}")
+	return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+	"""Print the ratios of the speed and of the memory per operation of each benchmark to the
+	baseline and return the names of regressions
+	"""
+	regressions = []
+	print(f"\n{'benchmark':<40}{'baseline':>16}{'current':>16}{'ratio':>8}{'B/op':>10}{'B/op':>10}")
+	for name, result in results.items():
+		if name not in baseline:
+			continue
+		ratio = result['ops_per_sec'] / baseline[name]['ops_per_sec']
+		baseline_bytes = baseline[name].get('bytes_per_op')
+		flags = []
+		if ratio < 1 - threshold:
+			flags.append('SLOWER')
+		if baseline_bytes is not None and result['bytes_per_op'] > max(baseline_bytes * (1 + threshold), baseline_bytes + MEMORY_SLACK):
+			flags.append('MEMORY')
+		if flags:
+			regressions.append(name)
+		flag = f"  REGRESSION ({', '.join(flags)})" if flags else ''
+		bytes_ = f"{baseline_bytes:>10.1f}" if baseline_bytes is not None else f"{'-':>10}"
+		print(f"{name:<40}{baseline[name]['ops_per_sec']:>16,.0f}{result['ops_per_sec']:>16,.0f}{ratio:>8.2f}{bytes_}{result['bytes_per_op']:>10.1f}{flag}")
+	return regressions
+
+
+def save(path: str, results: Dict[str, Dict[str, float]]):
+	document = {
+		'python': sys.version,
+		'platform': platform.platform(),
+		'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+		'results': results,
+	}
+	with open(path, 'w') as file:
+		json.dump(document, file, indent=2)
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--filter', help="run only the benchmarks whose name contains this text")
+	parser.add_argument('--output', help="save the results in this JSON file")
+	parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="the JSON file of the baseline")
+	parser.add_argument('--save-baseline', action='store_true', help="save the results as the baseline")
+	parser.add_argument('--compare', action='store_true', help="compare the results with the baseline")
+	parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="accepted slowdown or growth of memory (0.15 = 15%%)")
+	args = parser.parse_args()
+
+	print(f"{'benchmark':<40}{'ops/sec':>16}{'B/op':>12}")
+	results = run(args.filter)
+
+	if args.output:
+		save(args.output, results)
+	if args.save_baseline:
+		save(args.baseline, results)
+		print(f"\nBaseline saved in {args.baseline}")
+
+	if args.compare:
+		if not os.path.exists(args.baseline):
+			print(f"\nNo baseline in {args.baseline}, run with --save-baseline first")
+			return 1
+		with open(args.baseline) as file:
+			baseline = json.load(file)['results']
+		regressions = compare(results, baseline, args.threshold)
+		if regressions:
+			print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+			return 1
+		print(f"\nNo regression above {args.threshold:.0%}")
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,44 @@
+"""Temperature benchmark: readings/sec to convert temperatures between K, °C and °F.
+
+Compares one instance per reading (from_* and properties) with the batch converters of
+commonQuantity, which apply one precomputed affine transform to a whole buffer.
+
+Usage (from the root of the repository):
+	python -m benchmarks.temperature [--readings N]
+"""
+from array import array
+import argparse
+import random
+import time
+
+import numpy  # imported by the batch converters on their first call, out of the measures
+
+from pyquantity import BaseUnit, DerivedUnit
+from pyquantity.commonQuantity import AbsoluteTemperature, CelsiusTemperature, convert_temperatures
+
+
+def measure(name: str, run, readings: int):
+	start = time.perf_counter()
+	run()
+	elapsed = time.perf_counter() - start
+	print(f"{name:<44}{readings / elapsed:>16,.0f}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--readings', type=int, default=1_000_000, help="number of readings")
+	args = parser.parse_args()
+
+	random.seed(0)
+	fahrenheit = array('d', (random.uniform(-40., 120.) for _ in range(args.readings)))
+	kelvin, celcius = BaseUnit.kelvin(), DerivedUnit.celcius()
+
+	print(f"{'conversion °F -> K -> °C':<44}{'readings/sec':>16}")
+	measure('instances: from_fahrenheit().celcius', lambda: [AbsoluteTemperature.from_fahrenheit(value).celcius for value in fahrenheit], args.readings)
+	measure('instances: CelsiusTemperature.from_fahrenheit', lambda: [CelsiusTemperature.from_fahrenheit(value).value for value in fahrenheit], args.readings)
+	measure('batch: two converters (°F -> K, K -> °C)', lambda: AbsoluteTemperature.to_celcius_array(AbsoluteTemperature.from_fahrenheit_array(fahrenheit)), args.readings)
+	measure('batch: collapsed chain', lambda: convert_temperatures(fahrenheit, DerivedUnit.fahrenheit(), kelvin, celcius), args.readings)
+
+
+if __name__ == '__main__':
+	main()
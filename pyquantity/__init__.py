@@ -1,5 +1,69 @@
+import importlib
+import os
+
 from . import errors
 from . import unit
-from .unit import Unit, BaseUnit, DerivedUnit, Prefix, PrefixEnum
+from . import conversion
+from .unit import Unit, BaseUnit, DerivedUnit, Prefix, PrefixEnum, BASE_UNITS, DERIVED_UNIT, intern_unit, get_unit
 from .quantity import Quantity
-from . import commonQuantity as common
\ No newline at end of file
+
+
+# attributes imported on first access (module, attribute of the module or None for the module itself),
+# so that 'import pyquantity' does not import NumPy, the common quantities, the parser...
+_LAZY_ATTRIBUTES = {
+	'common': ('.commonQuantity', None),
+	'commonQuantity': ('.commonQuantity', None),
+	'QuantityArray': ('.quantityArray', 'QuantityArray'),
+	'parse_quantity': ('.parser', 'parse_quantity'),
+	'parse_unit': ('.parser', 'parse_unit'),
+	'read_quantity_columns': ('.reader', 'read_quantity_columns'),
+	'format_quantity': ('.formatting', 'format_quantity'),
+	'format_quantities': ('.formatting', 'format_quantities'),
+	'instrumentation': ('.instrumentation', None),
+	'write_column': ('.storage', 'write_column'),
+	'open_column': ('.storage', 'open_column'),
+	'parallel_convert': ('.parallel', 'parallel_convert'),
+	'parallel_reduce': ('.parallel', 'parallel_reduce'),
+	'lazy': ('.expression', 'lazy'),
+	'Expression': ('.expression', 'Expression'),
+	'sorted_quantities': ('.sorting', 'sorted_quantities'),
+	'argsort': ('.sorting', 'argsort'),
+	'aggregation': ('.aggregation', None),
+	'aggregate': ('.aggregation', 'aggregate'),
+	'StreamConverter': ('.streaming', 'StreamConverter'),
+	'convert_stream': ('.streaming', 'convert_stream'),
+	'wire': ('.wire', None),
+	'compile_converter': ('.converters', 'compile_converter'),
+	'PrefixView': ('.converters', 'PrefixView'),
+	'QuantityDtype': ('.pandasExtension', 'QuantityDtype'),
+	'QuantityExtensionArray': ('.pandasExtension', 'QuantityExtensionArray'),
+}
+
+# modules of _LAZY_ATTRIBUTES which need an optional dependency (pandas), left out of 'import *'
+_OPTIONAL_MODULES = {'.pandasExtension'}
+
+__all__ = [
+	'errors', 'unit', 'conversion',
+	'Unit', 'BaseUnit', 'DerivedUnit', 'Prefix', 'PrefixEnum', 'BASE_UNITS', 'DERIVED_UNIT', 'intern_unit', 'get_unit',
+	'Quantity',
+] + [name for name, (module_name, _) in _LAZY_ATTRIBUTES.items() if module_name not in _OPTIONAL_MODULES]
+
+
+def __getattr__(name: str):
+	try:
+		module_name, attribute = _LAZY_ATTRIBUTES[name]
+	except KeyError:
+		raise AttributeError(f"module '{__name__}' has no attribute '{name}'") from None
+	module = importlib.import_module(module_name, __name__)
+	value = module if attribute is None else getattr(module, attribute)
+	globals()[name] = value
+	return value
+
+
+def __dir__():
+	return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+if os.environ.get('PYQUANTITY_INSTRUMENTATION'):
+	from . import instrumentation
+	instrumentation._enable_from_environment()
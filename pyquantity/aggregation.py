@@ -0,0 +1,412 @@
+"""Streaming aggregation of quantities in constant memory.
+
+The aggregators take Quantity or QuantityArray values one after the other and keep only their
+state: a compensated sum (Sum), the count, mean and variance of Welford (MeanVariance), the
+extrema (MinMax) and the counts of fixed bins (Histogram). Values are converted once, when they
+are added, in the unit of the aggregator (the unit of the first value by default) without prefix;
+the results are quantities of this unit, shown with the base prefix of the first value.
+
+Aggregators of the same kind are mergeable, so partitions of a stream can be aggregated
+separately (in threads, processes or days) and merged:
+
+	total, statistics = Sum(), MeanVariance()
+	aggregate(readings, total, statistics)  # an iterable of Quantity or QuantityArray, read once
+	statistics.merge(yesterday)
+	print(total.result(), statistics.mean(), statistics.std())
+"""
+from typing import Dict, Iterable, Tuple, Union
+import math
+
+import numpy as np
+
+from . import PrefixEnum, Unit
+from .unit import Prefix
+from .quantity import Quantity
+from .quantityArray import QuantityArray
+
+
+DEFAULT_CHUNK_SIZE = 1 << 16  # number of Quantity converted together by 'aggregate'
+
+
+class Aggregator:
+	"""Base class of the aggregators.
+
+	Subclasses implement '_add_value' (a float), '_add_values' (a float64 array, not empty) and
+	'_merge' (the state of another aggregator, converted by a transform), all in the unit of the
+	aggregator without prefix.
+	"""
+	__slots__ = ('_unit', '_base_prefix', '_cls', '_count', '_transforms')
+
+	def __init__(self, unit: Unit = None, base_prefix: Prefix = None):
+		"""
+		Parameters
+		----------
+		unit: the unit of the results (default: the unit of the first value)
+		base_prefix: the base prefix of the results (default: the base prefix of the first value)
+		"""
+		if unit is not None and not isinstance(unit, Unit):
+			raise ValueError(f"'unit' must be a Unit, not a {type(unit)}")
+		if base_prefix is not None and not isinstance(base_prefix, Prefix):
+			raise ValueError(f"'base_prefix' must be a Prefix, not a {type(base_prefix)}")
+		self._unit = unit
+		self._base_prefix = base_prefix
+		self._cls = None
+		self._count = 0
+		self._transforms: Dict[Unit, Tuple[float, float]] = {}
+
+	def __repr__(self) -> str:
+		"""repr(self)"""
+		symbol = '' if self._unit is None else f" in {self._unit.symbol}"
+		return f"<{type(self).__name__}: {self._count} values{symbol}>"
+
+	def __len__(self) -> int:
+		"""Number of values added"""
+		return self._count
+
+	def add(self, quantities: Union[Quantity, QuantityArray]) -> 'Aggregator':
+		"""Add a Quantity or the values of a QuantityArray and return self"""
+		if isinstance(quantities, Quantity):
+			scale, offset = self._transform(quantities)
+			self._count += 1
+			self._add_value(quantities._value * scale + offset)
+		elif isinstance(quantities, QuantityArray):
+			scale, offset = self._transform(quantities)
+			if len(quantities) != 0:
+				values = quantities._values
+				if scale != 1 or offset != 0:
+					values = values * scale + offset
+				self._count += len(values)
+				self._add_values(values)
+		else:
+			raise ValueError(f"Can't aggregate a {type(quantities)}")
+		return self
+
+	def extend(self, quantities: Iterable[Union[Quantity, QuantityArray]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'Aggregator':
+		"""Add the quantities of an iterable, converted by chunks (see 'aggregate'), and return self"""
+		aggregate(quantities, self, chunk_size=chunk_size)
+		return self
+
+	def merge(self, other: 'Aggregator') -> 'Aggregator':
+		"""Add the state of another aggregator of the same kind (its values are converted in the unit
+		of self) and return self
+		"""
+		if type(other) is not type(self):
+			raise ValueError(f"Can't merge a {type(other).__name__} in a {type(self).__name__}")
+		if other._unit is None:
+			return self
+		scale, offset = self._bind(other._unit, other._base_prefix, other._cls)
+		self._count += other._count
+		self._merge(other, scale, offset)
+		return self
+
+	def _bind(self, unit: Unit, base_prefix: Prefix, cls: type) -> Tuple[float, float]:
+		"""Take the unit, the base prefix and the class of the results from the first values if they
+		are not defined, and return the transform from 'unit' to the unit of self
+		"""
+		if self._unit is None:
+			self._unit = unit
+		transform = self._conversion(unit)
+		if self._cls is None:
+			self._cls = cls if unit is self._unit else Quantity
+		if self._base_prefix is None:
+			self._base_prefix = base_prefix
+		return transform
+
+	def _transform(self, quantities: Union[Quantity, QuantityArray]) -> Tuple[float, float]:
+		if self._cls is None:
+			return self._bind(quantities._unit, quantities._base_prefix, type(quantities) if isinstance(quantities, Quantity) else Quantity)
+		return self._conversion(quantities._unit)
+
+	def _conversion(self, unit: Unit) -> Tuple[float, float]:
+		"""Return the transform from 'unit' to the unit of self, looked up once per unit"""
+		transform = self._transforms.get(unit)
+		if transform is None:
+			if not self._unit.is_compatible(unit):
+				raise ValueError(f"Can't aggregate '{unit}' with '{self._unit}'")
+			transform = self._transforms[unit] = unit.conversion_to(self._unit)
+		return transform
+
+	def _quantity(self, value: float, unit: Unit = None) -> Quantity:
+		"""Return a result of the aggregator, a value without prefix in its unit (or 'unit')"""
+		if self._unit is None:
+			raise ValueError(f"The unit of the {type(self).__name__} is not defined: no value was added")
+		if unit is None:
+			base_prefix = PrefixEnum.none if self._base_prefix is None else self._base_prefix
+			return (self._cls or Quantity)._new(value, self._unit, base_prefix)
+		return Quantity._new(value, unit, PrefixEnum.none)
+
+	def _check_not_empty(self, name: str):
+		if self._count == 0:
+			raise ValueError(f"Can't compute the {name} of no value")
+
+	def _add_value(self, value: float):
+		raise NotImplementedError
+
+	def _add_values(self, values: np.ndarray):
+		raise NotImplementedError
+
+	def _merge(self, other: 'Aggregator', scale: float, offset: float):
+		raise NotImplementedError
+
+	@property
+	def unit(self) -> Union[Unit, None]:
+		return self._unit
+
+	@property
+	def base_prefix(self) -> Union[Prefix, None]:
+		return self._base_prefix
+
+	@property
+	def count(self) -> int:
+		return self._count
+
+
+class Sum(Aggregator):
+	"""Sum compensated with the algorithm of Neumaier: the rounding error of each addition is kept in
+	a second float, so the result does not drift with the number of values. The values of an
+	array are added by NumPy (pairwise summation) and their total is added with compensation.
+	"""
+	__slots__ = ('_sum', '_compensation')
+
+	def __init__(self, unit: Unit = None, base_prefix: Prefix = None):
+		Aggregator.__init__(self, unit, base_prefix)
+		self._sum = 0.
+		self._compensation = 0.
+
+	def _add_value(self, value: float):
+		total = self._sum + value
+		if abs(self._sum) >= abs(value):
+			self._compensation += (self._sum - total) + value
+		else:
+			self._compensation += (value - total) + self._sum
+		self._sum = total
+
+	def _add_values(self, values: np.ndarray):
+		self._add_value(float(np.sum(values)))
+
+	def _merge(self, other: 'Sum', scale: float, offset: float):
+		self._add_value(other._sum * scale + other._count * offset)
+		self._add_value(other._compensation * scale)
+
+	def result(self) -> Quantity:
+		"""Return the sum (0 without value, if the unit is given)"""
+		return self._quantity(self._sum + self._compensation)
+
+
+class MeanVariance(Aggregator):
+	"""Count, mean and sum of squared differences to the mean, updated with the algorithm of
+	Welford for a value and with the formula of Chan et al. for an array or a merge.
+	"""
+	__slots__ = ('_mean', '_m2')
+
+	def __init__(self, unit: Unit = None, base_prefix: Prefix = None):
+		Aggregator.__init__(self, unit, base_prefix)
+		self._mean = 0.
+		self._m2 = 0.
+
+	def _add_value(self, value: float):
+		delta = value - self._mean
+		self._mean += delta / self._count
+		self._m2 += delta * (value - self._mean)
+
+	def _add_values(self, values: np.ndarray):
+		mean = float(np.mean(values))
+		deviations = values - mean
+		self._combine(len(values), mean, float(np.dot(deviations, deviations)))
+
+	def _merge(self, other: 'MeanVariance', scale: float, offset: float):
+		if other._count != 0:
+			self._combine(other._count, other._mean * scale + offset, other._m2 * scale * scale)
+
+	def _combine(self, count: int, mean: float, m2: float):
+		"""Combine the state with the one of 'count' other values ('_count' already includes them)"""
+		previous = self._count - count
+		delta = mean - self._mean
+		self._mean += delta * count / self._count
+		self._m2 += m2 + delta * delta * previous * count / self._count
+
+	def mean(self) -> Quantity:
+		self._check_not_empty('mean')
+		return self._quantity(self._mean)
+
+	def variance(self, ddof: int = 0) -> Quantity:
+		"""Return the variance, a Quantity in the square of the unit (of its differences for a unit
+		with an offset: K^2 for °C, see Unit.difference_unit).
+		'ddof' is the delta of degrees of freedom: 0 for the population, 1 for a sample.
+		"""
+		variance = self._variance(ddof)
+		return self._quantity(variance, self._unit.difference_unit() ** 2)
+
+	def std(self, ddof: int = 0) -> Quantity:
+		"""Return the standard deviation, in the unit of the aggregator (of its differences for a unit
+		with an offset: a spread in K for °C, see 'variance')
+		"""
+		std = math.sqrt(self._variance(ddof))
+		if self._unit.offset == 0:
+			return self._quantity(std)
+		return self._quantity(std, self._unit.difference_unit())
+
+	def _variance(self, ddof: int) -> float:
+		if self._count <= ddof:
+			raise ValueError(f"Can't compute the variance of {self._count} values with ddof={ddof}")
+		return self._m2 / (self._count - ddof)
+
+
+class MinMax(Aggregator):
+	"""Minimum and maximum values. NaN values are ignored (the results are NaN if all the values are NaN)."""
+	__slots__ = ('_min', '_max')
+
+	def __init__(self, unit: Unit = None, base_prefix: Prefix = None):
+		Aggregator.__init__(self, unit, base_prefix)
+		self._min = math.nan
+		self._max = math.nan
+
+	def _add_value(self, value: float):
+		# the extrema are NaN until the first value which is not NaN
+		if value < self._min or self._min != self._min:
+			self._min = value
+		if value > self._max or self._max != self._max:
+			self._max = value
+
+	def _add_values(self, values: np.ndarray):
+		self._add_value(float(np.fmin.reduce(values)))
+		self._add_value(float(np.fmax.reduce(values)))
+
+	def _merge(self, other: 'MinMax', scale: float, offset: float):
+		if other._count != 0:
+			self._add_value(other._min * scale + offset)
+			self._add_value(other._max * scale + offset)
+
+	def minimum(self) -> Quantity:
+		self._check_not_empty('minimum')
+		return self._quantity(self._min)
+
+	def maximum(self) -> Quantity:
+		self._check_not_empty('maximum')
+		return self._quantity(self._max)
+
+
+class Histogram(Aggregator):
+	"""Counts of values in 'bins' bins of the same width between 'low' and 'high' (a value equal to
+	'high' is in the last bin), with the counts of values below and above.
+	"""
+	__slots__ = ('_low', '_high', '_bins', '_factor', '_counts', '_underflow', '_overflow')
+
+	def __init__(self, low: Quantity, high: Quantity, bins: int):
+		"""
+		Parameters
+		----------
+		low: the lower edge of the first bin, which gives the unit and the base prefix of the histogram
+		high: the upper edge of the last bin, in a unit compatible with 'low'
+		bins: the number of bins
+		"""
+		if not isinstance(low, Quantity) or not isinstance(high, Quantity):
+			raise ValueError(f"'low' and 'high' must be Quantity, not {type(low)} and {type(high)}")
+		if not isinstance(bins, int) or bins <= 0:
+			raise ValueError(f"'bins' must be a positive int, not {bins}")
+		Aggregator.__init__(self, low._unit, low._base_prefix)
+		self._cls = type(low)
+		self._low = low._value
+		scale, offset = self._conversion(high._unit)
+		self._high = high._value * scale + offset
+		if not self._low < self._high:
+			raise ValueError(f"'low' must be lower than 'high', not {low} and {high}")
+		self._bins = bins
+		self._factor = bins / (self._high - self._low)
+		self._counts = np.zeros(bins, dtype=np.int64)
+		self._underflow = 0
+		self._overflow = 0
+
+	def _add_value(self, value: float):
+		if self._low <= value <= self._high:
+			self._counts[min(int((value - self._low) * self._factor), self._bins - 1)] += 1
+		elif value < self._low:
+			self._underflow += 1
+		elif value > self._high:
+			self._overflow += 1
+
+	def _add_values(self, values: np.ndarray):
+		below = values < self._low
+		above = values > self._high
+		self._underflow += int(np.count_nonzero(below))
+		self._overflow += int(np.count_nonzero(above))
+		inside = values[(values >= self._low) & (values <= self._high)]
+		indexes = ((inside - self._low) * self._factor).astype(np.intp)
+		np.minimum(indexes, self._bins - 1, out=indexes)
+		self._counts += np.bincount(indexes, minlength=self._bins)
+
+	def _merge(self, other: 'Histogram', scale: float, offset: float):
+		if other._bins != self._bins or not (math.isclose(other._low * scale + offset, self._low) and math.isclose(other._high * scale + offset, self._high)):
+			raise ValueError("Can't merge histograms with different bins")
+		self._counts += other._counts
+		self._underflow += other._underflow
+		self._overflow += other._overflow
+
+	@property
+	def counts(self) -> np.ndarray:
+		"""The number of values in each bin (a copy)"""
+		return self._counts.copy()
+
+	@property
+	def edges(self) -> QuantityArray:
+		"""The 'bins' + 1 edges of the bins"""
+		return QuantityArray._new(np.linspace(self._low, self._high, self._bins + 1), self._unit, self._base_prefix)
+
+	@property
+	def underflow(self) -> int:
+		"""The number of values lower than 'low'"""
+		return self._underflow
+
+	@property
+	def overflow(self) -> int:
+		"""The number of values greater than 'high'"""
+		return self._overflow
+
+
+def aggregate(quantities: Iterable[Union[Quantity, QuantityArray]], *aggregators: Aggregator, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[Aggregator, ...]:
+	"""Feed the aggregators with an iterable of Quantity and QuantityArray, read once, and return them.
+
+	Consecutive Quantity are converted in the unit of the first one (each unit is looked up once)
+	and added to the aggregators as a QuantityArray of at most 'chunk_size' values, so the memory
+	used does not depend on the length of the stream.
+	"""
+	if not isinstance(chunk_size, int) or chunk_size <= 0:
+		raise ValueError(f"'chunk_size' must be a positive int, not {chunk_size}")
+	values = []
+	first = None
+	transforms: Dict[Unit, Tuple[float, float]] = {}
+
+	def flush():
+		chunk = QuantityArray._new(np.array(values, dtype=np.float64), first._unit, first._base_prefix)
+		for aggregator in aggregators:
+			if aggregator._cls is None:
+				aggregator._bind(first._unit, first._base_prefix, type(first))
+			aggregator.add(chunk)
+		values.clear()
+
+	for quantity in quantities:
+		if isinstance(quantity, QuantityArray):
+			if values:
+				flush()
+			for aggregator in aggregators:
+				aggregator.add(quantity)
+			continue
+		if not isinstance(quantity, Quantity):
+			raise ValueError(f"Can't aggregate a {type(quantity)}")
+		if not values:
+			first = quantity
+		unit = quantity._unit
+		if unit is first._unit:
+			values.append(quantity._value)
+		else:
+			transform = transforms.get((unit, first._unit))
+			if transform is None:
+				if not first._unit.is_compatible(unit):
+					raise ValueError(f"Can't aggregate '{unit}' with '{first._unit}'")
+				transform = transforms[(unit, first._unit)] = unit.conversion_to(first._unit)
+			values.append(quantity._value * transform[0] + transform[1])
+		if len(values) >= chunk_size:
+			flush()
+	if values:
+		flush()
+	return aggregators
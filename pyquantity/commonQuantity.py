@@ -1,38 +1,99 @@
 """Module with common quantities"""
-from . import Quantity, BaseUnit, DerivedUnit, PrefixEnum, Prefix
+from typing import Tuple
+
+from . import Quantity, Unit, BaseUnit, DerivedUnit, PrefixEnum, Prefix
 from . import errors
 
 
 class Time(Quantity):
-	
+	__slots__ = ()
+
 	def __init__(self, value: float, prefix: Prefix = PrefixEnum.none):
 		Quantity.__init__(self, value, unit=BaseUnit.second(), base_prefix=PrefixEnum.none, prefix=prefix)
 
 
 class Lenght(Quantity):
-	
+	__slots__ = ()
+
 	def __init__(self, value: float, prefix: Prefix = PrefixEnum.none):
 		Quantity.__init__(self, value, unit=BaseUnit.metre(), base_prefix=PrefixEnum.none, prefix=prefix)
 
 
 class Mass(Quantity):
-	
+	__slots__ = ()
+
 	def __init__(self, value: float, prefix: Prefix = PrefixEnum.kilo):
 		Quantity.__init__(self, value, unit=BaseUnit.gram(), base_prefix=PrefixEnum.kilo, prefix=prefix)
 
 
 class Velocity(Quantity):
-	
+	__slots__ = ()
+
 	def __init__(self, value: float, prefix: Prefix = PrefixEnum.none):
-		raise NotImplemented
+		Quantity.__init__(self, value, unit=DerivedUnit.metre_per_second(), base_prefix=PrefixEnum.none, prefix=prefix)
+
+
+TRANSFORM_BLOCK_SIZE = 4096  # values per block of the batch temperature conversions (32 KiB, in the L1/L2 cache)
+
+
+def temperature_transform(*units: Unit) -> Tuple[float, float]:
+	"""Return the (scale, offset) of the chain of conversions between temperature units
+	(kelvin, celcius, fahrenheit...): a value 'v' of the first unit is 'v * scale + offset' in the last one.
+	A chain like °F -> K -> °C collapses into one affine transform.
+	"""
+	if len(units) < 2:
+		raise ValueError("A conversion needs at least two units")
+	scale, offset = 1., 0.
+	for from_, to_ in zip(units, units[1:]):
+		step_scale, step_offset = from_.conversion_to(to_)
+		scale, offset = scale * step_scale, offset * step_scale + step_offset
+	return scale, offset
+
+
+def convert_temperatures(values, *units: Unit, out=None):
+	"""Convert a sequence or a buffer of temperatures through a chain of units and return a float64 array.
+	The chain is collapsed into one affine transform, applied in place in the result.
+
+	Parameters
+	----------
+	values: a sequence, an array or an object with the buffer protocol (array('d')...)
+	units: the unit of values, then the next units of the chain (the last one is the unit of the result)
+	out: an optional float64 array for the result, which can be 'values' itself
+	"""
+	return _apply_transform(values, temperature_transform(*units), out)
+
+
+def _apply_transform(values, transform: Tuple[float, float], out=None):
+	"""Return values * scale + offset in 'out'. The multiplication and the addition are done block by
+	block of TRANSFORM_BLOCK_SIZE values, so the values are read and written once from the memory: a
+	block is still in the CPU cache when the offset is added.
+	"""
+	import numpy as np
+	scale, offset = transform
+	values = np.asarray(values, dtype=np.float64)
+	if out is None:
+		out = np.empty_like(values)
+	if offset == 0:
+		return np.multiply(values, scale, out=out)
+	if values.shape != out.shape or not out.flags.c_contiguous:
+		# no flat view of 'out': two passes over the whole array
+		np.multiply(values, scale, out=out)
+		return np.add(out, offset, out=out)
+	flat_values, flat_out = values.reshape(-1), out.reshape(-1)
+	for start in range(0, flat_out.shape[0], TRANSFORM_BLOCK_SIZE):
+		block = flat_out[start:start + TRANSFORM_BLOCK_SIZE]
+		np.multiply(flat_values[start:start + TRANSFORM_BLOCK_SIZE], scale, out=block)
+		np.add(block, offset, out=block)
+	return out
 
 
 class AbsoluteTemperature(Quantity):
+	__slots__ = ()
 
 	ORIGIN_CELCIUS = -273.15
 	ORIGIN_FAHRENHEIT = -459.67
 	
-	def __init__(self, value: flaot, prefix: Prefix = PrefixEnum.none):
+	def __init__(self, value: float, prefix: Prefix = PrefixEnum.none):
 		Quantity.__init__(self, value, unit=BaseUnit.kelvin(), base_prefix=PrefixEnum.none, prefix=prefix)
 
 	@property
@@ -41,7 +102,7 @@ class AbsoluteTemperature(Quantity):
 
 	@property
 	def fahrenheit(self) -> float:
-		return self._value + self.ORIGIN_FAHRENHEIT
+		return 1.8 * self._value + self.ORIGIN_FAHRENHEIT
 
 	@celcius.setter
 	def celcius(self, new_value: float):
@@ -49,19 +110,40 @@ class AbsoluteTemperature(Quantity):
 
 	@fahrenheit.setter
 	def fahrenheit(self, new_value: float):
-		self.value = new_value - self.ORIGIN_FAHRENHEIT
+		self.value = (new_value - self.ORIGIN_FAHRENHEIT) / 1.8
 
 	@classmethod
 	def from_celcius(cls, value: float):
-		return AbsoluteTemperature(value - self.ORIGIN_CELCIUS)
+		return cls(value - cls.ORIGIN_CELCIUS)
 
 	@classmethod
 	def from_fahrenheit(cls, value: float):
-		return AbsoluteTemperature(value - self.ORIGIN_FAHRENHEIT)
+		return cls((value - cls.ORIGIN_FAHRENHEIT) / 1.8)
+
+	@staticmethod
+	def to_celcius_array(values, out=None):
+		"""Convert temperatures in kelvin (a sequence or a buffer) to an array in Celcius"""
+		return _apply_transform(values, _KELVIN_TO_CELCIUS, out)
+
+	@staticmethod
+	def to_fahrenheit_array(values, out=None):
+		"""Convert temperatures in kelvin (a sequence or a buffer) to an array in Fahrenheit"""
+		return _apply_transform(values, _KELVIN_TO_FAHRENHEIT, out)
+
+	@staticmethod
+	def from_celcius_array(values, out=None):
+		"""Convert temperatures in Celcius (a sequence or a buffer) to an array in kelvin"""
+		return _apply_transform(values, _CELCIUS_TO_KELVIN, out)
+
+	@staticmethod
+	def from_fahrenheit_array(values, out=None):
+		"""Convert temperatures in Fahrenheit (a sequence or a buffer) to an array in kelvin"""
+		return _apply_transform(values, _FAHRENHEIT_TO_KELVIN, out)
 
 
 class CelsiusTemperature(Quantity):
-	
+	__slots__ = ()
+
 	def __init__(self, value: float):
 		Quantity.__init__(self, value, unit=DerivedUnit.celcius(), base_prefix=PrefixEnum.none, prefix=PrefixEnum.none)
 
@@ -71,6 +153,14 @@ class CelsiusTemperature(Quantity):
 	def set_value_from_prefix(self, new_value: float, prefix: Prefix):
 		raise errors.NoPrefixSupported()
 
+	@property
+	def value(self) -> float:
+		return self._value
+
+	@value.setter
+	def value(self, new_value: float):
+		self._value = float(new_value)
+
 	@property
 	def kelvin(self) -> float:
 		return self._value - AbsoluteTemperature.ORIGIN_CELCIUS
@@ -85,7 +175,7 @@ class CelsiusTemperature(Quantity):
 
 	@fahrenheit.setter
 	def fahrenheit(self, new_value: float):
-		self.value = 5/9 (new_value - 32.)
+		self.value = 5/9 * (new_value - 32.)
 
 	def get_absolute_instance(self) -> AbsoluteTemperature:
 		return AbsoluteTemperature(self.kelvin)
@@ -96,7 +186,7 @@ class CelsiusTemperature(Quantity):
 
 	@classmethod
 	def from_fahrenheit(cls, value: float):
-		return cls(5/9 (value - 32.))
+		return cls(5/9 * (value - 32.))
 
 	@classmethod
 	def from_absolute_instance(cls, temperature: AbsoluteTemperature):
@@ -104,4 +194,43 @@ class CelsiusTemperature(Quantity):
 			raise ValueError(f"'temperature' must be an instance of AbsoluteTemperature, not {type(temperature)}")
 		return cls(temperature.celcius)
 
-
+	@staticmethod
+	def to_kelvin_array(values, out=None):
+		"""Convert temperatures in Celcius (a sequence or a buffer) to an array in kelvin"""
+		return _apply_transform(values, _CELCIUS_TO_KELVIN, out)
+
+	@staticmethod
+	def to_fahrenheit_array(values, out=None):
+		"""Convert temperatures in Celcius (a sequence or a buffer) to an array in Fahrenheit"""
+		return _apply_transform(values, _CELCIUS_TO_FAHRENHEIT, out)
+
+	@staticmethod
+	def from_kelvin_array(values, out=None):
+		"""Convert temperatures in kelvin (a sequence or a buffer) to an array in Celcius"""
+		return _apply_transform(values, _KELVIN_TO_CELCIUS, out)
+
+	@staticmethod
+	def from_fahrenheit_array(values, out=None):
+		"""Convert temperatures in Fahrenheit (a sequence or a buffer) to an array in Celcius"""
+		return _apply_transform(values, _FAHRENHEIT_TO_CELCIUS, out)
+
+
+# (scale, offset) of the conversions between temperature units, computed once
+_KELVIN_TO_CELCIUS = temperature_transform(BaseUnit.kelvin(), DerivedUnit.celcius())
+_KELVIN_TO_FAHRENHEIT = temperature_transform(BaseUnit.kelvin(), DerivedUnit.fahrenheit())
+_CELCIUS_TO_KELVIN = temperature_transform(DerivedUnit.celcius(), BaseUnit.kelvin())
+_CELCIUS_TO_FAHRENHEIT = temperature_transform(DerivedUnit.celcius(), DerivedUnit.fahrenheit())
+_FAHRENHEIT_TO_KELVIN = temperature_transform(DerivedUnit.fahrenheit(), BaseUnit.kelvin())
+_FAHRENHEIT_TO_CELCIUS = temperature_transform(DerivedUnit.fahrenheit(), DerivedUnit.celcius())
+
+
+# class and base prefix of the common quantities, by unit
+QUANTITY_CLASSES = {
+	BaseUnit.second(): (Time, PrefixEnum.none),
+	BaseUnit.metre(): (Lenght, PrefixEnum.none),
+	BaseUnit.meter(): (Lenght, PrefixEnum.none),
+	BaseUnit.gram(): (Mass, PrefixEnum.kilo),
+	BaseUnit.kelvin(): (AbsoluteTemperature, PrefixEnum.none),
+	DerivedUnit.celcius(): (CelsiusTemperature, PrefixEnum.none),
+	DerivedUnit.metre_per_second(): (Velocity, PrefixEnum.none),
+}
@@ -0,0 +1,160 @@
+"""Registry of affine conversions between units.
+
+Each registered pair of units maps to a transform (scale, offset): a value 'v' of the first unit
+is 'v * scale + offset' in the second one. The registry keeps the transitive closure of the
+registered pairs, so the conversion between any two connected units is one lookup and one
+multiply-add. The closure is updated incrementally: registering a pair which connects two groups
+of units computes only the transforms between these two groups.
+
+The default registry REGISTRY holds the units of BASE_UNITS and DERIVED_UNIT (each unit connected
+to the other units of its dimension by its scale and offset) and is used by 'Unit.conversion_to'.
+
+	REGISTRY.register(rankine, kelvin, scale=5/9)
+	REGISTRY.convert(values, rankine, fahrenheit)  # a float or an array
+"""
+from typing import Dict, Iterable, List, Tuple, Union
+import math
+import threading
+
+from . import errors
+
+
+Transform = Tuple[float, float]  # (scale, offset)
+
+IDENTITY: Transform = (1., 0.)
+
+
+def compose(first: Transform, second: Transform) -> Transform:
+	"""Return the transform which applies 'first', then 'second'"""
+	return first[0] * second[0], first[1] * second[0] + second[1]
+
+
+def inverse(transform: Transform) -> Transform:
+	"""Return the transform which undoes 'transform'"""
+	scale, offset = transform
+	return 1. / scale, -offset / scale if offset != 0 else 0.
+
+
+class ConversionRegistry:
+	"""Affine transforms between units, with their transitive closure.
+
+	'_transforms[a][b]' is the transform from 'a' to 'b' for every pair of connected units,
+	so '_transforms[a]' also gives the group of units connected to 'a'. Each group has a
+	representative unit, the one of the larger group when two groups are connected.
+	"""
+
+	def __init__(self):
+		self._transforms: Dict['Unit', Dict['Unit', Transform]] = {}
+		self._representatives: Dict['Unit', 'Unit'] = {}
+		self._lock = threading.Lock()
+		self._version = 0  # incremented when the closure changes
+
+	def __len__(self) -> int:
+		"""Number of registered units"""
+		return len(self._transforms)
+
+	def __contains__(self, unit) -> bool:
+		"""unit in self"""
+		return unit in self._transforms
+
+	def register(self, from_: 'Unit', to_: 'Unit', scale: float = 1., offset: float = 0.):
+		"""Register the conversion 'v * scale + offset' from 'from_' to 'to_' (and its inverse).
+
+		If the units are already connected, the transform must agree with the known one, else a
+		ConversionError is raised.
+		"""
+		scale, offset = float(scale), float(offset)
+		if scale == 0 or not math.isfinite(scale) or not math.isfinite(offset):
+			raise ValueError(f"'scale' must be a finite non-zero number and 'offset' a finite number, not {scale} and {offset}")
+		transform = (scale, offset)
+
+		with self._lock:
+			from_group = self._group(from_)
+			to_group = self._group(to_)
+			known = from_group.get(to_)
+			if known is not None:
+				if not (math.isclose(known[0], scale) and math.isclose(known[1], offset, abs_tol=1e-9)):
+					raise errors.ConversionError(f"The conversion from '{from_}' to '{to_}' is already {known}, not {transform}")
+				return
+
+			# x -> from_ -> to_ -> y for every x connected to from_ and y connected to to_
+			sources = [(unit, self._transforms[unit][from_]) for unit in from_group]
+			targets = list(to_group.items())
+			if len(from_group) > len(to_group):
+				representative, others = self._representatives[from_], to_group
+			else:
+				representative, others = self._representatives[to_], from_group
+			for unit in list(others):
+				self._representatives[unit] = representative
+			for source, source_to_from in sources:
+				source_to_target = compose(source_to_from, transform)
+				for target, to_to_target in targets:
+					forward = compose(source_to_target, to_to_target)
+					self._transforms[source][target] = forward
+					self._transforms[target][source] = inverse(forward)
+			self._version += 1
+
+	def register_units(self, units: Iterable['Unit']):
+		"""Register units by their scale and offset: each unit with a dimension is connected to the
+		units of the same dimension, a unit without dimension is only added to the registry.
+		"""
+		references: Dict[tuple, 'Unit'] = {}
+		for unit in units:
+			dimension = unit.dimension
+			if dimension is None:
+				with self._lock:
+					self._group(unit)
+				continue
+			reference = references.setdefault(dimension, unit)
+			if reference is unit or reference in self._transforms.get(unit, ()):
+				with self._lock:
+					self._group(unit)
+				continue
+			self.register(unit, reference, unit.scale / reference.scale, (unit.offset - reference.offset) / reference.scale)
+
+	def lookup(self, from_: 'Unit', to_: 'Unit') -> Union[Transform, None]:
+		"""Return the transform from 'from_' to 'to_', None if the units are not connected"""
+		transforms = self._transforms.get(from_)
+		if transforms is None:
+			return None
+		return transforms.get(to_)
+
+	def get_transform(self, from_: 'Unit', to_: 'Unit') -> Transform:
+		"""Return the transform from 'from_' to 'to_', raise a ConversionError if the units are not connected"""
+		transform = self.lookup(from_, to_)
+		if transform is None:
+			raise errors.ConversionError(f"No conversion from '{from_}' to '{to_}'")
+		return transform
+
+	def is_connected(self, from_: 'Unit', to_: 'Unit') -> bool:
+		return self.lookup(from_, to_) is not None
+
+	def canonical(self, unit: 'Unit') -> Union[Tuple['Unit', Transform], None]:
+		"""Return the representative unit of the group of 'unit' and the transform to it, None if
+		'unit' is not registered. Connected units have the same representative.
+		"""
+		representative = self._representatives.get(unit)
+		if representative is None:
+			return None
+		return representative, self._transforms[unit][representative]
+
+	def connected_units(self, unit: 'Unit') -> List['Unit']:
+		"""Return the units which can be converted from and to 'unit' (itself included)"""
+		return list(self._transforms.get(unit, ()))
+
+	def convert(self, value, from_: 'Unit', to_: 'Unit'):
+		"""Convert 'value' (a float or an array) from 'from_' to 'to_'"""
+		scale, offset = self.get_transform(from_, to_)
+		return value * scale + offset
+
+	def _group(self, unit: 'Unit') -> Dict['Unit', Transform]:
+		"""Return the transforms from 'unit', adding it to the registry if needed (with the lock held)"""
+		transforms = self._transforms.get(unit)
+		if transforms is None:
+			transforms = self._transforms[unit] = {unit: IDENTITY}
+			self._representatives[unit] = unit
+		return transforms
+
+
+# the registry of BASE_UNITS and DERIVED_UNIT, seeded by the module unit
+REGISTRY = ConversionRegistry()
@@ -0,0 +1,142 @@
+"""Precomputed conversion functions and prefix views.
+
+'compile_converter' folds the prefixes and the unit transform between two (prefix, unit) into one
+(scale, offset) and returns a plain function: converting a value is then one multiply-add,
+without lookup nor check. With 'vectorized=True', the function converts arrays with NumPy.
+
+	to_kelvin = compile_converter('°F', 'K')
+	to_kelvin(70.)                                 # 294.2611111111111
+	to_km = compile_converter('m', 'km', vectorized=True)
+	to_km(distances, out=buffer)
+
+A PrefixView binds the factor of a prefix, so reading the values of many quantities with this
+prefix costs one multiply per quantity:
+
+	kilo = PrefixView(PrefixEnum.kilo)
+	total = sum(kilo(quantity) for quantity in quantities)  # like quantity.k
+"""
+from typing import Callable, Iterable, List, Tuple, Union
+
+import numpy as np
+
+from . import PrefixEnum, Unit
+from .unit import Prefix
+from .quantity import Quantity
+from .quantityArray import QuantityArray
+
+
+Endpoint = Union[str, Unit, Tuple[Prefix, Unit]]  # a unit expression, a unit, or (prefix, unit)
+
+
+def _resolve(endpoint: Endpoint, name: str) -> Tuple[Prefix, Unit]:
+	if isinstance(endpoint, str):
+		from .parser import parse_unit
+		return parse_unit(endpoint)
+	elif isinstance(endpoint, Unit):
+		return PrefixEnum.none, endpoint
+	elif isinstance(endpoint, tuple) and len(endpoint) == 2 and isinstance(endpoint[1], Unit):
+		return PrefixEnum._resolve_prefix(endpoint[0], name), endpoint[1]
+	raise ValueError(f"'{name}' must be a unit expression, a Unit or a tuple (prefix, unit), not {endpoint}")
+
+
+def compile_converter(from_: Endpoint, to_: Endpoint, vectorized: bool = False) -> Callable:
+	"""Return a function which converts raw values defined in 'from_' in values defined in 'to_'.
+
+	Parameters
+	----------
+	from_, to_: a unit expression ('km', '°F', 'm/s'), a Unit, or a tuple (prefix, Unit)
+	vectorized: False for a function of a float, True for a function of an array (or a sequence of
+		floats) with an optional 'out' array, which returns a float64 array
+
+	The function has the attributes 'scale' and 'offset' ('value * scale + offset').
+	Raise a ValueError if the units are not compatible.
+	"""
+	from_prefix, from_unit = _resolve(from_, 'from_')
+	to_prefix, to_unit = _resolve(to_, 'to_')
+	if not from_unit.is_compatible(to_unit):
+		raise ValueError(f"Can't convert '{from_unit}' in '{to_unit}'")
+	unit_scale, unit_offset = from_unit.conversion_to(to_unit)
+
+	divisor = None
+	if unit_scale == 1 and unit_offset == 0:
+		# only prefixes: the same factor or divisor as PrefixEnum.convert_value
+		scale, divisor = PrefixEnum._get_conversion(from_prefix, to_prefix)
+		offset = 0.
+	else:
+		scale = PrefixEnum.get_conversion_factor(from_prefix, to_prefix) * unit_scale
+		offset = PrefixEnum.get_conversion_factor(PrefixEnum.none, to_prefix) * unit_offset
+
+	function = _vectorized(scale, offset, divisor) if vectorized else _scalar(scale, offset, divisor)
+	function.scale = scale if divisor is None else 1. / divisor
+	function.offset = offset
+	return function
+
+
+def _scalar(scale: float, offset: float, divisor: Union[float, None]) -> Callable[[float], float]:
+	if divisor is not None:
+		def convert(value: float) -> float:
+			return value / divisor
+	elif offset == 0:
+		def convert(value: float) -> float:
+			return value * scale
+	else:
+		def convert(value: float) -> float:
+			return value * scale + offset
+	return convert
+
+
+def _vectorized(scale: float, offset: float, divisor: Union[float, None]) -> Callable:
+	def convert(values, out=None):
+		values = np.asarray(values, dtype=np.float64)
+		if divisor is not None:
+			return np.true_divide(values, divisor, out=out)
+		result = np.multiply(values, scale, out=out)
+		if offset != 0:
+			np.add(result, offset, out=result)
+		return result
+	return convert
+
+
+class PrefixView:
+	"""The values of quantities with a fixed prefix, like the accessors 'k', 'm'... of Quantity, with
+	the conversion factor computed once.
+	"""
+	__slots__ = ('_prefix', '_factor', '_divisor', '_inverse_factor', '_inverse_divisor')
+
+	def __init__(self, prefix: Union[str, float, Prefix]):
+		prefix = PrefixEnum._resolve_prefix(prefix, 'prefix')
+		self._prefix = prefix
+		self._factor, self._divisor = PrefixEnum._get_conversion(PrefixEnum.none, prefix)
+		self._inverse_factor, self._inverse_divisor = PrefixEnum._get_conversion(prefix, PrefixEnum.none)
+
+	def __repr__(self) -> str:
+		"""repr(self)"""
+		return f"<PrefixView: {self._prefix.name or 'none'}>"
+
+	def __call__(self, quantity: Quantity) -> float:
+		"""Return the value of 'quantity' with the prefix of the view"""
+		if self._divisor is None:
+			return quantity._value * self._factor
+		return quantity._value / self._divisor
+
+	def set(self, quantity: Quantity, new_value: float):
+		"""Set the value of 'quantity', defined with the prefix of the view"""
+		if self._inverse_divisor is None:
+			quantity._value = float(new_value) * self._inverse_factor
+		else:
+			quantity._value = float(new_value) / self._inverse_divisor
+
+	def values(self, quantities: Union[QuantityArray, Iterable[Quantity]]) -> Union[List[float], np.ndarray]:
+		"""Return the values of quantities with the prefix of the view: an array for a QuantityArray,
+		a list for an iterable of Quantity
+		"""
+		factor, divisor = self._factor, self._divisor
+		if isinstance(quantities, QuantityArray):
+			return quantities._values * factor if divisor is None else quantities._values / divisor
+		if divisor is None:
+			return [quantity._value * factor for quantity in quantities]
+		return [quantity._value / divisor for quantity in quantities]
+
+	@property
+	def prefix(self) -> Prefix:
+		return self._prefix
@@ -26,4 +26,25 @@ class NoPrefixSupported(QuantityError):
 	"""
 
 	def __init__(self):
-		QuantityError.__init__(self, "Prefix are not supported for this quantity.")
\ No newline at end of file
+		QuantityError.__init__(self, "Prefix are not supported for this quantity.")
+
+
+class ParseError(QuantityError, ValueError):
+	"""Subexception of QuantityError
+	Exception raise when a quantity or a unit expression can't be parsed.
+	"""
+
+	def __init__(self, msg: str):
+		QuantityError.__init__(self, msg)
+		ValueError.__init__(self, msg)
+
+
+class ConversionError(QuantityError, ValueError):
+	"""Subexception of QuantityError
+	Exception raise when there is no conversion between two units, or when a registered conversion
+	contradicts a known one.
+	"""
+
+	def __init__(self, msg: str):
+		QuantityError.__init__(self, msg)
+		ValueError.__init__(self, msg)
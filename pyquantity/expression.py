@@ -0,0 +1,328 @@
+"""Lazy expressions of quantities, evaluated in one fused pass.
+
+'lazy()' wraps quantities (Quantity or QuantityArray) in leaves of an expression tree; arithmetic
+on them builds the tree instead of computing values. Units are checked and combined once, when
+the tree is built, and conversions between compatible units or from base prefixes are folded in
+the tree as constants. At the first evaluation, the tree is compiled to a Python function which
+computes the raw values: with arrays, it runs NumPy operations writing in place in the temporary
+buffers, so neither intermediate quantity nor intermediate array per operation is created.
+
+	a, b, c = lazy(distances, offsets, times)  # QuantityArray
+	speed = (a + b) / c                        # Expression, the units are checked here
+	result = speed.evaluate()                  # QuantityArray in m/s
+
+The values of leaves are read at each evaluation, so an expression can be evaluated again after
+the values of its quantities change.
+"""
+from typing import Callable, Dict, List, Tuple, Union
+import operator
+
+from . import PrefixEnum, Unit
+from .unit import Prefix, Dimension
+from .quantity import Quantity
+
+
+# each operator as a function (to fold numbers), as Python code on scalars and as a NumPy ufunc on arrays
+_OPERATORS = {
+	'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv, '**': operator.pow,
+	'neg': operator.neg, 'pos': operator.pos, 'abs': operator.abs,
+}
+_SCALAR_FORMATS = {
+	'+': '({} + {})', '-': '({} - {})', '*': '({} * {})', '/': '({} / {})', '**': '({} ** {})',
+	'neg': '(-{})', 'pos': '(+{})', 'abs': 'abs({})',
+}
+_UFUNCS = {
+	'+': 'add', '-': 'subtract', '*': 'multiply', '/': 'true_divide', '**': 'power',
+	'neg': 'negative', 'pos': 'positive', 'abs': 'absolute',
+}
+
+
+class Expression:
+	"""A node of a lazy expression: a quantity, a number or an operation.
+
+	Each node knows the unit, the base prefix and the class of its result, so 'evaluate' only
+	computes values. The unit is None for a pure number.
+	"""
+	__slots__ = ('_unit', '_base_prefix', '_cls', '_is_array', '_compiled')
+
+	def __init__(self, unit: Union[Unit, None], base_prefix: Prefix, cls: type, is_array: bool):
+		self._unit = unit
+		self._base_prefix = base_prefix
+		self._cls = cls
+		self._is_array = is_array
+		self._compiled = None
+
+	def __add__(self, other):
+		"""self + other"""
+		return _additive('+', self, _as_expression(other))
+
+	def __radd__(self, other):
+		"""other + self"""
+		return _additive('+', _as_expression(other), self)
+
+	def __sub__(self, other):
+		"""self - other"""
+		return _additive('-', self, _as_expression(other))
+
+	def __rsub__(self, other):
+		"""other - self"""
+		return _additive('-', _as_expression(other), self)
+
+	def __mul__(self, other):
+		"""self * other"""
+		return _multiplicative('*', self, _as_expression(other))
+
+	def __rmul__(self, other):
+		"""other * self"""
+		return _multiplicative('*', _as_expression(other), self)
+
+	def __truediv__(self, other):
+		"""self / other"""
+		return _multiplicative('/', self, _as_expression(other))
+
+	def __rtruediv__(self, other):
+		"""other / self"""
+		return _multiplicative('/', _as_expression(other), self)
+
+	def __pow__(self, exponent: int):
+		"""self ** exponent"""
+		if not isinstance(exponent, int):
+			raise ValueError(f"'exponent' must be a int, not a {type(exponent)}")
+		if self._unit is None:
+			return _Constant(self._value ** exponent)
+		return _Operation('**', (self, _Constant(exponent)), self._unit ** exponent, PrefixEnum.none, Quantity, self._is_array)
+
+	def __pos__(self):
+		""" + self"""
+		return self._unary('pos')
+
+	def __neg__(self):
+		"""- self"""
+		return self._unary('neg')
+
+	def __abs__(self):
+		""" abs(self)"""
+		return self._unary('abs')
+
+	def __repr__(self) -> str:
+		"""repr(self)"""
+		symbol = '' if self._unit is None else f" {self._unit.symbol}"
+		return f"<Expression: {self._text()}{symbol}>"
+
+	def _unary(self, symbol: str) -> 'Expression':
+		if self._unit is None:
+			return _Constant(_OPERATORS[symbol](self._value))
+		return _Operation(symbol, (self,), self._unit, self._base_prefix, self._cls, self._is_array)
+
+	def _text(self) -> str:
+		raise NotImplementedError
+
+	def compile(self) -> Tuple[Callable, List['_Leaf']]:
+		"""Return the function which computes the raw values of the expression (without prefix,
+		in its unit) from the raw values of its leaves, and the list of leaves in the order of
+		the arguments. The function is generated once, then cached.
+		"""
+		if self._compiled is None:
+			self._compiled = _CodeGenerator().generate(self)
+		return self._compiled
+
+	def evaluate(self):
+		"""Compute the expression and return a Quantity (of the class of its main operand when the
+		unit is not changed), a QuantityArray if an operand is an array, or a number without unit.
+		"""
+		function, leaves = self.compile()
+		values = function(*[leaf._source.value for leaf in leaves])
+		if self._unit is None:
+			return values
+		if self._is_array:
+			from .quantityArray import QuantityArray
+			return QuantityArray._new(values, self._unit, self._base_prefix)
+		return self._cls._new(values, self._unit, self._base_prefix)
+
+	@property
+	def unit(self) -> Union[Unit, None]:
+		return self._unit
+
+	@property
+	def dimension(self) -> Union[Dimension, None]:
+		return None if self._unit is None else self._unit.dimension
+
+	@property
+	def base_prefix(self) -> Prefix:
+		return self._base_prefix
+
+
+class _Leaf(Expression):
+	"""A quantity of the expression"""
+	__slots__ = ('_source',)
+
+	def __init__(self, source):
+		if isinstance(source, Quantity):
+			Expression.__init__(self, source.unit, source.base_prefix, type(source), False)
+		else:
+			Expression.__init__(self, source.unit, source.base_prefix, Quantity, True)
+		self._source = source
+
+	def _text(self) -> str:
+		return self._source.name
+
+
+class _Constant(Expression):
+	"""A number without unit, already converted without prefix"""
+	__slots__ = ('_value',)
+
+	def __init__(self, value: float):
+		Expression.__init__(self, None, PrefixEnum.none, Quantity, False)
+		self._value = value
+
+	def evaluate(self):
+		return self._value
+
+	def _text(self) -> str:
+		return repr(self._value)
+
+
+class _Operation(Expression):
+	"""An operator of _SCALAR_FORMATS applied on one or two operands"""
+	__slots__ = ('_symbol', '_operands')
+
+	def __init__(self, symbol: str, operands: Tuple[Expression, ...], unit: Unit, base_prefix: Prefix, cls: type, is_array: bool):
+		Expression.__init__(self, unit, base_prefix, cls, is_array)
+		self._symbol = symbol
+		self._operands = operands
+
+	def _text(self) -> str:
+		return _SCALAR_FORMATS[self._symbol].format(*(operand._text() for operand in self._operands))
+
+
+def _as_expression(operand) -> Expression:
+	if isinstance(operand, Expression):
+		return operand
+	if isinstance(operand, (int, float)):
+		return _Constant(operand)
+	return lazy(operand)
+
+
+def _additive(symbol: str, left: Expression, right: Expression) -> Expression:
+	"""Build left + right or left - right. The result has the unit, the base prefix and the class of the
+	quantity on the left (or the only quantity); the other operand is converted in this unit as a
+	difference of values (offsets are ignored), and a number is defined with the base prefix.
+	"""
+	if left._unit is None and right._unit is None:
+		return _Constant(_OPERATORS[symbol](left._value, right._value))
+	main = left if left._unit is not None else right
+	operands = []
+	for operand in (left, right):
+		if operand._unit is None:
+			operand = _Constant(PrefixEnum.convert_value(operand._value, to_=PrefixEnum.none, from_=main._base_prefix))
+		elif operand is not main:
+			if not main._unit.is_compatible(operand._unit):
+				raise ValueError(f"Can't add or subtract '{main._unit}' and '{operand._unit}'")
+			scale = operand._unit.conversion_to(main._unit)[0]
+			if scale != 1:
+				operand = _Operation('*', (operand, _Constant(scale)), main._unit, main._base_prefix, main._cls, operand._is_array)
+		operands.append(operand)
+	return _Operation(symbol, tuple(operands), main._unit, main._base_prefix, main._cls, left._is_array or right._is_array)
+
+
+def _multiplicative(symbol: str, left: Expression, right: Expression) -> Expression:
+	"""Build left * right or left / right. With a number, the result keeps the unit, the base prefix and
+	the class of the quantity; otherwise it's a Quantity of the product or the quotient of units.
+	"""
+	is_array = left._is_array or right._is_array
+	if left._unit is None and right._unit is None:
+		return _Constant(_OPERATORS[symbol](left._value, right._value))
+	elif right._unit is None or (left._unit is None and symbol == '*'):
+		main = left if left._unit is not None else right
+		return _Operation(symbol, (left, right), main._unit, main._base_prefix, main._cls, is_array)
+	elif left._unit is None:
+		return _Operation(symbol, (left, right), right._unit ** -1, PrefixEnum.none, Quantity, is_array)
+	unit = left._unit * right._unit if symbol == '*' else left._unit / right._unit
+	return _Operation(symbol, (left, right), unit, PrefixEnum.none, Quantity, is_array)
+
+
+class _CodeGenerator:
+	"""Generate the Python function which evaluates an expression.
+
+	Scalar sub-expressions are inlined in one Python expression. Array sub-expressions are a
+	sequence of NumPy ufunc calls: the first operation on leaves allocates a float64 temporary,
+	the next ones write in it ('out='), so the whole expression uses at most one buffer per
+	operation which has array operands on both sides.
+	"""
+
+	def __init__(self):
+		self._arguments: Dict[int, str] = {}  # id of a leaf -> name of its argument
+		self._leaves: List[_Leaf] = []
+		self._constants: Dict[str, float] = {}
+		self._lines: List[str] = []
+
+	def generate(self, expression: Expression) -> Tuple[Callable, List[_Leaf]]:
+		if expression._is_array:
+			result, owned = self._array(expression)
+			if not owned:
+				self._lines.append(f"{result} = np.array({result}, dtype=np.float64)")
+		else:
+			result = self._scalar(expression)
+		self._lines.append(f"return {result}")
+
+		source = f"def _evaluate({', '.join(self._arguments.values())}):\n" + ''.join(f"\t{line}\n" for line in self._lines)
+		namespace = dict(self._constants)
+		if expression._is_array:
+			import numpy
+			namespace['np'] = numpy
+		exec(compile(source, '<pyquantity expression>', 'exec'), namespace)
+		return namespace['_evaluate'], self._leaves
+
+	def _argument(self, leaf: _Leaf) -> str:
+		name = self._arguments.get(id(leaf))
+		if name is None:
+			name = self._arguments[id(leaf)] = f"x{len(self._leaves)}"
+			self._leaves.append(leaf)
+		return name
+
+	def _constant(self, constant: _Constant) -> str:
+		name = f"c{len(self._constants)}"
+		self._constants[name] = constant._value
+		return name
+
+	def _scalar(self, expression: Expression) -> str:
+		"""Return the Python expression of a scalar sub-expression"""
+		if isinstance(expression, _Leaf):
+			return self._argument(expression)
+		elif isinstance(expression, _Constant):
+			return self._constant(expression)
+		return _SCALAR_FORMATS[expression._symbol].format(*(self._scalar(operand) for operand in expression._operands))
+
+	def _array(self, expression: Expression) -> Tuple[str, bool]:
+		"""Return the name of the variable of a sub-expression and True if it's a temporary buffer
+		which can be overwritten.
+		"""
+		if not expression._is_array:
+			return self._scalar(expression), False
+		elif isinstance(expression, _Leaf):
+			return self._argument(expression), False
+
+		operands = [self._array(operand) for operand in expression._operands]
+		arguments = ', '.join(name for name, _ in operands)
+		ufunc = _UFUNCS[expression._symbol]
+		for name, owned in operands:
+			if owned:
+				self._lines.append(f"np.{ufunc}({arguments}, out={name})")
+				return name, True
+		name = f"t{len(self._lines)}"
+		self._lines.append(f"{name} = np.{ufunc}({arguments}, dtype=np.float64)")
+		return name, True
+
+
+def lazy(*quantities):
+	"""Return leaves of lazy expressions for quantities (Quantity or QuantityArray): one Expression
+	for one quantity, a tuple for several.
+	"""
+	leaves = []
+	for quantity in quantities:
+		if not isinstance(quantity, Quantity):
+			from .quantityArray import QuantityArray
+			if not isinstance(quantity, QuantityArray):
+				raise ValueError(f"Can't build a lazy expression with a {type(quantity)}")
+		leaves.append(_Leaf(quantity))
+	return leaves[0] if len(leaves) == 1 else tuple(leaves)
@@ -0,0 +1,221 @@
+"""Module to format quantities with the best prefix ("420 µm")"""
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple, Union
+import io
+import math
+import re
+
+import numpy as np
+
+from . import PrefixEnum, Unit
+from .unit import Prefix, _decimal_exponent
+from .quantity import Quantity
+from .quantityArray import QuantityArray
+from . import errors
+
+
+SUFFIX_CACHE_SIZE = 1024  # number of (symbol, prefix) suffixes and of units kept by the caches of this module
+
+# symbols of prefixes displayed differently of their PrefixEnum symbol (unless 'ascii' is True)
+DISPLAY_SYMBOLS = {'micro': 'µ'}
+
+
+class _PrefixTable:
+	"""The prefixes which are a power of ten (a power of 1000 for engineering prefixes), sorted by
+	value, to choose the prefix of a unit whose values scale by prefix ** exponent
+	"""
+
+	def __init__(self, prefixes: List[Prefix], exponent: int, step: int):
+		by_power = {0: PrefixEnum.none}
+		for prefix in prefixes:
+			power = _decimal_exponent(prefix.value)  # None for a prefix which is not a power of ten
+			if power is not None and power % step == 0:
+				by_power.setdefault(power, prefix)
+		powers = sorted(by_power)
+		self.prefixes = [by_power[power] for power in powers]
+		self.powers = np.array(powers, dtype=np.float64) * exponent
+		self.factors = np.array([PrefixEnum.get_conversion_factor(PrefixEnum.none, prefix) ** exponent for prefix in self.prefixes])
+		self.none_index = powers.index(0)
+
+	def index(self, value: float) -> int:
+		"""Return the index in 'prefixes' of the best prefix for 'value' (without prefix): the largest
+		prefix which gives a scaled value of at least 1
+		"""
+		if value == 0 or not math.isfinite(value):
+			return self.none_index
+		magnitude = abs(value)
+		index = max(int(np.searchsorted(self.powers, math.log10(magnitude), side='right')) - 1, 0)
+		# log10 is not exact: check the neighbours
+		if index + 1 < len(self.factors) and magnitude * self.factors[index + 1] >= 1:
+			index += 1
+		elif index > 0 and magnitude * self.factors[index] < 1:
+			index -= 1
+		return index
+
+	def indexes(self, values: np.ndarray) -> np.ndarray:
+		"""Vectorized version of 'index'"""
+		magnitudes = np.abs(values)
+		valid = (magnitudes > 0) & np.isfinite(magnitudes)
+		indexes = np.full(values.shape, self.none_index, dtype=np.int64)
+		found = np.searchsorted(self.powers, np.log10(magnitudes[valid]), side='right') - 1
+		found = np.clip(found, 0, len(self.factors) - 1)
+		upper = np.minimum(found + 1, len(self.factors) - 1)
+		found += (upper > found) & (magnitudes[valid] * self.factors[upper] >= 1)
+		lower = np.maximum(found - 1, 0)
+		found -= (lower < found) & (magnitudes[valid] * self.factors[found] < 1)
+		indexes[valid] = found
+		return indexes
+
+
+_tables: Dict[int, _PrefixTable] = {}  # tables of prefixes by exponent of the unit
+_tables_version = -1
+
+
+def _check_version():
+	"""Clear the tables and the caches built on prefixes when PrefixEnum changed"""
+	global _tables_version
+	if _tables_version != PrefixEnum._version:
+		_tables.clear()
+		_display_unit.cache_clear()
+		_suffix.cache_clear()
+		_tables_version = PrefixEnum._version
+
+
+def _get_table(exponent: int = 1) -> _PrefixTable:
+	"""Return the table of prefixes of a unit with this exponent (see prefix_exponent), rebuilt when
+	PrefixEnum changed: the engineering prefixes for an exponent 1, all the decimal prefixes for a
+	larger exponent (dm^3, cm^2...), no prefix for 0
+	"""
+	_check_version()
+	table = _tables.get(exponent)
+	if table is None:
+		prefixes = PrefixEnum._get_all_prefix() if exponent > 0 else []
+		table = _tables[exponent] = _PrefixTable(prefixes, exponent, 3 if exponent == 1 else 1)
+	return table
+
+
+@lru_cache(maxsize=SUFFIX_CACHE_SIZE)
+def _suffix(symbol: str, prefix: Prefix, ascii: bool) -> str:
+	return (prefix.symbol if ascii else DISPLAY_SYMBOLS.get(prefix.name, prefix.symbol)) + symbol
+
+
+def unit_suffix(unit: Unit, prefix: Prefix, ascii: bool = False) -> str:
+	"""Return the symbol of 'unit' with 'prefix', as rendered after a value"""
+	return _suffix(unit.symbol, prefix, ascii)
+
+
+def _first_factor(symbol: str) -> Tuple[str, int]:
+	"""Return the first factor of a symbol without its exponent and this exponent (0 if the factor
+	can't take a prefix: a negative exponent or a parenthesized factor)
+	"""
+	factor = re.split('[/·*]', symbol, maxsplit=1)[0]
+	if not factor or factor.startswith('('):
+		return factor, 0
+	base, caret, exponent = factor.partition('^')
+	if not caret:
+		return base, 1
+	return base, int(exponent) if exponent.isdigit() and int(exponent) > 0 else 0
+
+
+@lru_cache(maxsize=SUFFIX_CACHE_SIZE)
+def prefix_exponent(unit: Unit) -> int:
+	"""Return n when a prefix before the symbol of 'unit' scales its values by prefix ** n: 1 for 'm',
+	'm/s' or 'm·s', 2 for 'm^2' or 'm^2/s'. Return 0 when the unit can't take a prefix: a unit with
+	an offset (°C...), a negative exponent ('s^-1') or a parenthesized first factor ('(m/s)^2').
+	"""
+	return 0 if unit.offset != 0 else _first_factor(unit.symbol)[1]
+
+
+def _get_display_unit(unit: Unit) -> Tuple[float, str, int]:
+	"""Return _display_unit(unit), after clearing its cache if PrefixEnum changed"""
+	_check_version()
+	return _display_unit(unit)
+
+
+@lru_cache(maxsize=SUFFIX_CACHE_SIZE)
+def _display_unit(unit: Unit) -> Tuple[float, str, int]:
+	"""Return (factor, symbol, exponent): a value of 'unit' times 'factor' is a value of the unit
+	'symbol', without the prefix of the first factor of 'unit' ('km' gives (1000, 'm', 1), 'km^2/s'
+	gives (1e6, 'm^2/s', 2)), and a prefix before 'symbol' scales its values by prefix ** exponent.
+	The result depends on PrefixEnum: use _get_display_unit.
+	"""
+	exponent = prefix_exponent(unit)
+	if exponent == 0:
+		return 1., unit.symbol, 0
+	from .parser import parse_unit
+	base = _first_factor(unit.symbol)[0]
+	try:
+		prefix, base_unit = parse_unit(base)
+		if prefix.value == 1:
+			return 1., unit.symbol, exponent
+		symbol = base_unit.symbol + unit.symbol[len(base):]
+		unprefixed = parse_unit(symbol)
+	except errors.ParseError:
+		return 1., unit.symbol, exponent
+	factor = unit.scale / unprefixed[1].scale
+	if unprefixed[0].value != 1 or unprefixed[1].dimension != unit.dimension or not math.isclose(factor, prefix.value ** exponent):
+		return 1., unit.symbol, exponent  # not the same unit with a prefix, like a custom unit 'ms'
+	return factor, symbol, exponent
+
+
+def best_prefix(value: float) -> Prefix:
+	"""Return the prefix of PrefixEnum, power of 1000, which gives 'value' between 1 and 1000"""
+	table = _get_table()
+	return table.prefixes[table.index(value)]
+
+
+def _format_value(value: float, index: int, scaled: float, table: _PrefixTable, precision: int):
+	"""Return the text of 'value' (without prefix) scaled with the prefix 'index' of the table
+	('scaled' is already the scaled value) and the index of the prefix used.
+	If the rounding gives a value of at least 1 with the next prefix (1000 km), the next prefix is used.
+	"""
+	text = f"{scaled:.{precision}g}"
+	if index + 1 < len(table.prefixes) and math.isfinite(scaled) and abs(float(text)) * table.factors[index + 1] / table.factors[index] >= 1:
+		index += 1
+		text = f"{value * table.factors[index]:.{precision}g}"
+	return text, index
+
+
+def format_quantity(quantity: Quantity, precision: int = 4, ascii: bool = False) -> str:
+	"""Format a quantity with the best prefix: 0.00042 m gives "420 µm", 0.001 km gives "1 m".
+
+	The value is first converted in the unit without prefix. The prefix is a power of 1000, except
+	for a unit with an exponent, where it's the largest decimal prefix which gives a value of at least
+	1 (1e-6 m^2 gives "1 mm^2", 2e-3 m^3 gives "2 dm^3"). A unit with an offset (°C) has no prefix.
+
+	Parameters
+	----------
+	quantity: the quantity to format
+	precision: the number of significant digits
+	ascii: if True, the symbols of PrefixEnum are used ("u" for micro), else DISPLAY_SYMBOLS
+	"""
+	factor, symbol, exponent = _get_display_unit(quantity.unit)
+	value = quantity.value * factor
+	table = _get_table(exponent)
+	index = table.index(value)
+	text, index = _format_value(value, index, value * table.factors[index], table, precision)
+	return f"{text} {_suffix(symbol, table.prefixes[index], ascii)}"
+
+
+def format_quantities(quantities: Union[QuantityArray, Iterable[Quantity]], precision: int = 4, sep: str = "\n", ascii: bool = False) -> str:
+	"""Format a QuantityArray or a collection of quantities (see format_quantity) in one string,
+	the items separated by 'sep'. With a QuantityArray, prefixes are chosen for all values at once.
+	"""
+	if not isinstance(quantities, QuantityArray):
+		return sep.join(format_quantity(quantity, precision, ascii) for quantity in quantities)
+
+	factor, symbol, exponent = _get_display_unit(quantities.unit)
+	values = quantities.values * factor if factor != 1 else quantities.values
+	table = _get_table(exponent)
+	indexes = table.indexes(values)
+	scaled = values * table.factors[indexes]
+	suffixes = [" " + _suffix(symbol, prefix, ascii) for prefix in table.prefixes]
+
+	buffer = io.StringIO()
+	for i, (value, scaled_value, index) in enumerate(zip(values.tolist(), scaled.tolist(), indexes.tolist())):
+		if i:
+			buffer.write(sep)
+		text, index = _format_value(value, index, scaled_value, table, precision)
+		buffer.write(text)
+		buffer.write(suffixes[index])
+	return buffer.getvalue()
@@ -0,0 +1,173 @@
+"""Opt-in instrumentation of the hot paths: number of calls and time spent per function.
+
+Instrumentation is enabled with the environment variable PYQUANTITY_INSTRUMENTATION=1 (or "sites"), with
+'enable()' or with the context manager 'instrumented()'. When enabled, the functions of
+INSTRUMENTED are replaced by wrappers which count calls and accumulate their time (time of
+nested calls included); when disabled, the original functions are restored, so instrumentation
+costs nothing. Methods are always looked up on their class, but a module function imported by
+name before 'enable()' (from pyquantity import format_quantity) keeps the original function.
+
+	with instrumented():
+		run_request()
+	metrics = snapshot()  # {'functions': {'PrefixEnum._scale': {'calls': ..., ...}}, ...}
+"""
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+import functools
+import importlib
+import os
+import sys
+import threading
+import time
+
+
+ENVIRONMENT_VARIABLE = 'PYQUANTITY_INSTRUMENTATION'
+
+# (module, owner in the module or None for a module function, attribute, label) of instrumented functions
+INSTRUMENTED = [
+	('pyquantity.unit', 'PrefixEnum', 'convert_value', 'PrefixEnum.convert_value'),
+	('pyquantity.unit', 'PrefixEnum', '_scale', 'PrefixEnum._scale'),
+	('pyquantity.unit', 'PrefixEnum', '_get_conversion', 'PrefixEnum._get_conversion'),
+	('pyquantity.unit', 'PrefixEnum', 'get_prefix', 'PrefixEnum.get_prefix'),
+	('pyquantity.quantity', 'Quantity', '__init__', 'Quantity.__init__'),
+	('pyquantity.quantity', 'Quantity', '_new', 'Quantity._new'),
+	('pyquantity.quantity', 'Quantity', '__lt__', 'Quantity.__lt__'),
+	('pyquantity.quantity', 'Quantity', '__le__', 'Quantity.__le__'),
+	('pyquantity.quantity', 'Quantity', '__eq__', 'Quantity.__eq__'),
+	('pyquantity.quantity', 'Quantity', '__ne__', 'Quantity.__ne__'),
+	('pyquantity.quantity', 'Quantity', '__gt__', 'Quantity.__gt__'),
+	('pyquantity.quantity', 'Quantity', '__ge__', 'Quantity.__ge__'),
+	('pyquantity.quantity', 'Quantity', '__add__', 'Quantity.__add__'),
+	('pyquantity.quantity', 'Quantity', '__sub__', 'Quantity.__sub__'),
+	('pyquantity.quantity', 'Quantity', '__mul__', 'Quantity.__mul__'),
+	('pyquantity.quantity', 'Quantity', '__truediv__', 'Quantity.__truediv__'),
+	('pyquantity.quantity', 'Quantity', '__str__', 'Quantity.__str__'),
+	('pyquantity.quantity', 'Quantity', '__repr__', 'Quantity.__repr__'),
+	('pyquantity.quantity', 'Quantity', '__format__', 'Quantity.__format__'),
+	('pyquantity.expression', 'Expression', 'evaluate', 'Expression.evaluate'),
+	('pyquantity.formatting', None, 'format_quantity', 'format_quantity'),
+	('pyquantity.formatting', None, 'format_quantities', 'format_quantities'),
+	('pyquantity', None, 'format_quantity', 'format_quantity'),
+	('pyquantity', None, 'format_quantities', 'format_quantities'),
+]
+
+_PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+_lock = threading.Lock()
+_stats: Dict[str, List] = defaultdict(lambda: [0, 0.])  # label -> [calls, total time]
+_call_sites: Dict[str, Counter] = defaultdict(Counter)  # label -> Counter of "file:line"
+_patched: List[Tuple[object, str, object]] = []  # (owner, attribute, original attribute)
+_track_call_sites = False
+
+
+def _call_site() -> str:
+	"""Return the "file:line" of the first frame out of the package"""
+	frame = sys._getframe(2)
+	while frame is not None and frame.f_code.co_filename.startswith(_PACKAGE_DIRECTORY):
+		frame = frame.f_back
+	if frame is None:
+		return '<package>'
+	return f"{frame.f_code.co_filename}:{frame.f_lineno}"
+
+
+def _wrap(function, label: str):
+	@functools.wraps(function)
+	def wrapper(*args, **kwargs):
+		start = time.perf_counter()
+		try:
+			return function(*args, **kwargs)
+		finally:
+			elapsed = time.perf_counter() - start
+			site = _call_site() if _track_call_sites else None
+			with _lock:
+				stat = _stats[label]
+				stat[0] += 1
+				stat[1] += elapsed
+				if site is not None:
+					_call_sites[label][site] += 1
+	return wrapper
+
+
+def is_enabled() -> bool:
+	return len(_patched) > 0
+
+
+def enable(track_call_sites: bool = False):
+	"""Enable the instrumentation. With 'track_call_sites', the number of calls is also counted
+	per call site (the first frame out of the package), which is slower.
+	The modules of INSTRUMENTED are imported, even the ones which the package loads lazily.
+	"""
+	global _track_call_sites
+	_track_call_sites = track_call_sites
+	if is_enabled():
+		return
+	# import the modules loaded lazily by the package (formatting, expression...) and resolve the
+	# lazy attributes of the package before patching, so that they are bound to the original functions
+	for module_name, owner_name, attribute, label in INSTRUMENTED:
+		module = importlib.import_module(module_name)
+		if owner_name is None:
+			getattr(module, attribute, None)
+	for module_name, owner_name, attribute, label in INSTRUMENTED:
+		module = sys.modules[module_name]
+		owner = module if owner_name is None else getattr(module, owner_name)
+		original = owner.__dict__.get(attribute)
+		if original is None:
+			continue
+		if isinstance(original, classmethod):
+			wrapped = classmethod(_wrap(original.__func__, label))
+		else:
+			wrapped = _wrap(original, label)
+		setattr(owner, attribute, wrapped)
+		_patched.append((owner, attribute, original))
+
+
+def disable():
+	"""Disable the instrumentation and restore the original functions (the counters are kept)"""
+	while _patched:
+		owner, attribute, original = _patched.pop()
+		setattr(owner, attribute, original)
+
+
+def reset():
+	"""Reset the counters"""
+	with _lock:
+		_stats.clear()
+		_call_sites.clear()
+
+
+def snapshot() -> dict:
+	"""Return the counters as a dict, which can be exported as JSON:
+	{'enabled': bool, 'functions': {label: {'calls', 'total_time', 'mean_time'}}, 'call_sites': {label: {site: calls}}}
+	"""
+	with _lock:
+		functions = {
+			label: {'calls': calls, 'total_time': total, 'mean_time': total / calls if calls else 0.}
+			for label, (calls, total) in _stats.items()
+		}
+		call_sites = {label: dict(counter.most_common()) for label, counter in _call_sites.items()}
+	return {'enabled': is_enabled(), 'functions': functions, 'call_sites': call_sites}
+
+
+@contextmanager
+def instrumented(track_call_sites: bool = False, reset_counters: bool = True):
+	"""Context manager which enables the instrumentation, then restores the previous state"""
+	was_enabled = is_enabled()
+	previous_tracking = _track_call_sites
+	if reset_counters:
+		reset()
+	enable(track_call_sites)
+	try:
+		yield
+	finally:
+		if not was_enabled:
+			disable()
+		else:
+			enable(previous_tracking)
+
+
+def _enable_from_environment():
+	"""Enable the instrumentation if the environment variable is set ("sites" to track call sites)"""
+	value = os.environ.get(ENVIRONMENT_VARIABLE, '').lower()
+	if value in ('1', 'true', 'yes', 'on', 'sites'):
+		enable(track_call_sites=value == 'sites')
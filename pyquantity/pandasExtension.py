@@ -0,0 +1,593 @@
+"""pandas extension type for columns of quantities (pandas is an optional dependency).
+
+QuantityDtype is parametrized by a unit and a base prefix ('quantity[km]' is the metre shown in
+kilometres) and QuantityExtensionArray stores the values without prefix in a float64 array, like
+QuantityArray. Comparisons, arithmetic, reductions, sorting, groupby, take and concat work on the
+float64 values, the unit being checked and converted once per operation. Importing this module
+registers the dtype and the '.pq' accessor of Series:
+
+	import pyquantity.pandasExtension
+	distances = pd.Series(quantities, dtype='quantity')     # unit of the first quantity
+	distances = pd.Series([1.5, 20.], dtype='quantity[km]')  # numbers in the base prefix
+	distances.pq.to('k')                                     # same values, shown in km
+	distances.pq.magnitude('m')                              # float64 values in mm
+	frame.groupby('sensor')['distance'].mean()
+"""
+from typing import Union
+import operator
+
+import numpy as np
+
+try:
+	import pandas as pd
+	from pandas.api.extensions import ExtensionArray, ExtensionDtype, register_extension_dtype, register_series_accessor, take
+except ImportError:
+	raise ImportError("pyquantity.pandasExtension requires pandas") from None
+
+from . import PrefixEnum, Unit
+from .unit import Prefix, get_unit
+from .quantity import Quantity
+from .quantityArray import QuantityArray
+from . import errors
+
+
+_PANDAS_OBJECTS = (pd.Series, pd.Index, pd.DataFrame)
+
+
+@register_extension_dtype
+class QuantityDtype(ExtensionDtype):
+	"""The dtype of a column of quantities: a unit and a base prefix.
+	A dtype without unit ('quantity') takes the unit, the base prefix and the class of the first
+	quantity of a sequence. The class of the elements (Lenght, Mass...) is not part of the identity
+	of the dtype: 'quantity[m]' is the dtype of a column of Lenght or of Quantity in metres.
+	"""
+	_metadata = ('unit', 'base_prefix')
+	type = Quantity
+	na_value = np.nan
+	_is_numeric = True
+
+	def __init__(self, unit: Union[str, Unit] = None, base_prefix: Union[str, float, Prefix] = None, quantity_class: type = Quantity):
+		"""
+		Parameters
+		----------
+		unit: a Unit, or a unit expression with an optional prefix ('km' is the metre with the base prefix kilo)
+		base_prefix: the base prefix, used to show values and to read numbers (default: the prefix of
+			the expression, else none)
+		quantity_class: the class of the elements, Quantity or one of its subclasses
+		"""
+		if not isinstance(quantity_class, type) or not issubclass(quantity_class, Quantity):
+			raise ValueError(f"'quantity_class' must be a subclass of Quantity, not {quantity_class}")
+		prefix = PrefixEnum.none
+		if isinstance(unit, str):
+			prefix, unit = _parse_unit(unit)
+		elif unit is not None and not isinstance(unit, Unit):
+			raise ValueError(f"'unit' must be a str or a Unit, not a {type(unit)}")
+		self.unit = unit
+		self.base_prefix = prefix if base_prefix is None else PrefixEnum._resolve_prefix(base_prefix, 'base_prefix')
+		self.quantity_class = quantity_class
+
+	@property
+	def name(self) -> str:
+		if self.unit is None:
+			return 'quantity'
+		return f"quantity[{self.unit.symbol_with_prefix(self.base_prefix)}]"
+
+	def __repr__(self) -> str:
+		return self.name
+
+	@classmethod
+	def construct_from_string(cls, string: str) -> 'QuantityDtype':
+		"""Build a dtype from 'quantity' or 'quantity[<unit expression>]'"""
+		if not isinstance(string, str):
+			raise TypeError(f"'construct_from_string' expects a string, got {type(string)}")
+		if string == 'quantity':
+			return cls()
+		if string.startswith('quantity[') and string.endswith(']'):
+			try:
+				return cls(string[len('quantity['):-1])
+			except ValueError as e:
+				raise TypeError(f"Cannot construct a 'QuantityDtype' from '{string}': {e}") from None
+		raise TypeError(f"Cannot construct a 'QuantityDtype' from '{string}'")
+
+	@classmethod
+	def construct_array_type(cls) -> type:
+		return QuantityExtensionArray
+
+	def _get_common_dtype(self, dtypes: list) -> Union['QuantityDtype', None]:
+		"""The common dtype of quantities with compatible units is the first one"""
+		if all(isinstance(dtype, QuantityDtype) and dtype.unit is not None and self.unit.is_compatible(dtype.unit) for dtype in dtypes):
+			return self
+		return None
+
+
+def _parse_scalar(text: str) -> Union[Quantity, float, None]:
+	"""Return the Quantity of a text like "12.5 km", the number of a text like "12.5", None for an empty text"""
+	if not text.strip():
+		return None
+	try:
+		return float(text)
+	except ValueError:
+		from .parser import parse_quantity
+		return parse_quantity(text)
+
+
+def _parse_unit(expression: str):
+	from .parser import parse_unit
+	try:
+		return parse_unit(expression)
+	except errors.ParseError:
+		return PrefixEnum.none, get_unit(expression)
+
+
+class QuantityExtensionArray(ExtensionArray):
+	"""A pandas ExtensionArray of quantities: a float64 array of values without prefix and a QuantityDtype"""
+	__array_priority__ = 1000
+
+	def __init__(self, values, dtype: QuantityDtype, copy: bool = False):
+		"""
+		Parameters
+		----------
+		values: the values without prefix, in the unit of 'dtype'
+		dtype: a QuantityDtype with a unit
+		copy: True to copy 'values'
+		"""
+		if not isinstance(dtype, QuantityDtype) or dtype.unit is None:
+			raise ValueError(f"'dtype' must be a QuantityDtype with a unit, not {dtype}")
+		values = np.asarray(values, dtype=np.float64)
+		if values.ndim != 1:
+			raise ValueError(f"'values' must be 1-dimensional, not {values.ndim}-dimensional")
+		self._values = values.copy() if copy else values
+		self._dtype = dtype
+
+	# construction
+
+	@classmethod
+	def _from_sequence(cls, scalars, *, dtype=None, copy: bool = False) -> 'QuantityExtensionArray':
+		"""Build an array from Quantity (converted in the unit of dtype), numbers (defined with the
+		base prefix of dtype), strings of quantities or numbers and missing values, a QuantityArray
+		or a QuantityExtensionArray
+		"""
+		if isinstance(dtype, str):
+			dtype = QuantityDtype.construct_from_string(dtype)
+		elif dtype is None:
+			dtype = QuantityDtype()
+		if isinstance(scalars, QuantityExtensionArray):
+			return scalars.astype(dtype, copy=copy) if dtype.unit is not None else (scalars.copy() if copy else scalars)
+		if isinstance(scalars, QuantityArray):
+			array = cls(scalars._values, QuantityDtype(scalars._unit, scalars._base_prefix), copy=copy)
+			return array.astype(dtype, copy=False) if dtype.unit is not None else array
+
+		scalars = [_parse_scalar(scalar) if isinstance(scalar, str) else scalar for scalar in scalars]
+		if dtype.unit is None:
+			first = next((scalar for scalar in scalars if isinstance(scalar, Quantity)), None)
+			if first is None:
+				raise ValueError("Can't find the unit of a sequence without Quantity, give a QuantityDtype with a unit")
+			dtype = QuantityDtype(first._unit, first._base_prefix, type(first))
+		unit = dtype.unit
+		values = np.empty(len(scalars), dtype=np.float64)
+		numbers = np.zeros(len(scalars), dtype=bool)
+		transforms = {}
+		for index, scalar in enumerate(scalars):
+			if isinstance(scalar, Quantity):
+				transform = transforms.get(scalar._unit)
+				if transform is None:
+					if not unit.is_compatible(scalar._unit):
+						raise ValueError(f"Can't convert '{scalar._unit}' in '{unit}'")
+					transform = transforms[scalar._unit] = scalar._unit.conversion_to(unit)
+				values[index] = scalar._value * transform[0] + transform[1]
+			elif scalar is None or scalar is pd.NA or scalar is pd.NaT:
+				values[index] = np.nan
+			else:
+				values[index] = float(scalar)
+				numbers[index] = True
+		if dtype.base_prefix.value != 1 and numbers.any():
+			values[numbers] = PrefixEnum._scale(values[numbers], dtype.base_prefix, PrefixEnum.none)
+		return cls(values, dtype)
+
+	@classmethod
+	def _from_sequence_of_strings(cls, strings, *, dtype=None, copy: bool = False) -> 'QuantityExtensionArray':
+		"""Build an array from strings like "12.5 km" (see parse_quantity) or numbers"""
+		return cls._from_sequence(strings, dtype=dtype)
+
+	@classmethod
+	def _from_factorized(cls, values: np.ndarray, original: 'QuantityExtensionArray') -> 'QuantityExtensionArray':
+		return cls(values, original._dtype)
+
+	@classmethod
+	def _concat_same_type(cls, to_concat) -> 'QuantityExtensionArray':
+		"""Concatenate arrays, converted in the unit of the first one"""
+		to_concat = list(to_concat)
+		dtype = to_concat[0]._dtype
+		return cls(np.concatenate([array.astype(dtype, copy=False)._values for array in to_concat]), dtype)
+
+	# ExtensionArray interface
+
+	@property
+	def dtype(self) -> QuantityDtype:
+		return self._dtype
+
+	@property
+	def nbytes(self) -> int:
+		return self._values.nbytes
+
+	def __len__(self) -> int:
+		return len(self._values)
+
+	def __getitem__(self, index):
+		"""A quantity of the class of the dtype (NaN for a missing value) for an integer, a
+		QuantityExtensionArray otherwise
+		"""
+		if isinstance(index, (int, np.integer)):
+			value = self._values[index]
+			if np.isnan(value):
+				return self._dtype.na_value
+			return self._dtype.quantity_class._new(float(value), self._dtype.unit, self._dtype.base_prefix)
+		index = pd.api.indexers.check_array_indexer(self, index)
+		return type(self)(self._values[index], self._dtype)
+
+	def __setitem__(self, index, value):
+		"""Set values from a Quantity, numbers (defined with the base prefix), a QuantityArray..."""
+		index = pd.api.indexers.check_array_indexer(self, index)
+		if pd.api.types.is_scalar(value) and not isinstance(value, Quantity) and pd.isna(value):
+			self._values[index] = np.nan
+			return
+		self._values[index] = self._other_values(value, difference=False)
+
+	def __iter__(self):
+		for index in range(len(self)):
+			yield self[index]
+
+	def isna(self) -> np.ndarray:
+		return np.isnan(self._values)
+
+	def take(self, indices, allow_fill: bool = False, fill_value=None) -> 'QuantityExtensionArray':
+		if allow_fill and fill_value is not None and not (pd.api.types.is_scalar(fill_value) and not isinstance(fill_value, Quantity) and pd.isna(fill_value)):
+			fill_value = self._other_values(fill_value, difference=False)
+		else:
+			fill_value = np.nan
+		return type(self)(take(self._values, indices, allow_fill=allow_fill, fill_value=fill_value), self._dtype)
+
+	def copy(self) -> 'QuantityExtensionArray':
+		return type(self)(self._values, self._dtype, copy=True)
+
+	def _values_for_factorize(self):
+		return self._values, np.nan
+
+	def _values_for_argsort(self) -> np.ndarray:
+		return self._values
+
+	def astype(self, dtype, copy: bool = True):
+		"""Convert in another QuantityDtype (compatible unit), in float values defined with the base
+		prefix, or in other types from the Quantity of the array
+		"""
+		dtype = pd.api.types.pandas_dtype(dtype)
+		if isinstance(dtype, QuantityDtype):
+			if dtype.unit is None or dtype == self._dtype:
+				return self.copy() if copy else self
+			if dtype.unit is self._dtype.unit:
+				return type(self)(self._values, dtype, copy=copy)
+			if not dtype.unit.is_compatible(self._dtype.unit):
+				raise ValueError(f"Can't convert '{self._dtype.unit}' in '{dtype.unit}'")
+			scale, offset = self._dtype.unit.conversion_to(dtype.unit)
+			return type(self)(self._values * scale + offset, dtype)
+		if isinstance(dtype, np.dtype) and dtype.kind == 'f':
+			return self._base_values().astype(dtype, copy=copy)
+		return super().astype(dtype, copy=copy)
+
+	def __array__(self, dtype=None, copy=None) -> np.ndarray:
+		"""The values defined with the base prefix for a float dtype, else the Quantity of the array"""
+		if dtype is not None and np.dtype(dtype).kind in 'fiu':
+			return self._base_values().astype(dtype)
+		return np.array(list(self), dtype=object)
+
+	def _formatter(self, boxed: bool = False):
+		return lambda value: 'NaN' if not isinstance(value, Quantity) else str(value)
+
+	def _base_values(self) -> np.ndarray:
+		if self._dtype.base_prefix.value == 1:
+			return self._values
+		return PrefixEnum._scale(self._values, PrefixEnum.none, self._dtype.base_prefix)
+
+	def to_quantity_array(self) -> QuantityArray:
+		"""Return a QuantityArray sharing the values"""
+		return QuantityArray._new(self._values, self._dtype.unit, self._dtype.base_prefix)
+
+	# operators
+
+	def _other_values(self, other, difference: bool):
+		"""Return the values of 'other' without prefix in the unit of self (a float or an array), or
+		NotImplemented. A difference of values is converted without the offsets of units.
+		"""
+		if isinstance(other, _PANDAS_OBJECTS):
+			return NotImplemented
+		if isinstance(other, (Quantity, QuantityArray, QuantityExtensionArray)):
+			if isinstance(other, Quantity):
+				unit, values = other._unit, other._value
+			elif isinstance(other, QuantityArray):
+				unit, values = other._unit, other._values
+			else:
+				unit, values = other._dtype.unit, other._values
+			if unit is self._dtype.unit:
+				return values
+			if not self._dtype.unit.is_compatible(unit):
+				raise ValueError(f"Can't convert '{unit}' in '{self._dtype.unit}'")
+			scale, offset = unit.conversion_to(self._dtype.unit)
+			return values * scale if difference else values * scale + offset
+		try:
+			values = np.asarray(other, dtype=np.float64)
+		except (TypeError, ValueError):
+			return NotImplemented
+		return PrefixEnum._scale(values, self._dtype.base_prefix, PrefixEnum.none)
+
+	def _compare(self, other, op):
+		values = self._other_values(other, difference=False)
+		if values is NotImplemented:
+			return NotImplemented
+		return op(self._values, values)
+
+	def __eq__(self, other):
+		return self._compare(other, operator.eq)
+
+	def __ne__(self, other):
+		return self._compare(other, operator.ne)
+
+	def __lt__(self, other):
+		return self._compare(other, operator.lt)
+
+	def __le__(self, other):
+		return self._compare(other, operator.le)
+
+	def __gt__(self, other):
+		return self._compare(other, operator.gt)
+
+	def __ge__(self, other):
+		return self._compare(other, operator.ge)
+
+	def _additive(self, other, op, reflected: bool = False):
+		values = self._other_values(other, difference=True)
+		if values is NotImplemented:
+			return NotImplemented
+		return type(self)(op(values, self._values) if reflected else op(self._values, values), self._dtype)
+
+	def __add__(self, other):
+		return self._additive(other, operator.add)
+
+	def __radd__(self, other):
+		return self._additive(other, operator.add, reflected=True)
+
+	def __sub__(self, other):
+		return self._additive(other, operator.sub)
+
+	def __rsub__(self, other):
+		return self._additive(other, operator.sub, reflected=True)
+
+	def _multiplicative(self, other, op, reflected: bool = False):
+		"""self * other or self / other: with numbers, the result keeps the dtype, otherwise its unit
+		is the product or the quotient of units, without base prefix
+		"""
+		if isinstance(other, _PANDAS_OBJECTS):
+			return NotImplemented
+		if isinstance(other, (Quantity, QuantityArray, QuantityExtensionArray)):
+			if isinstance(other, Quantity):
+				unit, values = other._unit, other._value
+			elif isinstance(other, QuantityArray):
+				unit, values = other._unit, other._values
+			else:
+				unit, values = other._dtype.unit, other._values
+			if reflected:
+				unit = unit * self._dtype.unit if op is operator.mul else unit / self._dtype.unit
+				return type(self)(op(values, self._values), QuantityDtype(unit, PrefixEnum.none))
+			unit = self._dtype.unit * unit if op is operator.mul else self._dtype.unit / unit
+			return type(self)(op(self._values, values), QuantityDtype(unit, PrefixEnum.none))
+		try:
+			values = np.asarray(other, dtype=np.float64)
+		except (TypeError, ValueError):
+			return NotImplemented
+		if reflected and op is operator.truediv:
+			return type(self)(values / self._values, QuantityDtype(self._dtype.unit ** -1, PrefixEnum.none))
+		return type(self)(op(self._values, values), self._dtype)
+
+	def __mul__(self, other):
+		return self._multiplicative(other, operator.mul)
+
+	def __rmul__(self, other):
+		return self._multiplicative(other, operator.mul, reflected=True)
+
+	def __truediv__(self, other):
+		return self._multiplicative(other, operator.truediv)
+
+	def __rtruediv__(self, other):
+		return self._multiplicative(other, operator.truediv, reflected=True)
+
+	def __neg__(self):
+		return type(self)(-self._values, self._dtype)
+
+	def __pos__(self):
+		return self.copy()
+
+	def __abs__(self):
+		return type(self)(np.abs(self._values), self._dtype)
+
+	# reductions
+
+	def _quantity(self, value: float, dtype: QuantityDtype = None) -> Quantity:
+		dtype = self._dtype if dtype is None else dtype
+		return dtype.quantity_class._new(float(value), dtype.unit, dtype.base_prefix)
+
+	def _reduce(self, name: str, *, skipna: bool = True, keepdims: bool = False, **kwargs):
+		"""sum, mean, median, min, max (a quantity of the class of the dtype), std, sem and var (in the
+		unit and its square, of its differences for a unit with an offset: K and K^2 for °C)
+		"""
+		values = self._values
+		if skipna:
+			values = values[~np.isnan(values)]
+		dtype = self._dtype
+		if name in ('sum', 'mean', 'median'):
+			value = getattr(np, name)(values) if len(values) or name == 'sum' else np.nan
+		elif name in ('min', 'max'):
+			value = getattr(np, name)(values) if len(values) else np.nan
+		elif name in ('std', 'var', 'sem'):
+			ddof = kwargs.get('ddof', 1)
+			value = np.var(values, ddof=ddof) if len(values) > ddof else np.nan
+			if name == 'var':
+				dtype = _variance_dtype(self._dtype)
+			else:
+				dtype = _spread_dtype(self._dtype)
+				value = np.sqrt(value) if name == 'std' else np.sqrt(value / len(values))
+		else:
+			raise TypeError(f"'{name}' is not supported by the dtype {self._dtype}")
+		if keepdims:
+			return type(self)(np.array([value], dtype=np.float64), dtype)
+		return self._quantity(value, dtype)
+
+	def _groupby_op(self, *, how: str, has_dropped_na: bool, min_count: int, ngroups: int, ids: np.ndarray, **kwargs):
+		"""Reductions (sum, mean, median, min, max, first, last, var, std, sem) and transformations
+		(cumsum, cummin, cummax, rank) of groupby, computed on the float64 values with NumPy
+		"""
+		skipna = kwargs.get('skipna', True)
+		if how in ('cumsum', 'cummin', 'cummax'):
+			return type(self)(_group_accumulate(how, self._values, ids, skipna), self._dtype)
+		if how == 'rank':
+			return _group_rank(self._values, ids, **kwargs)
+		if how not in _GROUP_REDUCTIONS:
+			raise TypeError(f"'{how}' is not supported by the dtype {self._dtype}")
+		values = _group_reduce(how, self._values, ids, ngroups, min_count, kwargs.get('ddof', 1), skipna)
+		if how == 'var':
+			return type(self)(values, _variance_dtype(self._dtype))
+		if how in ('std', 'sem'):
+			return type(self)(values, _spread_dtype(self._dtype))
+		return type(self)(values, self._dtype)
+
+
+_GROUP_REDUCTIONS = ('sum', 'mean', 'median', 'min', 'max', 'first', 'last', 'var', 'std', 'sem')
+
+
+def _groups(codes: np.ndarray):
+	"""Yield the code and the indexes of each group of 'codes' (negative codes are left out)"""
+	order = np.argsort(codes, kind='stable')
+	order = order[codes[order] >= 0]
+	for group in np.split(order, np.flatnonzero(np.diff(codes[order])) + 1):
+		if len(group):
+			yield codes[group[0]], group
+
+
+def _group_reduce(how: str, values: np.ndarray, ids: np.ndarray, ngroups: int, min_count: int, ddof: int, skipna: bool) -> np.ndarray:
+	"""Return the reduction 'how' of the values of each group, NaN for a group without value"""
+	keep = ids >= 0
+	if skipna:
+		keep &= ~np.isnan(values)
+	codes, values = ids[keep], values[keep]
+	counts = np.bincount(codes, minlength=ngroups)
+	with np.errstate(invalid='ignore', divide='ignore'):
+		if how in ('sum', 'mean', 'var', 'std', 'sem'):
+			sums = np.bincount(codes, weights=values, minlength=ngroups)
+			if how == 'sum':
+				if min_count > 0:
+					sums[counts < min_count] = np.nan
+				return sums
+			means = sums / counts
+			if how == 'mean':
+				return means
+			deviations = values - means[codes]
+			result = np.bincount(codes, weights=deviations * deviations, minlength=ngroups) / (counts - ddof)
+			result[counts <= ddof] = np.nan
+			if how == 'var':
+				return result
+			return np.sqrt(result) if how == 'std' else np.sqrt(result / counts)
+
+		result = np.full(ngroups, np.nan)
+		if how in ('min', 'max'):
+			result[:] = np.inf if how == 'min' else -np.inf
+			(np.minimum if how == 'min' else np.maximum).at(result, codes, values)
+		elif how in ('first', 'last'):
+			if how == 'last':
+				codes, values = codes[::-1], values[::-1]
+			present, first = np.unique(codes, return_index=True)
+			result[present] = values[first]
+		else:
+			for code, group in _groups(codes):
+				result[code] = np.median(values[group])
+		result[counts < max(min_count, 1)] = np.nan
+		return result
+
+
+def _group_accumulate(how: str, values: np.ndarray, ids: np.ndarray, skipna: bool) -> np.ndarray:
+	"""Return the cumulative sum, minimum or maximum of the values in each group"""
+	result = np.full(len(values), np.nan)
+	missing = np.isnan(values)
+	for _, group in _groups(ids):
+		chunk = values[group]
+		if how == 'cumsum':
+			accumulated = np.cumsum(np.where(missing[group], 0., chunk) if skipna else chunk)
+		elif skipna:
+			accumulated = (np.fmin if how == 'cummin' else np.fmax).accumulate(chunk)
+		else:
+			accumulated = (np.minimum if how == 'cummin' else np.maximum).accumulate(chunk)
+		if skipna:
+			accumulated[missing[group]] = np.nan
+		result[group] = accumulated
+	return result
+
+
+def _group_rank(values: np.ndarray, ids: np.ndarray, ties_method: str = 'average', ascending: bool = True, na_option: str = 'keep', pct: bool = False, **kwargs) -> np.ndarray:
+	"""Return the rank of the values in each group (see pandas.Series.rank)"""
+	result = np.full(len(values), np.nan)
+	for _, group in _groups(ids):
+		result[group] = pd.Series(values[group]).rank(method=ties_method, ascending=ascending, na_option=na_option, pct=pct).to_numpy()
+	return result
+
+
+def _variance_dtype(dtype: QuantityDtype) -> QuantityDtype:
+	"""Return the dtype of the variance of values of 'dtype', see Unit.difference_unit"""
+	return QuantityDtype(dtype.unit.difference_unit() ** 2, PrefixEnum.none)
+
+
+def _spread_dtype(dtype: QuantityDtype) -> QuantityDtype:
+	"""Return the dtype of a spread of values of 'dtype' (std, sem): 'dtype' itself, or the difference
+	unit for a unit with an offset (K for °C)
+	"""
+	if dtype.unit.offset == 0:
+		return dtype
+	return QuantityDtype(dtype.unit.difference_unit(), PrefixEnum.none)
+
+
+@register_series_accessor('pq')
+class QuantityAccessor:
+	"""Accessor '.pq' of a Series of quantities"""
+
+	def __init__(self, series: pd.Series):
+		if not isinstance(series.dtype, QuantityDtype):
+			raise AttributeError("The '.pq' accessor is only available for a Series with a QuantityDtype")
+		self._series = series
+
+	def to(self, prefix: Union[str, float, Prefix] = None, unit: Union[str, Unit] = None) -> pd.Series:
+		"""Return the Series with another base prefix (and converted in another compatible unit). The
+		class of the elements is kept if the unit is the same.
+		"""
+		array = self._series.array
+		if unit is not None:
+			dtype = QuantityDtype(unit)
+			quantity_class = array.dtype.quantity_class if dtype.unit is array.dtype.unit else Quantity
+			array = array.astype(QuantityDtype(dtype.unit, dtype.base_prefix if prefix is None else prefix, quantity_class))
+		elif prefix is not None:
+			array = QuantityExtensionArray(array._values, QuantityDtype(array.dtype.unit, prefix, array.dtype.quantity_class))
+		return pd.Series(array, index=self._series.index, name=self._series.name)
+
+	def magnitude(self, prefix: Union[str, float, Prefix] = None) -> pd.Series:
+		"""Return the float64 values defined with 'prefix' (default: the base prefix)"""
+		array = self._series.array
+		prefix = array.dtype.base_prefix if prefix is None else PrefixEnum._resolve_prefix(prefix, 'prefix')
+		values = array._values if prefix.value == 1 else PrefixEnum._scale(array._values, PrefixEnum.none, prefix)
+		return pd.Series(values, index=self._series.index, name=self._series.name)
+
+	def to_quantity_array(self) -> QuantityArray:
+		"""Return a QuantityArray sharing the values of the Series"""
+		return self._series.array.to_quantity_array()
+
+	@property
+	def unit(self) -> Unit:
+		return self._series.dtype.unit
+
+	@property
+	def base_prefix(self) -> Prefix:
+		return self._series.dtype.base_prefix
@@ -0,0 +1,238 @@
+"""Parallel conversion and reduction of large arrays of quantities.
+
+The values are split in chunks of 'chunk_size' values, processed by the workers of a
+ProcessPoolExecutor. The values of a QuantityArray are copied once in a shared memory block and
+the converted values are written in another one, so no value is pickled; a column file
+(pyquantity.storage) is mapped by each task. The chunks only depend on 'chunk_size' and the
+partial results are merged in the order of chunks, so the result does not depend on the number
+of workers nor on the order in which they finish. Inputs with less than 'threshold' values are
+processed in the current process, with the same chunks.
+
+	speeds = parallel_convert(readings, DerivedUnit.celcius())
+	total = parallel_reduce(open_column('readings.pqc'), 'mean')
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, Tuple, Union
+import math
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+
+from . import PrefixEnum, Unit
+from .unit import Prefix
+from .quantity import Quantity
+from .quantityArray import QuantityArray
+from .storage import QuantityColumn, open_column
+
+
+PARALLEL_THRESHOLD = 1_000_000  # inputs with less values are processed in the current process
+DEFAULT_CHUNK_SIZE = 1 << 20  # number of values per chunk
+REDUCTIONS = ('sum', 'mean', 'min', 'max')
+
+# a source of values in a worker: ('shared', name of the shared memory, number of values) or ('file', path)
+_Source = Tuple[str, str, int]
+
+_created = set()  # names of the shared memory blocks created by this process
+
+
+def _attach(source: _Source):
+	"""Return (values, shared memory or None) of a source. A column file is mapped again by each task
+	and unmapped when its values are deleted, so a file written again is not read through a stale mapping.
+	"""
+	kind, name, count = source
+	if kind == 'file':
+		return open_column(name), None
+	memory = _open_shared(name)
+	return np.ndarray((count,), dtype=np.float64, buffer=memory.buf), memory
+
+
+def _open_shared(name: str) -> shared_memory.SharedMemory:
+	"""Attach a shared memory block created by the parent process (or by this process, with a thread
+	executor), without leaving it in a resource tracker of the worker, which would unlink it when the
+	worker exits
+	"""
+	if sys.version_info >= (3, 13):
+		return shared_memory.SharedMemory(name=name, track=False)
+	# before 3.13, attaching registers the block in the resource tracker. The processes started by
+	# multiprocessing (the workers) share the tracker of their parent, where the block is already
+	# registered: unregistering it would drop the entry of the parent, so it is left. Another process
+	# has its own tracker, which would unlink the block at exit: the block is unregistered there. The
+	# process which created the block keeps it registered, as it unlinks it.
+	memory = shared_memory.SharedMemory(name=name)
+	if name not in _created and multiprocessing.parent_process() is None and os.name == 'posix':  # only POSIX shared memory is registered
+		resource_tracker.unregister('/' + memory.name, 'shared_memory')
+	return memory
+
+
+def _values(values, start: int, stop: int) -> np.ndarray:
+	"""Return the values without prefix of a chunk of an array or a QuantityColumn"""
+	if isinstance(values, QuantityColumn):
+		return values[start:stop].values
+	return values[start:stop]
+
+
+def _convert_values(values, result: np.ndarray, start: int, stop: int, scale: float, offset: float):
+	chunk = result[start:stop]
+	np.multiply(_values(values, start, stop), scale, out=chunk)
+	if offset != 0:
+		np.add(chunk, offset, out=chunk)
+
+
+def _reduce_values(values, start: int, stop: int, operation: str) -> float:
+	chunk = _values(values, start, stop)
+	if operation in ('sum', 'mean'):
+		return float(chunk.sum())
+	return float(chunk.min() if operation == 'min' else chunk.max())
+
+
+def _convert_chunk(source: _Source, output: _Source, start: int, stop: int, scale: float, offset: float):
+	"""Task of a worker: convert a chunk of 'source' in 'output'"""
+	values, memory = _attach(source)
+	result, output_memory = _attach(output)
+	try:
+		_convert_values(values, result, start, stop, scale, offset)
+	finally:
+		del values, result
+		for handle in (memory, output_memory):
+			if handle is not None:
+				handle.close()
+
+
+def _reduce_chunk(source: _Source, start: int, stop: int, operation: str) -> float:
+	"""Task of a worker: reduce a chunk of 'source'"""
+	values, memory = _attach(source)
+	try:
+		return _reduce_values(values, start, stop, operation)
+	finally:
+		del values
+		if memory is not None:
+			memory.close()
+
+
+def _chunks(count: int, chunk_size: int) -> List[Tuple[int, int]]:
+	if not isinstance(chunk_size, int) or chunk_size <= 0:
+		raise ValueError(f"'chunk_size' must be a positive int, not {chunk_size}")
+	return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+class _Input:
+	"""The values of a QuantityArray or a QuantityColumn, shared with the workers while in a with block"""
+
+	def __init__(self, quantities: Union[QuantityArray, QuantityColumn], parallel: bool):
+		if not isinstance(quantities, (QuantityArray, QuantityColumn)):
+			raise ValueError(f"'quantities' must be a QuantityArray or a QuantityColumn, not a {type(quantities)}")
+		self.quantities = quantities
+		self.parallel = parallel
+		self.memory = None
+
+	def __enter__(self) -> Union[_Source, None]:
+		"""Return the source of values for the workers (None if the values are not shared)"""
+		count = len(self.quantities)
+		if isinstance(self.quantities, QuantityColumn):
+			return 'file', os.path.abspath(self.quantities.path), count
+		if not self.parallel:
+			return None
+		self.memory = _create_shared(count)
+		np.ndarray((count,), dtype=np.float64, buffer=self.memory.buf)[:] = self.quantities.values
+		return 'shared', self.memory.name, count
+
+	def __exit__(self, *exc_info):
+		if self.memory is not None:
+			_release_shared(self.memory)
+
+
+def _create_shared(count: int) -> shared_memory.SharedMemory:
+	memory = shared_memory.SharedMemory(create=True, size=max(count, 1) * 8)
+	_created.add(memory.name)
+	return memory
+
+
+def _release_shared(memory: shared_memory.SharedMemory):
+	"""Close and unlink a shared memory block created by '_create_shared'"""
+	_created.discard(memory.name)
+	memory.close()
+	memory.unlink()
+
+
+def _run(function, tasks: List[tuple], workers: int, executor: Executor) -> list:
+	"""Run function(*task) for each task, in the order of tasks"""
+	if executor is not None:
+		return list(executor.map(function, *zip(*tasks)))
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		return list(pool.map(function, *zip(*tasks)))
+
+
+def parallel_convert(quantities: Union[QuantityArray, QuantityColumn], unit: Unit = None, base_prefix: Union[str, float, Prefix] = None, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE, threshold: int = PARALLEL_THRESHOLD, executor: Executor = None) -> QuantityArray:
+	"""Convert the values of a QuantityArray or a column file in 'unit' and return a new QuantityArray.
+
+	Parameters
+	----------
+	quantities: a QuantityArray or a QuantityColumn (see pyquantity.storage)
+	unit: the unit of the result, compatible with the unit of quantities (default: the same unit)
+	base_prefix: the base prefix of the result (default: the base prefix of quantities)
+	workers: the number of processes (default: os.cpu_count())
+	chunk_size: the number of values per task
+	threshold: below this number of values, the conversion is done in the current process
+	executor: an executor to use instead of a new ProcessPoolExecutor
+	"""
+	unit = quantities.unit if unit is None else unit
+	if not quantities.unit.is_compatible(unit):
+		raise ValueError(f"Can't convert '{quantities.unit}' in '{unit}'")
+	scale, offset = quantities.unit.conversion_to(unit)
+	base_prefix = quantities.base_prefix if base_prefix is None else base_prefix
+	count = len(quantities)
+	chunks = _chunks(count, chunk_size)
+	parallel = 0 < count and threshold <= count and (executor is not None or workers != 1)
+
+	with _Input(quantities, parallel) as source:
+		if not parallel:
+			values = quantities.values if isinstance(quantities, QuantityArray) else quantities
+			result = np.empty(count, dtype=np.float64)
+			for start, stop in chunks:
+				_convert_values(values, result, start, stop, scale, offset)
+		else:
+			output = _create_shared(count)
+			try:
+				tasks = [(source, ('shared', output.name, count), start, stop, scale, offset) for start, stop in chunks]
+				_run(_convert_chunk, tasks, workers, executor)
+				result = np.ndarray((count,), dtype=np.float64, buffer=output.buf).copy()
+			finally:
+				_release_shared(output)
+
+	converted = QuantityArray._new(result, unit, PrefixEnum.none)
+	converted.base_prefix = base_prefix
+	return converted
+
+
+def parallel_reduce(quantities: Union[QuantityArray, QuantityColumn], operation: str = 'sum', workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE, threshold: int = PARALLEL_THRESHOLD, executor: Executor = None) -> Quantity:
+	"""Reduce the values of a QuantityArray or a column file and return a Quantity.
+
+	'operation' is one of REDUCTIONS. The partial sums of chunks are added with math.fsum, so the
+	result does not depend on the number of workers. The other parameters are the ones of
+	'parallel_convert'.
+	"""
+	if operation not in REDUCTIONS:
+		raise ValueError(f"'operation' must be one of {REDUCTIONS}, not {operation}")
+	count = len(quantities)
+	if count == 0:
+		raise ValueError(f"Can't compute the {operation} of no value")
+	chunks = _chunks(count, chunk_size)
+	parallel = 0 < count and threshold <= count and (executor is not None or workers != 1)
+
+	with _Input(quantities, parallel) as source:
+		if not parallel:
+			values = quantities.values if isinstance(quantities, QuantityArray) else quantities
+			partials = [_reduce_values(values, start, stop, operation) for start, stop in chunks]
+		else:
+			partials = _run(_reduce_chunk, [(source, start, stop, operation) for start, stop in chunks], workers, executor)
+
+	if operation == 'sum':
+		value = math.fsum(partials)
+	elif operation == 'mean':
+		value = math.fsum(partials) / count
+	else:
+		value = min(partials) if operation == 'min' else max(partials)
+	return Quantity._new(value, quantities.unit, quantities.base_prefix)
@@ -0,0 +1,198 @@
+"""Module to parse quantities ("12.5 km") and unit expressions ("kg·m/s^2")"""
+from functools import lru_cache
+from typing import Dict, List, Tuple
+import re
+
+from . import PrefixEnum, Unit, BASE_UNITS, DERIVED_UNIT
+from .unit import Prefix, intern_unit
+from .quantity import Quantity
+from . import errors
+
+
+PARSE_CACHE_SIZE = 512  # number of unit expressions kept by parse_unit
+
+# other symbols accepted for a prefix
+PREFIX_ALIASES = {'µ': 'micro', 'μ': 'micro'}
+
+_QUANTITY_PATTERN = re.compile(r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*(.*?)\s*$")
+_TOKEN_PATTERN = re.compile(r"\*\*|[*·/^]|[^\s*·/^]+")
+
+
+class _PrefixTrie:
+	"""A trie of prefix symbols, to find all prefixes which start a string"""
+
+	def __init__(self, prefixes: Dict[str, Prefix]):
+		self._root = {}
+		for symbol, prefix in prefixes.items():
+			if symbol == '':
+				continue
+			node = self._root
+			for char in symbol:
+				node = node.setdefault(char, {})
+			node[None] = prefix
+
+	def matches(self, text: str) -> List[Tuple[str, Prefix]]:
+		"""Return the (symbol, prefix) which start 'text', the longest first"""
+		found = []
+		node = self._root
+		for i, char in enumerate(text):
+			node = node.get(char)
+			if node is None:
+				break
+			if None in node:
+				found.append((text[:i + 1], node[None]))
+		found.reverse()
+		return found
+
+
+_trie = None
+_trie_version = -1
+
+
+def _get_trie() -> _PrefixTrie:
+	"""Return the trie of prefixes, rebuilt when PrefixEnum changed"""
+	global _trie, _trie_version
+	if _trie_version != PrefixEnum._version:
+		prefixes = dict(PrefixEnum._prefix_by_symbol)
+		for symbol, name in PREFIX_ALIASES.items():
+			prefixes.setdefault(symbol, PrefixEnum.get_prefix(name))
+		_trie = _PrefixTrie(prefixes)
+		_trie_version = PrefixEnum._version
+	return _trie
+
+
+def _get_units() -> Dict[str, Unit]:
+	"""Return the units of BASE_UNITS and DERIVED_UNIT by symbol (the first defined wins)"""
+	units = {}
+	for registry in (BASE_UNITS, DERIVED_UNIT):
+		for unit in registry.values():
+			units.setdefault(unit.symbol, unit)
+	return units
+
+
+def _parse_term(term: str) -> Tuple[Prefix, Unit]:
+	"""Parse a unit symbol with an optional prefix, like "km" or "mol".
+	A symbol which is a unit is never split ("m" is the metre, "cd" the candela), else the
+	longest prefix followed by a unit is used ("dam" is deca-metre, "mm" is mili-metre).
+	"""
+	units = _get_units()
+	unit = units.get(term)
+	if unit is not None:
+		return PrefixEnum.none, unit
+	for symbol, prefix in _get_trie().matches(term):
+		unit = units.get(term[len(symbol):])
+		if unit is not None:
+			return prefix, unit
+	raise errors.ParseError(f"Unknown unit '{term}'")
+
+
+def _prefixed_unit(prefix: Prefix, unit: Unit) -> Unit:
+	"""Return the unit with the prefix included in its scale"""
+	if prefix.value == 1:
+		return unit
+	return intern_unit(unit.name_with_prefix(prefix), unit.symbol_with_prefix(prefix), dimension=unit.dimension, scale=unit.scale * prefix.value)
+
+
+def _parse_exponent(tokens: List[str], i: int) -> Tuple[int, int]:
+	"""Return the exponent which follows tokens[i] (1 if none) and the index of the next token"""
+	if i + 1 < len(tokens) and tokens[i + 1] in ('^', '**'):
+		if i + 2 >= len(tokens):
+			raise errors.ParseError(f"Missing exponent after '{tokens[i]}'")
+		try:
+			return int(tokens[i + 2]), i + 3
+		except ValueError:
+			raise errors.ParseError(f"The exponent must be an integer, not '{tokens[i + 2]}'") from None
+	return 1, i + 1
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_unit(expression: str, version: int) -> Tuple[Prefix, Unit]:
+	"""Parse 'expression'. 'version' is the version of PrefixEnum, so that entries parsed with
+	other prefixes are never returned.
+	"""
+	tokens = _TOKEN_PATTERN.findall(expression)
+	if len(tokens) == 0:
+		raise errors.ParseError("Empty unit expression")
+
+	factors = []  # (prefix, unit, exponent)
+	operator = '*'
+	i = 0
+	while i < len(tokens):
+		token = tokens[i]
+		if token in ('*', '·', '/', '^', '**'):
+			raise errors.ParseError(f"Unexpected '{token}' in '{expression}'")
+		exponent, i = _parse_exponent(tokens, i)
+		if token == '1' and len(factors) == 0 and exponent == 1:
+			pass  # numerator of "1/s"
+		else:
+			prefix, unit = _parse_term(token)
+			factors.append((prefix, unit, exponent if operator != '/' else -exponent))
+
+		if i < len(tokens):
+			operator = tokens[i]
+			if operator not in ('*', '·', '/'):
+				raise errors.ParseError(f"Expected an operator after '{token}' in '{expression}', not '{operator}'")
+			if i + 1 == len(tokens):
+				raise errors.ParseError(f"Missing unit after '{operator}' in '{expression}'")
+			i += 1
+
+	if len(factors) == 1 and factors[0][2] == 1:
+		return factors[0][0], factors[0][1]
+
+	numerator = _product((prefix, unit, exponent) for prefix, unit, exponent in factors if exponent > 0)
+	denominator = _product((prefix, unit, -exponent) for prefix, unit, exponent in factors if exponent < 0)
+	if numerator is None and denominator is None:
+		raise errors.ParseError(f"No unit in '{expression}'")
+	elif denominator is None:
+		return PrefixEnum.none, numerator
+	elif numerator is None:
+		return PrefixEnum.none, denominator ** -1
+	return PrefixEnum.none, numerator / denominator
+
+
+def _product(factors) -> Unit:
+	"""Return the product of (prefix, unit, exponent) factors, None if there is no factor"""
+	result = None
+	for prefix, unit, exponent in factors:
+		unit = _prefixed_unit(prefix, unit)
+		if exponent != 1:
+			unit = unit ** exponent
+		result = unit if result is None else result * unit
+	return result
+
+
+def parse_unit(expression: str) -> Tuple[Prefix, Unit]:
+	"""Parse a unit expression and return (prefix, unit).
+
+	A single term ("km", "ms", "°C") gives its prefix and the unit of BASE_UNITS or DERIVED_UNIT.
+	A compound expression ("m/s^2", "kg·m/s**2", "1/s") gives PrefixEnum.none and a DerivedUnit
+	with the prefixes included in its scale. Terms are separated by '*', '·' or '/' (which applies
+	to the next term only) and may have an integer exponent ('^' or '**').
+
+	Results are kept in a bounded cache (see 'parse_cache_info').
+	"""
+	if not isinstance(expression, str):
+		raise ValueError(f"'expression' must be a str, not a {type(expression)}")
+	return _parse_unit(expression.strip(), PrefixEnum._version)
+
+
+def parse_quantity(text: str) -> Quantity:
+	"""Parse a quantity like "12.5 km" or "9.81 m/s^2" and return a Quantity"""
+	if not isinstance(text, str):
+		raise ValueError(f"'text' must be a str, not a {type(text)}")
+	match = _QUANTITY_PATTERN.match(text)
+	if match is None:
+		raise errors.ParseError(f"'{text}' is not a quantity")
+	value, expression = match.groups()
+	prefix, unit = parse_unit(expression)
+	return Quantity(float(value), unit, prefix=prefix)
+
+
+def parse_cache_info():
+	"""Return the statistics (hits, misses, maxsize, currsize) of the cache of parse_unit"""
+	return _parse_unit.cache_info()
+
+
+def clear_parse_cache():
+	"""Clear the cache of parse_unit, needed if BASE_UNITS or DERIVED_UNIT are modified"""
+	_parse_unit.cache_clear()
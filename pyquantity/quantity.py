@@ -1,175 +1,16 @@
 from typing import Union
 import operator
-from copy import deepcopy
 
 from . import PrefixEnum, Unit, BASE_UNITS
-from .unit import Prefix
+from .unit import Prefix, get_unit
 from . import errors
 
 
-class Quantity:
-	_unit = None  # define the units of quantity
-	_base_prefix = PrefixEnum.none  # define the base prefix of quantity. For example, for the mass it's 'kilo'.
-
-	def __init__(self, value: float, unit: Union[str, Unit], base_prefix: Union[str, float, Prefix] = PrefixEnum.none, prefix: Prefix = None):
-		"""Initialize an instance of Quantity
-	
-		Parameters
-		----------
-		None
-		"""
-		self.base_prefix = base_prefix
-		if (prefix is None and self._base_prefix.value == 1) or (isinstance(prefix, Prefix) and prefix.value == 1):
-			# value with a prefix of value = 1
-			self._value = value
-
-		elif prefix is None or (isinstance(prefix, Prefix) and prefix.value == slef.base_prefix.value):
-			# value with the base prefix
-			self._value = PrefixEnum.convert_value(value, to_=PrefixEnum.none, from_=self._base_prefix)
-
-		elif isinstance(prefix, Prefix):
-			# value with other prefix
-			self._value = PrefixEnum.convert_value(value, to_=PrefixEnum.none, from_=prefix)
-
-		else:
-			raise ValueError(f"'prefix' argument must be a Prefix, not {type(prefix)}")
-
-		self.unit = unit
-
-	def __repr__(self) -> str:
-		"""repr(self)"""
-		return f"<{self.name}: {self._value} {self.unit.symbol_with_prefix(self._base_prefix)}>"
-
-	def __str__(self) -> str:
-		"""str(self)"""
-		return f"{self._value} {self.unit.symbol_with_prefix(self._base_prefix)}"
-
-	def __format__(self, fmt_spec: str = "") -> str:
-		"""format(self, str)"""
-		return format(str(self), format_spec=fmt_spec)
-
-	def __add__(self, other):
-		"""self + other"""
-		raise NotImplemented
-
-	def __sub__(self, other):
-		"""self - other"""
-		raise NotImplemented
-
-	def __mul__(self, other):
-		"""self * other"""
-		raise NotImplemented
-
-	def __floordiv__(self, other):
-		"""self // other"""
-		raise NotImplemented
-
-	def __div__(self, other):
-		"""self / other"""
-		raise NotImplemented
-
-	def __pow__(self, other):
-		"""self ** other"""
-		raise NotImplemented
-
-	def __iadd__(self, other):
-		"""self += other"""
-		self.__assignement(other, operator.iadd)
-
-	def __isub__(self, other):
-		"""self -= other"""
-		self.__assignement(other, operator.isub)
-
-	def __pos__(self):
-		""" + self"""
-		return self.__unary_operation(operator.pos)
-
-	def __neg__(self):
-		"""- self"""
-		return self.__unary_operation(operator.neg)
-
-	def __abs__(self):
-		""" abs(self)"""
-		return self.__unary_operation(operator.abs)
-
-	def __int__(self) -> int:
-		"""int(self)"""
-		return int(self._value)
-
-	def __float__(self) -> float:
-		"""float(self)"""
-		return float(self._value)
-
-	def __lt__(self, other) -> bool:
-		"""self < other"""
-		return self.__compare(other, operator.lt)
-
-	def __le__(self, other) -> bool:
-		"""self <= other"""
-		return self.__compare(other, operator.le)
-
-	def __eq__(self, other) -> bool:
-		"""self == other"""
-		return self.__compare(other, operator.eq)
-
-	def __ne__(self, other) -> bool:
-		"""self != other"""
-		return self.__compare(other, operator.ne)
-
-	def __gt__(self, other) -> bool:
-		"""self > other"""
-		return self.__compare(other, operator.gt)
-
-	def __ge__(self, other) -> bool:
-		"""self >= other"""
-		return self.__compare(other, operator.ge)
-
-	def __assignement(self, other, op):
-		"""Method for assignment operators.
-		other can be a int or float. If other is a int or float, it is defined with the base prefix.
-		"""
-		if type(other) == type(self):
-			op(self._value, other.value)
-		elif isinstance(other, (int, float)):
-			op(self._value, PrefixEnum.convert_value(other, to_=PrefixEnum.none, from_=self._base_prefix))
-		raise ValueError(f"Can't do a assignment between {type(self)} and {type(other)}")
-
-	def __unary_operation(self, op):
-		"""Method for unary operator"""
-		new = deepcopy(self)
-		new.none = op(self._value)
-		return new
-
-	def __compare(self, other, op) -> bool:
-		"""Method to compare self and other with a operator.
-		other can be a int or float. If other is a int or float, it is defined with the base prefix.
-		"""
-		if type(other) == type(self):
-			return op(self._value, other.value)
-		elif isinstance(other, (int, float)):
-			return op(self._value, PrefixEnum.convert_value(other, to_=PrefixEnum.none, from_=self._base_prefix))
-		raise ValueError(f"Can't compare '{type(self)}' with '{type(other)}'")
-
-	def _format_real_value(self) -> str:
-		if abs(self._value) >= 1000:
-			return f"{self._value:.3e}"
-		return f"{self._value:.3f}"
-
-	def value_to_prefix(self, prefix: Prefix) -> float:
-		if not isinstance(prefix, Prefix):
-			raise ValueError(f"'prefix' must be a Prefix, not a {type(prefix)}")
-		return PrefixEnum.convert_value(self.value, to_=prefix)
-
-	def set_value_from_prefix(self, new_value: float, prefix: Prefix):
-		try:
-			new_value = float(new_value)
-		except Exception:
-			raise ValueError(f"'new_value' must be a float, not a {type(new_value)}")
-
-		if not isinstance(prefix, Prefix):
-			raise ValueError(f"'prefix' must be a Prefix, not a {type(prefix)}")
-
-		self._value = PrefixEnum.convert_value(new_value, to_=PrefixEnum.none, from_=prefix)
+class _PrefixAccessors:
+	"""Accessors of the value with each prefix of PrefixEnum.
+	Subclasses must define `value`, `value_to_prefix` and `set_value_from_prefix`.
+	"""
+	__slots__ = ()
 
 	def yotta(self) -> float:
 		return self.value_to_prefix(PrefixEnum.yotta)
@@ -297,51 +138,6 @@ class Quantity:
 	def set_yocto(self, new_value: float):
 		self.set_value_from_prefix(new_value, PrefixEnum.yocto)
 
-	@classmethod
-	def get_name(cls) -> str:
-		return cls.__name__
-
-	@property
-	def unit(self) -> Unit:
-		return self._unit
-
-	@unit.setter
-	def unit(self, new_unit: Union[str, Unit]):
-		if isinstance(new_unit, str):
-			self._unit = Unit(new_unit, new_unit)
-		elif isinstance(new_unit, Unit):
-			self._unit = new_unit
-		else:
-			raise ValueError(f"'unit' must be a string which define the symbol of unit or an instance of Unit, not {type(new_unit)}")
-
-	@property
-	def base_prefix(self) -> Prefix:
-		return self._base_prefix
-
-	@base_prefix.setter
-	def base_prefix(self, prefix: Union[str, float, Prefix]):
-		if isinstance(prefix, Prefix):
-			self._base_prefix = prefix
-		elif isinstance(prefix, str) or isinstance(prefix, float):
-			PrefixEnum.get_prefix(prefix)
-		else:
-			raise ValueError(f"'prefix' must be a str, a float or a Prefix, not a {type(prefix)}")
-
-	@property
-	def value(self) -> float:
-		return self._value
-
-	@value.setter
-	def value(self, new_value: float):
-		if isinstance(new_value, float) and self._base_prefix.value == 1:
-			self._value = new_value
-		elif isinstance(new_value, float):
-			self.set_value_from_prefix(new_value, to_=PrefixEnum.none, from_=self._base_prefix)
-		raise ValueError(f"'value' must be a float, not {type(new_value)}")
-
-	@property
-	def name(self) -> str:
-		return self.get_name()
 
 	@property
 	def Y(self) -> float:
@@ -385,7 +181,7 @@ class Quantity:
 
 	@property
 	def none(self) -> float:
-		return self._value
+		return self.no_prefix()
 
 	@property
 	def d(self) -> float:
@@ -510,3 +306,333 @@ class Quantity:
 	@y.setter
 	def y(self, new_value: float):
 		return self.set_yocto(new_value)
+
+
+class Quantity(_PrefixAccessors):
+	# _value: the value without prefix
+	# _unit: the unit of quantity
+	# _base_prefix: the base prefix of quantity. For example, for the mass it's 'kilo'.
+	__slots__ = ('_value', '_unit', '_base_prefix')
+
+	def __init__(self, value: float, unit: Union[str, Unit], base_prefix: Union[str, float, Prefix] = PrefixEnum.none, prefix: Prefix = None):
+		"""Initialize an instance of Quantity
+	
+		Parameters
+		----------
+		None
+		"""
+		self.base_prefix = base_prefix
+		if (prefix is None and self._base_prefix.value == 1) or (isinstance(prefix, Prefix) and prefix.value == 1):
+			# value with a prefix of value = 1
+			self._value = value
+
+		elif prefix is None or (isinstance(prefix, Prefix) and prefix.value == self._base_prefix.value):
+			# value with the base prefix
+			self._value = PrefixEnum.convert_value(value, to_=PrefixEnum.none, from_=self._base_prefix)
+
+		elif isinstance(prefix, Prefix):
+			# value with other prefix
+			self._value = PrefixEnum.convert_value(value, to_=PrefixEnum.none, from_=prefix)
+
+		else:
+			raise ValueError(f"'prefix' argument must be a Prefix, not {type(prefix)}")
+
+		self.unit = unit
+
+	def __repr__(self) -> str:
+		"""repr(self)"""
+		return f"<{self.name}: {self._base_value()} {self._unit.symbol_with_prefix(self._base_prefix)}>"
+
+	def __str__(self) -> str:
+		"""str(self)"""
+		return f"{self._base_value()} {self._unit.symbol_with_prefix(self._base_prefix)}"
+
+	def __format__(self, fmt_spec: str = "") -> str:
+		"""format(self, str)"""
+		return format(str(self), fmt_spec)
+
+	def __add__(self, other):
+		"""self + other"""
+		return self.__additive_operation(other, operator.add)
+
+	def __radd__(self, other):
+		"""other + self"""
+		return self.__additive_operation(other, operator.add, reflected=True)
+
+	def __sub__(self, other):
+		"""self - other"""
+		return self.__additive_operation(other, operator.sub)
+
+	def __rsub__(self, other):
+		"""other - self"""
+		return self.__additive_operation(other, operator.sub, reflected=True)
+
+	def __mul__(self, other):
+		"""self * other"""
+		return self.__multiplicative_operation(other, operator.mul)
+
+	def __rmul__(self, other):
+		"""other * self"""
+		return self.__multiplicative_operation(other, operator.mul, reflected=True)
+
+	def __floordiv__(self, other):
+		"""self // other"""
+		raise NotImplemented
+
+	def __truediv__(self, other):
+		"""self / other"""
+		return self.__multiplicative_operation(other, operator.truediv)
+
+	def __rtruediv__(self, other):
+		"""other / self"""
+		return self.__multiplicative_operation(other, operator.truediv, reflected=True)
+
+	def __pow__(self, exponent: int):
+		"""self ** exponent"""
+		if not isinstance(exponent, int):
+			return NotImplemented
+		return Quantity._new(self._value ** exponent, self._unit ** exponent, PrefixEnum.none)
+
+	def __iadd__(self, other):
+		"""self += other"""
+		return self.__assignement(other, operator.add)
+
+	def __isub__(self, other):
+		"""self -= other"""
+		return self.__assignement(other, operator.sub)
+
+	def __imul__(self, other):
+		"""self *= other
+		other must be a int or a float (a quantity would change the unit).
+		"""
+		if isinstance(other, (int, float)):
+			self._value *= other
+			return self
+		raise ValueError(f"Can't multiply in place {type(self)} by {type(other)}")
+
+	def __pos__(self):
+		""" + self"""
+		return self.__unary_operation(operator.pos)
+
+	def __neg__(self):
+		"""- self"""
+		return self.__unary_operation(operator.neg)
+
+	def __abs__(self):
+		""" abs(self)"""
+		return self.__unary_operation(operator.abs)
+
+	def __int__(self) -> int:
+		"""int(self)"""
+		return int(self._value)
+
+	def __float__(self) -> float:
+		"""float(self)"""
+		return float(self._value)
+
+	def __lt__(self, other) -> bool:
+		"""self < other"""
+		return self.__compare(other, operator.lt)
+
+	def __le__(self, other) -> bool:
+		"""self <= other"""
+		return self.__compare(other, operator.le)
+
+	def __eq__(self, other) -> bool:
+		"""self == other, False for a quantity of an incompatible unit. A number is not equal to a
+		quantity (NotImplemented), as their hashes can't agree: compare it with the value.
+		"""
+		if not isinstance(other, Quantity):
+			return NotImplemented
+		if not self._unit.is_compatible(other._unit):
+			return False
+		return self.__compare(other, operator.eq)
+
+	def __ne__(self, other) -> bool:
+		"""self != other, True for a quantity of an incompatible unit or a number"""
+		if not isinstance(other, Quantity):
+			return NotImplemented
+		if not self._unit.is_compatible(other._unit):
+			return True
+		return self.__compare(other, operator.ne)
+
+	def __gt__(self, other) -> bool:
+		"""self > other"""
+		return self.__compare(other, operator.gt)
+
+	def __ge__(self, other) -> bool:
+		"""self >= other"""
+		return self.__compare(other, operator.ge)
+
+	def __hash__(self) -> int:
+		"""hash(self), from the normalized value and the canonical unit (see Unit.normalization), so equal
+		quantities of compatible units have the same hash. A quantity must not be changed in place while
+		it's in a set or a key of a dict.
+		"""
+		scale, offset, key = self._unit.normalization()
+		return hash((self._value * scale + offset, key))
+
+	def sort_key(self) -> float:
+		"""Return the value in the canonical unit of its dimension, to sort quantities of compatible units:
+		sorted(quantities, key=Quantity.sort_key)
+		"""
+		scale, offset, _ = self._unit.normalization()
+		return self._value * scale + offset
+
+	def __reduce__(self):
+		"""Pickle the class, the value, the unit and the base prefix, without the names of the slots"""
+		return _new_quantity, (type(self), self._value, self._unit, self._base_prefix)
+
+	def __assignement(self, other, op):
+		"""Method for assignment operators: update the value of self in place and return self.
+		other can be a Quantity with a compatible unit (used as a difference of values), a int or float.
+		If other is a int or float, it is defined with the base prefix.
+		"""
+		if isinstance(other, Quantity):
+			if not self._unit.is_compatible(other._unit):
+				raise ValueError(f"Can't do a assignment between '{self._unit}' and '{other._unit}'")
+			self._value = op(self._value, self._unit.convert_difference_from(other._value, other._unit))
+		elif isinstance(other, (int, float)):
+			self._value = op(self._value, PrefixEnum.convert_value(other, to_=PrefixEnum.none, from_=self._base_prefix))
+		else:
+			raise ValueError(f"Can't do a assignment between {type(self)} and {type(other)}")
+		return self
+
+	def __additive_operation(self, other, op, reflected: bool = False):
+		"""Method for + and -: the result has the unit, the base prefix and the class of self.
+		other can be a Quantity with a compatible unit (used as a difference of values), a int or float.
+		If other is a int or float, it is defined with the base prefix.
+		"""
+		if isinstance(other, Quantity):
+			if not self._unit.is_compatible(other._unit):
+				raise ValueError(f"Can't add or subtract '{self._unit}' and '{other._unit}'")
+			other_value = self._unit.convert_difference_from(other._value, other._unit)
+		elif isinstance(other, (int, float)):
+			other_value = PrefixEnum.convert_value(other, to_=PrefixEnum.none, from_=self._base_prefix)
+		else:
+			return NotImplemented
+		value = op(other_value, self._value) if reflected else op(self._value, other_value)
+		return self._new(value, self._unit, self._base_prefix)
+
+	def __multiplicative_operation(self, other, op, reflected: bool = False):
+		"""Method for * and /. With a int or a float, the result keeps the unit, the base prefix and
+		the class of self; with a Quantity, the result is a Quantity of the product or quotient of units.
+		"""
+		if isinstance(other, Quantity):
+			if reflected:
+				return Quantity._new(op(other._value, self._value), op(other._unit, self._unit), PrefixEnum.none)
+			return Quantity._new(op(self._value, other._value), op(self._unit, other._unit), PrefixEnum.none)
+		elif isinstance(other, (int, float)):
+			if reflected and op is operator.truediv:
+				return Quantity._new(other / self._value, self._unit ** -1, PrefixEnum.none)
+			return self._new(op(self._value, other), self._unit, self._base_prefix)
+		return NotImplemented
+
+	def __unary_operation(self, op):
+		"""Method for unary operator"""
+		return self._new(op(self._value), self._unit, self._base_prefix)
+
+	def __compare(self, other, op) -> bool:
+		"""Method to compare self and other with a operator.
+		other can be a Quantity with a compatible unit (same dimension), else NotImplemented is returned:
+		like == and !=, the ordering operators don't compare a quantity with a number (compare the value).
+		Raise a ValueError for a quantity of an incompatible unit.
+		"""
+		if isinstance(other, Quantity):
+			# normalized values, like __hash__ and sort_key, so equal quantities have the same hash
+			scale, offset, key = self._unit.normalization()
+			other_scale, other_offset, other_key = other._unit.normalization()
+			if key == other_key:
+				return op(self._value * scale + offset, other._value * other_scale + other_offset)
+			if not self._unit.is_compatible(other._unit):
+				raise ValueError(f"Can't compare '{self._unit}' with '{other._unit}'")
+			return op(self._value, self._unit.convert_from(other._value, other._unit))
+		return NotImplemented
+
+	def _base_value(self) -> float:
+		"""Return the value with the base prefix"""
+		if self._base_prefix.value == 1:
+			return self._value
+		return PrefixEnum._scale(self._value, PrefixEnum.none, self._base_prefix)
+
+	def _format_real_value(self) -> str:
+		if abs(self._value) >= 1000:
+			return f"{self._value:.3e}"
+		return f"{self._value:.3f}"
+
+	def value_to_prefix(self, prefix: Prefix) -> float:
+		if not isinstance(prefix, Prefix):
+			raise ValueError(f"'prefix' must be a Prefix, not a {type(prefix)}")
+		return PrefixEnum._scale(self._value, PrefixEnum.none, prefix)
+
+	def set_value_from_prefix(self, new_value: float, prefix: Prefix):
+		try:
+			new_value = float(new_value)
+		except Exception:
+			raise ValueError(f"'new_value' must be a float, not a {type(new_value)}")
+
+		if not isinstance(prefix, Prefix):
+			raise ValueError(f"'prefix' must be a Prefix, not a {type(prefix)}")
+
+		self._value = PrefixEnum._scale(new_value, prefix, PrefixEnum.none)
+
+	@classmethod
+	def get_name(cls) -> str:
+		return cls.__name__
+
+	@classmethod
+	def _new(cls, value: float, unit: Unit, base_prefix: Prefix):
+		"""Build an instance from a value already defined without prefix.
+		The unit and the prefix are shared, not copied, and __init__ is not called.
+		"""
+		new = cls.__new__(cls)
+		new._value = value
+		new._unit = unit
+		new._base_prefix = base_prefix
+		return new
+
+	@property
+	def unit(self) -> Unit:
+		return self._unit
+
+	@unit.setter
+	def unit(self, new_unit: Union[str, Unit]):
+		if isinstance(new_unit, str):
+			self._unit = get_unit(new_unit)
+		elif isinstance(new_unit, Unit):
+			self._unit = new_unit
+		else:
+			raise ValueError(f"'unit' must be a string which define the symbol of unit or an instance of Unit, not {type(new_unit)}")
+
+	@property
+	def base_prefix(self) -> Prefix:
+		return self._base_prefix
+
+	@base_prefix.setter
+	def base_prefix(self, prefix: Union[str, float, Prefix]):
+		if isinstance(prefix, Prefix):
+			self._base_prefix = prefix
+		elif isinstance(prefix, str) or isinstance(prefix, float):
+			self._base_prefix = PrefixEnum.get_prefix(prefix)
+		else:
+			raise ValueError(f"'prefix' must be a str, a float or a Prefix, not a {type(prefix)}")
+
+	@property
+	def value(self) -> float:
+		"""The value without prefix (see value_to_prefix for the value with another prefix).
+		The setter takes a value without prefix too, so 'quantity.value = quantity.value' keeps the quantity.
+		"""
+		return self._value
+
+	@value.setter
+	def value(self, new_value: float):
+		self.set_value_from_prefix(new_value, PrefixEnum.none)
+
+	@property
+	def name(self) -> str:
+		return self.get_name()
+
+
+def _new_quantity(cls: type, value: float, unit: Unit, base_prefix: Prefix) -> Quantity:
+	"""Rebuild a pickled quantity"""
+	return cls._new(value, unit, base_prefix)
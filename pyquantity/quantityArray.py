@@ -0,0 +1,400 @@
+"""Module with an array of quantities backed by NumPy"""
+from typing import Union, Iterable
+import operator
+
+import numpy as np
+
+from . import PrefixEnum, Unit
+from .unit import Prefix, get_unit
+from .quantity import Quantity, _PrefixAccessors
+
+
+class QuantityArray(_PrefixAccessors):
+	"""An array of values which share the same unit and base prefix.
+
+	The values are stored without prefix (like `Quantity`) in one contiguous float64 buffer,
+	so prefix conversions, comparisons and unary operations are whole-array NumPy operations.
+	"""
+	__slots__ = ('_values', '_unit', '_base_prefix')
+	# NumPy arrays defer binary operators to QuantityArray (ndarray + QuantityArray calls __radd__)
+	__array_ufunc__ = None
+
+	def __init__(self, values: Iterable[float], unit: Union[str, Unit], base_prefix: Union[str, float, Prefix] = PrefixEnum.none, prefix: Prefix = None):
+		"""Initialize an instance of QuantityArray
+
+		Parameters
+		----------
+		values: a sequence or an array of values, defined with 'prefix'
+		unit: the unit of values
+		base_prefix: the base prefix of the quantity (default prefix of values)
+		prefix: the prefix of 'values'. If None, 'base_prefix' is used.
+		"""
+		self.base_prefix = base_prefix
+		if prefix is None:
+			prefix = self._base_prefix
+		elif not isinstance(prefix, Prefix):
+			raise ValueError(f"'prefix' argument must be a Prefix, not {type(prefix)}")
+
+		values = np.array(values, dtype=np.float64)
+		if values.ndim != 1:
+			raise ValueError(f"'values' must be a one-dimensional sequence, not a {values.ndim}-dimensional one")
+		if prefix.value != 1:
+			values = PrefixEnum._scale(values, prefix, PrefixEnum.none)
+		self._values = values
+		self.unit = unit
+
+	def __repr__(self) -> str:
+		"""repr(self)"""
+		return f"<{self.name}: {self._base_values()} {self._unit.symbol_with_prefix(self._base_prefix)}>"
+
+	def __str__(self) -> str:
+		"""str(self)"""
+		return f"{self._base_values()} {self._unit.symbol_with_prefix(self._base_prefix)}"
+
+	def _base_values(self) -> np.ndarray:
+		"""Return the values with the base prefix"""
+		if self._base_prefix.value == 1:
+			return self._values
+		return PrefixEnum._scale(self._values, PrefixEnum.none, self._base_prefix)
+
+	def __array__(self, dtype=None, copy=None) -> np.ndarray:
+		"""np.asarray(self): the values without prefix, shared with self unless a copy or another dtype is asked"""
+		if copy:
+			return np.array(self._values, dtype=dtype, copy=True)
+		if dtype is None or np.dtype(dtype) == self._values.dtype:
+			return self._values
+		if copy is False:
+			raise ValueError(f"Can't give the values as {dtype} without copy")
+		return self._values.astype(dtype)
+
+	@property
+	def __array_interface__(self) -> dict:
+		"""The NumPy array interface of the values without prefix (shared with self)"""
+		return self._values.__array_interface__
+
+	def __buffer__(self, flags: int) -> memoryview:
+		"""Buffer protocol (Python 3.12+): the values without prefix, shared with self"""
+		return memoryview(self._values)
+
+	def __release_buffer__(self, view: memoryview):
+		view.release()
+
+	def __len__(self) -> int:
+		"""len(self)"""
+		return self._values.shape[0]
+
+	def __iter__(self):
+		"""iter(self)"""
+		return (self._make_quantity(value) for value in self._values.tolist())
+
+	def __getitem__(self, index):
+		"""self[index]
+		Return a Quantity for an integer index, a QuantityArray (a view) otherwise.
+		"""
+		if isinstance(index, (int, np.integer)):
+			return self._make_quantity(float(self._values[index]))
+		return self._new(self._values[index], self._unit, self._base_prefix)
+
+	def __add__(self, other):
+		"""self + other"""
+		return self.__additive_operation(other, np.add)
+
+	def __radd__(self, other):
+		"""other + self"""
+		return self.__additive_operation(other, np.add, reflected=True)
+
+	def __sub__(self, other):
+		"""self - other"""
+		return self.__additive_operation(other, np.subtract)
+
+	def __rsub__(self, other):
+		"""other - self"""
+		return self.__additive_operation(other, np.subtract, reflected=True)
+
+	def __mul__(self, other):
+		"""self * other"""
+		return self.__multiplicative_operation(other, np.multiply)
+
+	def __rmul__(self, other):
+		"""other * self"""
+		return self.__multiplicative_operation(other, np.multiply, reflected=True)
+
+	def __truediv__(self, other):
+		"""self / other"""
+		return self.__multiplicative_operation(other, np.true_divide)
+
+	def __rtruediv__(self, other):
+		"""other / self"""
+		return self.__multiplicative_operation(other, np.true_divide, reflected=True)
+
+	def __pow__(self, exponent: int):
+		"""self ** exponent"""
+		if not isinstance(exponent, int):
+			return NotImplemented
+		return QuantityArray._new(np.power(self._values, exponent), self._unit ** exponent, PrefixEnum.none)
+
+	def __iadd__(self, other):
+		"""self += other"""
+		return self.__assignement(other, np.add)
+
+	def __isub__(self, other):
+		"""self -= other"""
+		return self.__assignement(other, np.subtract)
+
+	def __imul__(self, other):
+		"""self *= other
+		other must be a number or a sequence of numbers (a quantity would change the unit).
+		"""
+		if isinstance(other, (int, float, list, tuple, np.ndarray)):
+			np.multiply(self._values, other, out=self._values)
+			return self
+		raise ValueError(f"Can't multiply in place {type(self)} by {type(other)}")
+
+	def __pos__(self):
+		""" + self"""
+		return self.__unary_operation(operator.pos)
+
+	def __neg__(self):
+		"""- self"""
+		return self.__unary_operation(operator.neg)
+
+	def __abs__(self):
+		""" abs(self)"""
+		return self.__unary_operation(operator.abs)
+
+	def __lt__(self, other) -> np.ndarray:
+		"""self < other"""
+		return self.__compare(other, operator.lt)
+
+	def __le__(self, other) -> np.ndarray:
+		"""self <= other"""
+		return self.__compare(other, operator.le)
+
+	def __eq__(self, other) -> np.ndarray:
+		"""self == other"""
+		return self.__compare(other, operator.eq)
+
+	def __ne__(self, other) -> np.ndarray:
+		"""self != other"""
+		return self.__compare(other, operator.ne)
+
+	def __gt__(self, other) -> np.ndarray:
+		"""self > other"""
+		return self.__compare(other, operator.gt)
+
+	def __ge__(self, other) -> np.ndarray:
+		"""self >= other"""
+		return self.__compare(other, operator.ge)
+
+	def __assignement(self, other, op):
+		"""Method for assignment operators: update the values of self in place and return self.
+		other can be a Quantity, a QuantityArray, a number or a sequence of numbers.
+		If other is a number or a sequence, it is defined with the base prefix.
+		"""
+		if isinstance(other, (QuantityArray, Quantity)):
+			if not self._unit.is_compatible(other.unit):
+				raise ValueError(f"Can't do a assignment between '{self.unit}' and '{other.unit}'")
+			op(self._values, self._unit.convert_difference_from(other.value, other.unit), out=self._values)
+		elif isinstance(other, (int, float, list, tuple, np.ndarray)):
+			op(self._values, self._base_to_none(np.asarray(other, dtype=np.float64)), out=self._values)
+		else:
+			raise ValueError(f"Can't do a assignment between {type(self)} and {type(other)}")
+		return self
+
+	def __additive_operation(self, other, op, reflected: bool = False):
+		"""Method for + and -: the result has the unit and the base prefix of self.
+		other can be a Quantity or a QuantityArray with a compatible unit (used as a difference of values),
+		a number or a sequence of numbers defined with the base prefix.
+		"""
+		if isinstance(other, (QuantityArray, Quantity)):
+			if not self._unit.is_compatible(other.unit):
+				raise ValueError(f"Can't add or subtract '{self.unit}' and '{other.unit}'")
+			other_values = self._unit.convert_difference_from(other.value, other.unit)
+		elif isinstance(other, (int, float, list, tuple, np.ndarray)):
+			other_values = self._base_to_none(np.asarray(other, dtype=np.float64))
+		else:
+			return NotImplemented
+		values = op(other_values, self._values) if reflected else op(self._values, other_values)
+		return self._new(values, self._unit, self._base_prefix)
+
+	def __multiplicative_operation(self, other, op, reflected: bool = False):
+		"""Method for * and /. With numbers, the result keeps the unit and the base prefix of self;
+		with a Quantity or a QuantityArray, the unit is the product or the quotient of units.
+		"""
+		if isinstance(other, (QuantityArray, Quantity)):
+			if reflected:
+				return QuantityArray._new(op(other.value, self._values), op(other.unit, self._unit), PrefixEnum.none)
+			return QuantityArray._new(op(self._values, other.value), op(self._unit, other.unit), PrefixEnum.none)
+		elif isinstance(other, (int, float, list, tuple, np.ndarray)):
+			if reflected and op is np.true_divide:
+				return QuantityArray._new(op(other, self._values), self._unit ** -1, PrefixEnum.none)
+			return self._new(op(self._values, other), self._unit, self._base_prefix)
+		return NotImplemented
+
+	def __unary_operation(self, op):
+		"""Method for unary operator"""
+		return self._new(op(self._values), self._unit, self._base_prefix)
+
+	def __compare(self, other, op) -> np.ndarray:
+		"""Method to compare self and other element-wise with a operator.
+		other can be a Quantity, a QuantityArray, a number or a sequence of numbers.
+		If other is a number or a sequence, it is defined with the base prefix.
+		"""
+		if isinstance(other, (QuantityArray, Quantity)):
+			if not self._unit.is_compatible(other.unit):
+				raise ValueError(f"Can't compare '{self.unit}' with '{other.unit}'")
+			return op(self._values, self._unit.convert_from(other.value, other.unit))
+		elif isinstance(other, (int, float, list, tuple, np.ndarray)):
+			return op(self._values, self._base_to_none(np.asarray(other, dtype=np.float64)))
+		raise ValueError(f"Can't compare '{type(self)}' with '{type(other)}'")
+
+	def _base_to_none(self, values):
+		if self._base_prefix.value == 1:
+			return values
+		return PrefixEnum._scale(values, self._base_prefix, PrefixEnum.none)
+
+	def _make_quantity(self, value: float) -> Quantity:
+		return Quantity._new(value, self._unit, self._base_prefix)
+
+	@classmethod
+	def _new(cls, values: np.ndarray, unit: Unit, base_prefix: Prefix):
+		"""Build an instance from values already defined without prefix (no copy, no check)"""
+		new = cls.__new__(cls)
+		new._values = values
+		new._unit = unit
+		new._base_prefix = base_prefix
+		return new
+
+	@classmethod
+	def from_quantities(cls, quantities: Iterable[Quantity]):
+		"""Build a QuantityArray from a sequence of Quantity.
+		The unit and the base prefix are the ones of the first quantity, the other quantities
+		are converted in this unit.
+		"""
+		quantities = list(quantities)
+		if len(quantities) == 0:
+			raise ValueError("Can't build a QuantityArray from an empty sequence without unit")
+		first = quantities[0]
+		for quantity in quantities:
+			if not isinstance(quantity, Quantity):
+				raise ValueError(f"'quantities' must contain only Quantity, not {type(quantity)}")
+			if not first.unit.is_compatible(quantity.unit):
+				raise ValueError(f"Can't build a QuantityArray with '{first.unit}' and '{quantity.unit}'")
+		unit = first.unit
+		values = np.fromiter((unit.convert_from(quantity.value, quantity.unit) for quantity in quantities), dtype=np.float64, count=len(quantities))
+		return cls._new(values, first.unit, first.base_prefix)
+
+	@classmethod
+	def from_array(cls, values: Iterable[float], unit: Union[str, Unit], prefix: Prefix = PrefixEnum.none, base_prefix: Union[str, float, Prefix] = PrefixEnum.none):
+		"""Build a QuantityArray from raw values defined with 'prefix'"""
+		return cls(values, unit, base_prefix=base_prefix, prefix=prefix)
+
+	@classmethod
+	def from_buffer(cls, buffer, unit: Union[str, Unit], prefix: Prefix = PrefixEnum.none, base_prefix: Union[str, float, Prefix] = PrefixEnum.none, dtype=np.float64, count: int = -1, offset: int = 0):
+		"""Build a QuantityArray on an object with the buffer protocol (bytes, bytearray, memoryview,
+		array('d'), mmap...) without copy.
+
+		The memory is shared only if it holds float64 values defined without prefix, else the values
+		are converted in a new array. A read-only buffer (bytes) gives read-only values, so in place
+		operations fail.
+
+		Parameters
+		----------
+		buffer: the object with the buffer protocol
+		unit: the unit of values
+		prefix: the prefix of values in the buffer
+		base_prefix: the base prefix of the quantity
+		dtype, count, offset: the type and the number of items, and the offset in bytes of the first one (see numpy.frombuffer)
+		"""
+		if not isinstance(prefix, Prefix):
+			raise ValueError(f"'prefix' argument must be a Prefix, not {type(prefix)}")
+		values = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+		if values.dtype != np.float64:
+			values = values.astype(np.float64)
+		if prefix.value != 1:
+			values = PrefixEnum._scale(values, prefix, PrefixEnum.none)
+		new = cls._new(values, None, None)
+		new.base_prefix = base_prefix
+		new.unit = unit
+		return new
+
+	def to_memoryview(self) -> memoryview:
+		"""Return a memoryview of the values without prefix, shared with self (the buffer protocol
+		of Python < 3.12)
+		"""
+		return memoryview(self._values)
+
+	@property
+	def metadata(self) -> dict:
+		"""The unit of values as str, to attach to an exported buffer (Arrow field metadata...)"""
+		return {
+			'unit': self._unit.symbol,
+			'unit_name': self._unit.name,
+			'dimension': '' if self._unit.dimension is None else ','.join(map(str, self._unit.dimension)),
+			'prefix': PrefixEnum.none.name,
+			'base_prefix': self._base_prefix.name,
+		}
+
+	def to_quantities(self) -> list:
+		"""Return the values as a list of Quantity"""
+		return list(self)
+
+	def value_to_prefix(self, prefix: Prefix) -> np.ndarray:
+		if not isinstance(prefix, Prefix):
+			raise ValueError(f"'prefix' must be a Prefix, not a {type(prefix)}")
+		return PrefixEnum._scale(self._values, PrefixEnum.none, prefix)
+
+	def set_value_from_prefix(self, new_values: Iterable[float], prefix: Prefix):
+		if not isinstance(prefix, Prefix):
+			raise ValueError(f"'prefix' must be a Prefix, not a {type(prefix)}")
+		new_values = np.array(new_values, dtype=np.float64)
+		if new_values.shape != self._values.shape:
+			raise ValueError(f"'new_values' must have the shape {self._values.shape}, not {new_values.shape}")
+		self._values = PrefixEnum._scale(new_values, prefix, PrefixEnum.none)
+
+	@classmethod
+	def get_name(cls) -> str:
+		return cls.__name__
+
+	@property
+	def unit(self) -> Unit:
+		return self._unit
+
+	@unit.setter
+	def unit(self, new_unit: Union[str, Unit]):
+		if isinstance(new_unit, str):
+			self._unit = get_unit(new_unit)
+		elif isinstance(new_unit, Unit):
+			self._unit = new_unit
+		else:
+			raise ValueError(f"'unit' must be a string which define the symbol of unit or an instance of Unit, not {type(new_unit)}")
+
+	@property
+	def base_prefix(self) -> Prefix:
+		return self._base_prefix
+
+	@base_prefix.setter
+	def base_prefix(self, prefix: Union[str, float, Prefix]):
+		if isinstance(prefix, Prefix):
+			self._base_prefix = prefix
+		elif isinstance(prefix, (str, float)):
+			self._base_prefix = PrefixEnum.get_prefix(prefix)
+		else:
+			raise ValueError(f"'prefix' must be a str, a float or a Prefix, not a {type(prefix)}")
+
+	@property
+	def value(self) -> np.ndarray:
+		"""The values without prefix, like Quantity.value. The setter takes values without prefix too."""
+		return self._values
+
+	@value.setter
+	def value(self, new_values: Iterable[float]):
+		self.set_value_from_prefix(new_values, PrefixEnum.none)
+
+	@property
+	def values(self) -> np.ndarray:
+		return self._values
+
+	@property
+	def name(self) -> str:
+		return self.get_name()
@@ -0,0 +1,161 @@
+"""Module to read columns of quantities from text/CSV files by chunks"""
+from array import array
+from typing import Dict, Generator, Iterable, List, TextIO, Tuple, Union
+import csv
+import re
+
+import numpy as np
+
+from . import PrefixEnum, Unit
+from .unit import Prefix
+from .quantity import Quantity
+from .quantityArray import QuantityArray
+from .parser import parse_unit
+from .commonQuantity import QUANTITY_CLASSES
+from . import errors
+
+
+DEFAULT_CHUNK_SIZE = 65536  # number of rows per chunk
+
+# header of a column with its unit: "distance [km]" or "distance (km)"
+_HEADER_PATTERN = re.compile(r"^\s*(.*?)\s*[\[(]\s*([^\])]+?)\s*[\])]\s*$")
+
+
+def split_header(header: str) -> Tuple[str, Union[str, None]]:
+	"""Return the name and the unit expression of a column header ("distance [km]" -> ("distance", "km")).
+	The unit is None if the header has no unit.
+	"""
+	match = _HEADER_PATTERN.match(header)
+	if match is None:
+		return header.strip(), None
+	return match.group(1), match.group(2)
+
+
+def read_quantity_columns(source: Union[str, TextIO], columns: Iterable[str] = None, units: Dict[str, str] = None, unit_column: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE, as_array: bool = True, **csv_kwargs) -> Generator[Dict[str, Union[QuantityArray, List[Quantity]]], None, None]:
+	"""Read columns of numbers from a CSV file and yield them by chunks of 'chunk_size' rows.
+
+	The unit of a column is given by 'units' ({column name: unit expression}), else by its header
+	("distance [km]" or "distance (km)"). With 'unit_column', the unit of all the value columns is read
+	on each row from this column; the values are converted in the unit (and prefix) of the first row,
+	so chunks have 'chunk_size' rows whatever the units of rows. A unit incompatible with the unit of
+	the first row is a ParseError.
+	Units and prefixes are resolved once per column (or once per distinct unit of 'unit_column').
+
+	Parameters
+	----------
+	source: the path of the file or a text file object
+	columns: the names of columns to read (default: all columns, except 'unit_column')
+	units: the unit expressions of columns, by column name
+	unit_column: the name of a column which contains the unit of values
+	chunk_size: the maximum number of rows of a chunk
+	as_array: if True, each column of a chunk is a QuantityArray, else a list of quantities
+		(of the classes of commonQuantity for their units, Quantity otherwise)
+	csv_kwargs: arguments passed to csv.reader (delimiter...)
+
+	Yield
+	-----
+	A dict {column name: QuantityArray or list of quantities} for each chunk
+	"""
+	if not isinstance(chunk_size, int) or chunk_size <= 0:
+		raise ValueError(f"'chunk_size' must be a positive int, not {chunk_size}")
+
+	if isinstance(source, str):
+		with open(source, newline='') as file:
+			yield from read_quantity_columns(file, columns, units, unit_column, chunk_size, as_array, **csv_kwargs)
+		return
+
+	rows = csv.reader(source, **csv_kwargs)
+	try:
+		header = next(rows)
+	except StopIteration:
+		return
+	names, header_units = zip(*(split_header(cell) for cell in header)) if header else ((), ())
+	units = dict(units or {})
+
+	if unit_column is not None and unit_column not in names:
+		raise ValueError(f"The unit column '{unit_column}' is not in the header {names}")
+	if columns is None:
+		columns = [name for name in names if name != unit_column]
+	columns = list(columns)
+	if not columns:
+		raise ValueError(f"No column to read in the header {names}")
+	for name in columns:
+		if name not in names:
+			raise ValueError(f"The column '{name}' is not in the header {names}")
+	indexes = [names.index(name) for name in columns]
+
+	if unit_column is None:
+		resolved = []
+		for name, index in zip(columns, indexes):
+			expression = units.get(name, header_units[index])
+			if expression is None:
+				raise ValueError(f"No unit for the column '{name}': give it in 'units' or in the header")
+			resolved.append(parse_unit(expression))
+		yield from _read_chunks(rows, columns, indexes, resolved, None, chunk_size, as_array)
+	else:
+		unit_index = names.index(unit_column)
+		resolved = []  # the (prefix, unit) of the first row, for all the columns
+		transforms = {}  # unit expression -> (factor, offset) to the unit and prefix of the first row
+
+		def transform(row):
+			if unit_index >= len(row):
+				raise IndexError(f"No value in the unit column '{unit_column}'")
+			expression = row[unit_index]
+			result = transforms.get(expression)
+			if result is None:
+				prefix, unit = parse_unit(expression)
+				if not resolved:
+					resolved.extend([(prefix, unit)] * len(columns))
+				target_prefix, target_unit = resolved[0]
+				if not unit.is_compatible(target_unit):
+					raise errors.ParseError(f"Can't convert '{expression}' in the unit of the first row '{target_unit.symbol_with_prefix(target_prefix)}'")
+				scale, offset = unit.conversion_to(target_unit)
+				to_target = PrefixEnum.get_conversion_factor(PrefixEnum.none, target_prefix)
+				result = transforms[expression] = (PrefixEnum.get_conversion_factor(prefix, target_prefix) * scale, offset * to_target)
+			return result
+
+		yield from _read_chunks(rows, columns, indexes, resolved, transform, chunk_size, as_array)
+
+
+def _read_chunks(rows, columns: List[str], indexes: List[int], resolved: List[Tuple[Prefix, Unit]], transform, chunk_size: int, as_array: bool):
+	"""Read 'rows' by chunks of 'chunk_size' rows, in the (prefix, unit) 'resolved' of each column.
+	With 'transform', 'transform(row)' returns the (factor, offset) which converts the values of a row
+	in 'resolved', the transform of a unit being computed once.
+	"""
+	buffers = [array('d') for _ in columns]
+	for line, row in enumerate(rows, start=2):
+		if not row:
+			continue
+		try:
+			factor, offset = (1., 0.) if transform is None else transform(row)
+		except (IndexError, errors.ParseError) as e:  # a row shorter than the unit column or an unknown unit
+			raise errors.ParseError(f"Line {line}: {e}") from None
+		try:
+			if factor == 1 and offset == 0:
+				for buffer, index in zip(buffers, indexes):
+					buffer.append(float(row[index]))
+			else:
+				for buffer, index in zip(buffers, indexes):
+					buffer.append(float(row[index]) * factor + offset)
+		except (ValueError, IndexError) as e:
+			raise errors.ParseError(f"Line {line}: {e}") from None
+		if len(buffers[0]) == chunk_size:
+			yield _make_chunk(columns, buffers, resolved, as_array)
+			buffers = [array('d') for _ in columns]
+	if len(buffers[0]) > 0:
+		yield _make_chunk(columns, buffers, resolved, as_array)
+
+
+def _make_chunk(columns: List[str], buffers: List[array], resolved: List[Tuple[Prefix, Unit]], as_array: bool) -> Dict[str, Union[QuantityArray, List[Quantity]]]:
+	chunk = {}
+	for name, buffer, (prefix, unit) in zip(columns, buffers, resolved):
+		# the array shares the memory of the buffer, which is not used after
+		values = np.frombuffer(buffer, dtype=np.float64)
+		if prefix.value != 1:
+			values = PrefixEnum._scale(values, prefix, PrefixEnum.none)
+		if as_array:
+			chunk[name] = QuantityArray._new(values, unit, prefix)
+		else:
+			cls, base_prefix = QUANTITY_CLASSES.get(unit, (Quantity, prefix))
+			chunk[name] = [cls._new(value, unit, base_prefix) for value in values.tolist()]
+	return chunk
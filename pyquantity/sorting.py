@@ -0,0 +1,50 @@
+"""Module to sort quantities: the values are normalized in one pass, then sorted as plain floats"""
+from typing import List, Sequence, Union
+
+from .quantity import Quantity
+from .quantityArray import QuantityArray
+
+
+def normalized_values(quantities: Sequence[Quantity]) -> List[float]:
+	"""Return the values of quantities in the canonical unit of their dimension (see Unit.normalization).
+	The normalization of each distinct unit is looked up once. Raise a ValueError if the units are not compatible.
+	"""
+	normalizations = {}
+	values = []
+	append = values.append
+	group = first = None
+	try:
+		for quantity in quantities:
+			unit = quantity._unit
+			normalization = normalizations.get(unit)
+			if normalization is None:
+				normalization = normalizations[unit] = unit.normalization()
+				if group is None:
+					group, first = normalization[2], unit
+				elif normalization[2] != group:
+					raise ValueError(f"Can't sort '{first}' with '{unit}'")
+			append(quantity._value * normalization[0] + normalization[1])
+	except AttributeError:
+		raise ValueError(f"'quantities' must contain only Quantity, not {type(quantity)}") from None
+	return values
+
+
+def argsort(quantities, reverse: bool = False) -> list:
+	"""Return the indexes which sort quantities (an iterable of Quantity or a QuantityArray), stable"""
+	if isinstance(quantities, QuantityArray):
+		import numpy as np
+		indexes = np.argsort(-quantities.values if reverse else quantities.values, kind='stable')
+		return indexes.tolist()
+	values = normalized_values(quantities)
+	return sorted(range(len(values)), key=values.__getitem__, reverse=reverse)
+
+
+def sorted_quantities(quantities, reverse: bool = False) -> Union[list, 'QuantityArray']:
+	"""Return the quantities sorted by value, stable: a list for an iterable of Quantity, a new
+	QuantityArray for a QuantityArray
+	"""
+	if isinstance(quantities, QuantityArray):
+		return quantities[argsort(quantities, reverse)]
+	if not isinstance(quantities, Sequence):
+		quantities = list(quantities)
+	return [quantities[index] for index in argsort(quantities, reverse)]
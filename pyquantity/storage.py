@@ -0,0 +1,214 @@
+"""Binary file format for a column of quantities, read with mmap.
+
+A column file is a fixed header, a JSON header and the raw payload:
+
+	magic b'PQCOLUMN' | version (uint16) | length of the JSON header (uint32)  -- little-endian
+	JSON header: unit (name, symbol, description, dimension, scale, offset), prefix of the payload,
+	             base prefix (names in PrefixEnum, 'none' without prefix), dtype ('float64' or 'int64') and number of values
+	padding up to a multiple of PAYLOAD_ALIGNMENT bytes
+	payload: the values, little-endian
+
+'write_column' writes a QuantityArray or a sequence of quantities; 'open_column' maps the file and
+returns a QuantityColumn, which reads nothing but the header: the pages of the payload are read by
+the system when a slice is used.
+"""
+from typing import Iterable, Union
+import json
+import struct
+
+import numpy as np
+
+from . import PrefixEnum, Unit
+from .unit import Prefix, intern_unit
+from .quantity import Quantity
+from .quantityArray import QuantityArray
+from . import errors
+
+
+MAGIC = b'PQCOLUMN'
+VERSION = 1
+PAYLOAD_ALIGNMENT = 64  # the payload starts at a multiple of this offset
+DTYPES = {'float64': np.dtype('<f8'), 'int64': np.dtype('<i8')}
+
+_FIXED_HEADER = struct.Struct('<8sHI')
+
+
+def _prefix_name(prefix: Prefix) -> str:
+	"""Return the name of 'prefix' in PrefixEnum, which PrefixEnum.get_prefix resolves ('none' for
+	PrefixEnum.none, whose Prefix name is empty)
+	"""
+	if PrefixEnum._prefix_by_name.get(prefix.name) == prefix:
+		return prefix.name
+	for name, known in PrefixEnum._prefix_by_name.items():
+		if known == prefix:
+			return name
+	raise ValueError(f"The prefix {prefix} is not a prefix of PrefixEnum")
+
+
+def write_column(path: str, quantities: Union[QuantityArray, Iterable[Quantity]], dtype: str = 'float64', prefix: Prefix = PrefixEnum.none) -> int:
+	"""Write a column file and return the number of values.
+
+	Parameters
+	----------
+	path: the path of the file
+	quantities: a QuantityArray or a sequence of Quantity (converted in the unit of the first one)
+	dtype: the type of the payload, 'float64' or 'int64' (values are rounded)
+	prefix: the prefix of values in the payload, for example PrefixEnum.nano for times as int64 nanoseconds
+	"""
+	if dtype not in DTYPES:
+		raise ValueError(f"'dtype' must be one of {tuple(DTYPES)}, not {dtype}")
+	if not isinstance(prefix, Prefix):
+		raise ValueError(f"'prefix' must be a Prefix, not a {type(prefix)}")
+	if not isinstance(quantities, QuantityArray):
+		quantities = QuantityArray.from_quantities(quantities)
+
+	values = quantities.values if prefix.value == 1 else quantities.value_to_prefix(prefix)
+	if dtype == 'int64':
+		values = np.rint(values)
+	payload = np.ascontiguousarray(values, dtype=DTYPES[dtype])
+
+	unit = quantities.unit
+	header = json.dumps({
+		'unit': {
+			'name': unit.name, 'symbol': unit.symbol, 'description': unit.description,
+			'dimension': None if unit.dimension is None else list(unit.dimension),
+			'scale': unit.scale, 'offset': unit.offset,
+		},
+		'prefix': _prefix_name(prefix),
+		'base_prefix': _prefix_name(quantities.base_prefix),
+		'dtype': dtype,
+		'count': len(payload),
+	}).encode('utf-8')
+	start = _FIXED_HEADER.size + len(header)
+	padding = -start % PAYLOAD_ALIGNMENT
+
+	with open(path, 'wb') as file:
+		file.write(_FIXED_HEADER.pack(MAGIC, VERSION, len(header) + padding))
+		file.write(header)
+		file.write(b' ' * padding)
+		file.write(memoryview(payload).cast('B'))
+	return len(payload)
+
+
+def read_header(path: str) -> dict:
+	"""Return the JSON header of a column file, with the offset of its payload ('payload_offset')"""
+	with open(path, 'rb') as file:
+		fixed = file.read(_FIXED_HEADER.size)
+		if len(fixed) < _FIXED_HEADER.size:
+			raise errors.ParseError(f"'{path}' is not a column file")
+		magic, version, length = _FIXED_HEADER.unpack(fixed)
+		if magic != MAGIC:
+			raise errors.ParseError(f"'{path}' is not a column file")
+		if version > VERSION:
+			raise errors.ParseError(f"The version {version} of the column file '{path}' is not supported")
+		try:
+			header = json.loads(file.read(length).decode('utf-8'))
+		except ValueError as e:
+			raise errors.ParseError(f"Invalid header in '{path}': {e}") from None
+		if not isinstance(header, dict):
+			raise errors.ParseError(f"Invalid header in '{path}': not an object")
+	header['payload_offset'] = _FIXED_HEADER.size + length
+	return header
+
+
+def _find_unit(metadata: dict) -> Unit:
+	"""Return the interned unit described by 'metadata' (the unit of BASE_UNITS or DERIVED_UNIT, or a new one)"""
+	return intern_unit(metadata['name'], metadata['symbol'], description=metadata['description'], dimension=metadata['dimension'], scale=metadata['scale'], offset=metadata['offset'])
+
+
+class QuantityColumn:
+	"""A column file mapped in memory.
+
+	An integer index gives a Quantity, a slice gives a QuantityArray. With a float64 payload without
+	prefix, the QuantityArray shares the mapped memory (only the pages used are read); otherwise the
+	values of the slice are converted in a new array.
+	"""
+	__slots__ = ('_raw', '_unit', '_prefix', '_base_prefix', '_path')
+
+	def __init__(self, path: str, mode: str = 'r'):
+		"""Map the column file 'path'
+
+		Parameters
+		----------
+		path: the path of the file
+		mode: the mode of numpy.memmap: 'r' (read-only), 'r+' (in place changes are written in the file)
+			or 'c' (copy on write)
+		"""
+		if mode not in ('r', 'r+', 'c'):
+			raise ValueError(f"'mode' must be 'r', 'r+' or 'c', not {mode}")
+		header = read_header(path)
+		try:
+			if header['dtype'] not in DTYPES:
+				raise errors.ParseError(f"Unknown dtype '{header['dtype']}' in '{path}'")
+			self._unit = _find_unit(header['unit'])
+			self._prefix = PrefixEnum.get_prefix(header['prefix'])
+			self._base_prefix = PrefixEnum.get_prefix(header['base_prefix'])
+			dtype, count = DTYPES[header['dtype']], header['count']
+			if not isinstance(count, int) or count < 0:
+				raise errors.ParseError(f"Invalid number of values {count} in '{path}'")
+		except errors.ParseError:
+			raise
+		except (errors.PrefixError, ValueError, TypeError) as e:
+			# ValueError: a unit interned with another scale, TypeError: a field of the wrong type
+			raise errors.ParseError(f"Invalid header in '{path}': {e}") from None
+		except KeyError as e:
+			raise errors.ParseError(f"Invalid header in '{path}': missing field {e}") from None
+		self._path = path
+		if count == 0:
+			self._raw = np.empty(0, dtype=dtype)
+		else:
+			self._raw = np.memmap(path, dtype=dtype, mode=mode, offset=header['payload_offset'], shape=(count,))
+
+	def __repr__(self) -> str:
+		"""repr(self)"""
+		return f"<QuantityColumn: {len(self)} values in {self._unit.symbol_with_prefix(self._prefix)} ({self._raw.dtype.name}) from '{self._path}'>"
+
+	def __len__(self) -> int:
+		"""len(self)"""
+		return self._raw.shape[0]
+
+	def __getitem__(self, index):
+		"""self[index]
+		Return a Quantity for an integer index, a QuantityArray otherwise.
+		"""
+		if isinstance(index, (int, np.integer)):
+			return Quantity._new(float(self._convert(self._raw[index])), self._unit, self._base_prefix)
+		return QuantityArray._new(self._convert(self._raw[index]), self._unit, self._base_prefix)
+
+	def _convert(self, raw):
+		"""Convert raw values of the payload in float64 values without prefix"""
+		if raw.dtype != np.float64:
+			raw = raw.astype(np.float64)
+		if self._prefix.value != 1:
+			raw = PrefixEnum._scale(raw, self._prefix, PrefixEnum.none)
+		return raw
+
+	def to_array(self) -> QuantityArray:
+		"""Return all the values as a QuantityArray"""
+		return self[:]
+
+	@property
+	def raw(self) -> np.ndarray:
+		"""The payload as it's stored, a numpy.memmap"""
+		return self._raw
+
+	@property
+	def unit(self) -> Unit:
+		return self._unit
+
+	@property
+	def prefix(self) -> Prefix:
+		return self._prefix
+
+	@property
+	def base_prefix(self) -> Prefix:
+		return self._base_prefix
+
+	@property
+	def path(self) -> str:
+		return self._path
+
+
+def open_column(path: str, mode: str = 'r') -> QuantityColumn:
+	"""Map a column file written by 'write_column' and return a QuantityColumn (see QuantityColumn.__init__)"""
+	return QuantityColumn(path, mode)
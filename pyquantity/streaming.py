@@ -0,0 +1,231 @@
+"""Asynchronous conversion of streams of raw readings, by micro-batches.
+
+A StreamConverter receives raw values with their unit and prefix ('put', awaited when its bounded
+queue is full, so fast producers wait for the conversion) and yields QuantityArray batches in the
+unit of its target. The transform (scale, offset) of each (unit, prefix) is looked up once, when
+the first reading of this unit is put; a batch is converted in one vectorized step, in a thread
+of an executor when it's large, so the event loop does not stall on conversion work.
+
+	converter = StreamConverter(AbsoluteTemperature)
+	await converter.put(21.5, '°C')                # in each connection
+	async for batch in converter:                  # QuantityArray in K
+		...
+
+	async for batch in convert_stream(readings, Lenght):  # readings: an async iterable
+		...
+"""
+from typing import AsyncIterable, AsyncIterator, Dict, List, Tuple, Union
+import asyncio
+from concurrent.futures import Executor
+
+import numpy as np
+
+from . import PrefixEnum, Unit
+from .unit import Prefix
+from .quantity import Quantity
+from .quantityArray import QuantityArray
+
+
+DEFAULT_BATCH_SIZE = 4096  # maximal number of readings per batch
+DEFAULT_MAX_DELAY = 0.005  # maximal time (s) between the first reading of a batch and the batch
+DEFAULT_MAX_PENDING = 65536  # size of the queue of readings
+OFFLOAD_THRESHOLD = 2048  # batches with at least this number of readings are converted in the executor (at most batch_size)
+
+_END = None  # put in the queue by 'close'
+
+
+class StreamConverter:
+	"""Asynchronous iterator of QuantityArray batches converted from raw readings.
+
+	The converter must be created and used in the same event loop.
+	"""
+
+	def __init__(self, target: Union[type, Unit], base_prefix: Prefix = None, batch_size: int = DEFAULT_BATCH_SIZE, max_delay: float = DEFAULT_MAX_DELAY, max_pending: int = DEFAULT_MAX_PENDING, executor: Executor = None, offload_threshold: int = None):
+		"""
+		Parameters
+		----------
+		target: a subclass of Quantity with a default unit (Time, Lenght, Mass, AbsoluteTemperature...) or a Unit
+		base_prefix: the base prefix of batches (default: the one of the target class, or none)
+		batch_size: the maximal number of readings per batch
+		max_delay: the maximal time in seconds to wait for more readings once a batch is started
+		max_pending: the number of readings which can wait in the queue before 'put' is blocked
+		executor: the executor of large batches (default: the default executor of the event loop)
+		offload_threshold: the number of readings from which a batch is converted in the executor, at most
+			batch_size (default: OFFLOAD_THRESHOLD, or batch_size if it's smaller)
+		"""
+		if isinstance(target, Unit):
+			cls, unit, default_prefix = Quantity, target, PrefixEnum.none
+		elif isinstance(target, type) and issubclass(target, Quantity) and target is not Quantity:
+			probe = target(0.)
+			cls, unit, default_prefix = target, probe.unit, probe.base_prefix
+		else:
+			raise ValueError(f"'target' must be a Unit or a subclass of Quantity, not {target}")
+		if not isinstance(batch_size, int) or batch_size <= 0:
+			raise ValueError(f"'batch_size' must be a positive int, not {batch_size}")
+		if max_delay < 0:
+			raise ValueError(f"'max_delay' must be positive, not {max_delay}")
+		if offload_threshold is None:
+			offload_threshold = min(OFFLOAD_THRESHOLD, batch_size)
+		elif not isinstance(offload_threshold, int) or not 0 < offload_threshold <= batch_size:
+			raise ValueError(f"'offload_threshold' must be a positive int, at most 'batch_size' ({batch_size}), not {offload_threshold}")
+		self._cls = cls
+		self._unit = unit
+		self._base_prefix = default_prefix if base_prefix is None else base_prefix
+		self._batch_size = batch_size
+		self._max_delay = max_delay
+		self._executor = executor
+		self._offload_threshold = offload_threshold
+		self._queue = asyncio.Queue(maxsize=max_pending)
+		self._closed = False
+		self._finished = False
+		# the transforms of the units of readings: (unit, prefix) -> index in _scales and _offsets
+		self._codes: Dict[tuple, int] = {}
+		self._scales: List[float] = []
+		self._offsets: List[float] = []
+
+	def __repr__(self) -> str:
+		"""repr(self)"""
+		return f"<StreamConverter: to {self._unit.symbol}, {self._queue.qsize()} pending readings>"
+
+	async def put(self, value: float, unit: Union[str, Unit] = None, prefix: Prefix = None):
+		"""Add a reading, waiting if the queue is full.
+
+		Parameters
+		----------
+		value: the raw value (a number or a str of a number)
+		unit: the unit of the value: a Unit, a unit expression like 'km' or '°C' (see parse_unit),
+			or None for the unit of the target
+		prefix: the prefix of the value (default: the prefix of the unit expression, none for a Unit
+			and the base prefix of the converter without unit)
+		"""
+		await self._queue.put(self._reading(value, unit, prefix))
+
+	def put_nowait(self, value: float, unit: Union[str, Unit] = None, prefix: Prefix = None):
+		"""Add a reading, raise asyncio.QueueFull if the queue is full"""
+		self._queue.put_nowait(self._reading(value, unit, prefix))
+
+	def close(self):
+		"""Mark the end of the stream: the iteration stops after the readings already put"""
+		if not self._closed:
+			self._closed = True
+			try:
+				self._queue.put_nowait(_END)
+			except asyncio.QueueFull:
+				pass  # the consumer is not waiting, it checks '_closed' when the queue is empty
+
+	def _reading(self, value: float, unit: Union[str, Unit, None], prefix: Union[Prefix, None]) -> Tuple[float, int]:
+		if self._closed:
+			raise ValueError("Can't put a reading in a closed StreamConverter")
+		code = self._codes.get((unit, prefix))
+		if code is None:
+			code = self._register(unit, prefix)
+		return float(value), code
+
+	def _register(self, unit: Union[str, Unit, None], prefix: Union[Prefix, None]) -> int:
+		"""Compute the transform of readings in (unit, prefix) to the unit of the target"""
+		key = (unit, prefix)
+		if unit is None:
+			unit = self._unit
+			prefix = self._base_prefix if prefix is None else prefix
+		elif isinstance(unit, str):
+			from .parser import parse_unit
+			parsed_prefix, unit = parse_unit(unit)
+			prefix = parsed_prefix if prefix is None else prefix
+		elif not isinstance(unit, Unit):
+			raise ValueError(f"'unit' must be a str or a Unit, not a {type(unit)}")
+		if prefix is None:
+			prefix = PrefixEnum.none
+		elif not isinstance(prefix, Prefix):
+			raise ValueError(f"'prefix' must be a Prefix, not a {type(prefix)}")
+		if not self._unit.is_compatible(unit):
+			raise ValueError(f"Can't convert '{unit}' in '{self._unit}'")
+		scale, offset = unit.conversion_to(self._unit)
+		code = self._codes[key] = len(self._scales)
+		self._scales.append(scale * prefix.value)
+		self._offsets.append(offset)
+		return code
+
+	def __aiter__(self) -> 'StreamConverter':
+		return self
+
+	async def __anext__(self) -> QuantityArray:
+		readings = await self._next_readings()
+		if not readings:
+			raise StopAsyncIteration
+		if len(readings) >= self._offload_threshold:
+			values = await asyncio.get_running_loop().run_in_executor(self._executor, self._convert, readings)
+		else:
+			values = self._convert(readings)
+		return QuantityArray._new(values, self._unit, self._base_prefix)
+
+	async def quantities(self) -> AsyncIterator[Quantity]:
+		"""Iterate over the converted readings one by one, as instances of the target class"""
+		cls, unit, base_prefix = self._cls, self._unit, self._base_prefix
+		async for batch in self:
+			for value in batch.values.tolist():
+				yield cls._new(value, unit, base_prefix)
+
+	async def _next_readings(self) -> List[Tuple[float, int]]:
+		"""Wait for a reading, then take the next ones until the batch is full, the stream is closed
+		or 'max_delay' has elapsed. Return an empty list at the end of the stream.
+		"""
+		if self._finished or (self._closed and self._queue.empty()):
+			self._finished = True
+			return []
+		readings = []
+		reading = await self._queue.get()
+		loop = asyncio.get_running_loop()
+		deadline = loop.time() + self._max_delay
+		while True:
+			if reading is _END:
+				self._finished = True
+				return readings
+			readings.append(reading)
+			if len(readings) >= self._batch_size:
+				return readings
+			if self._queue.empty():
+				remaining = deadline - loop.time()
+				if remaining <= 0 or self._closed:
+					return readings
+				await asyncio.sleep(remaining)
+				if self._queue.empty():
+					return readings
+			reading = self._queue.get_nowait()
+
+	def _convert(self, readings: List[Tuple[float, int]]) -> np.ndarray:
+		"""Convert a batch of readings in one vectorized step"""
+		readings = np.array(readings, dtype=np.float64)
+		values = readings[:, 0]
+		codes = readings[:, 1].astype(np.intp)
+		if len(self._scales) == 1:
+			return values * self._scales[0] + self._offsets[0]
+		return values * np.array(self._scales)[codes] + np.array(self._offsets)[codes]
+
+
+async def convert_stream(readings: AsyncIterable, target: Union[type, Unit], **options) -> AsyncIterator[QuantityArray]:
+	"""Convert an asynchronous iterable of readings and yield QuantityArray batches.
+
+	A reading is a value or a tuple (value, unit) or (value, unit, prefix) (see StreamConverter.put).
+	The readings are read by a task which waits when the queue of the converter is full. The options
+	are the ones of StreamConverter.
+	"""
+	converter = StreamConverter(target, **options)
+
+	async def feed():
+		try:
+			async for reading in readings:
+				if isinstance(reading, tuple):
+					await converter.put(*reading)
+				else:
+					await converter.put(reading)
+		finally:
+			converter.close()
+
+	task = asyncio.ensure_future(feed())
+	try:
+		async for batch in converter:
+			yield batch
+		await task  # raise the exception of the readings, if any
+	finally:
+		if not task.done():
+			task.cancel()
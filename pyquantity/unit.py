@@ -1,10 +1,27 @@
 from collections import namedtuple
-from typing import Union, List, Tuple, Generator
+import math
+from functools import lru_cache
+from typing import Union, List, Tuple, Generator, Dict
+import threading
 
 from . import errors
+from . import conversion
 
 
-Prefix = namedtuple('Prefix', ('name', 'symbol', 'value'))
+class Prefix(namedtuple('Prefix', ('name', 'symbol', 'value'))):
+	__slots__ = ()
+
+	def __reduce__(self):
+		"""Pickle a prefix of PrefixEnum by its name"""
+		if _STANDARD_PREFIXES.get(self.name) == self:
+			return _standard_prefix, (self.name,)
+		return Prefix, tuple(self)
+
+
+def _standard_prefix(name: str) -> Prefix:
+	return _STANDARD_PREFIXES[name]
+
+CONVERSION_CACHE_SIZE = 256  # number of (from, to) prefix pairs kept by PrefixEnum.get_conversion_factor
 
 
 class PrefixEnum:
@@ -30,6 +47,12 @@ class PrefixEnum:
 	zepto = Prefix('zepto', 'z', 1e-21)
 	yocto = Prefix('yocto', 'y', 1e-24)
 
+	# indexes of prefixes, built by '_build_index' and kept up to date by 'add_prefix' and 'remove_prefix'
+	_version: int = 0  # incremented when prefixes change, so that caches built on prefixes can be invalidated
+	_prefix_by_name: Dict[str, Prefix] = {}
+	_prefix_by_symbol: Dict[str, Prefix] = {}
+	_prefix_by_value: Dict[float, Prefix] = {}
+
 	@classmethod
 	def add_prefix(cls, name: str, symbol: str, value: float):
 		if not isinstance(name, str):
@@ -38,52 +61,80 @@ class PrefixEnum:
 			raise ValueError(f"'symbol' must be a str not a '{type(symbol)}'")
 		if not isinstance(value, float):
 			raise ValueError(f"'value' must be a float not a '{type(value)}'")
-		setattr(cls, name, Prefix(name, symbol, value))
+		prefix = Prefix(name, symbol, value)
+		replace = name in cls._prefix_by_name
+		setattr(cls, name, prefix)
+		if replace:
+			cls._build_index()
+		else:
+			cls._index_prefix(name, prefix)
+		cls._version += 1
+		cls.clear_conversion_cache()
 
 	@classmethod
 	def remove_prefix(cls, name: str):
 		if not isinstance(name, str):
 			raise ValueError(f"'name' must be a str not a '{type(name)}'")
-		if name in dir(cls):
-			return delattr(cls, name)
+		if name in cls._prefix_by_name:
+			delattr(cls, name)
+			cls._build_index()
+			cls._version += 1
+			return cls.clear_conversion_cache()
 		raise errors.PrefixError(f"The prefix '{name}' does not exist")
 
+	@classmethod
+	def _build_index(cls):
+		"""Build the indexes name -> Prefix, symbol -> Prefix and value -> Prefix.
+		If several prefixes share a symbol or a value, the first defined is kept.
+		"""
+		cls._prefix_by_name = {}
+		cls._prefix_by_symbol = {}
+		cls._prefix_by_value = {}
+		for name, attr_ in vars(cls).items():
+			if isinstance(attr_, Prefix):
+				cls._index_prefix(name, attr_)
+
+	@classmethod
+	def _index_prefix(cls, name: str, prefix: Prefix):
+		cls._prefix_by_name[name] = prefix
+		cls._prefix_by_symbol.setdefault(prefix.symbol, prefix)
+		cls._prefix_by_value.setdefault(prefix.value, prefix)
+
 	@classmethod
 	def _get_all_prefix(cls) -> List[Prefix]:
-		return [attr_ for attr_ in dir(cls) if isinstance(attr_, Prefix)]
+		return list(cls._prefix_by_name.values())
 
 	@classmethod
 	def _get_all_symbols(cls) -> Generator:
-		return (attr_.symbol for attr_ in dir(cls) if isinstance(attr_, Prefix))
+		return (symbol for symbol in cls._prefix_by_symbol)
 
 	@classmethod
 	def _get_prefix_with_value(cls, value: float) -> Prefix:
-		for prefix in cls._get_all_prefix():
-			if prefix.value == value:
-				return prefix
-		raise PrefixError(f"The prefix with value '{value}' does not exist")
+		try:
+			return cls._prefix_by_value[value]
+		except KeyError:
+			raise errors.PrefixError(f"The prefix with value '{value}' does not exist") from None
 
 	@classmethod
 	def _get_prefix_with_symbol(cls, symbol: str) -> Prefix:
-		for prefix in cls._get_all_prefix():
-			if prefix.symbol == symbol:
-				return prefix
-			raise PrefixError(f"The prefix symbol '{symbol}' does not exist")
+		try:
+			return cls._prefix_by_symbol[symbol]
+		except KeyError:
+			raise errors.PrefixError(f"The prefix symbol '{symbol}' does not exist") from None
 
 	@classmethod
 	def get_prefix(cls, arg: Union[str, float]) -> Prefix:
-		if isinstance(arg, str) and arg in dir(PrefixEnum):
-			return getattr(cls, arg)
-
-		elif isinstance(arg, str) and arg in cls._get_all_symbols():
-			return _get_prefix_with_symbol(arg)
+		if isinstance(arg, str):
+			prefix = cls._prefix_by_name.get(arg)
+			if prefix is None:
+				prefix = cls._prefix_by_symbol.get(arg)
+			if prefix is None:
+				raise errors.PrefixError(f"The prefix name or symbol '{arg}' does not exist")
+			return prefix
 
 		elif isinstance(arg, float):
 			return cls._get_prefix_with_value(arg)
 
-		elif isinstance(arg, str):
-			raise errors.PrefixError(f"The prefix name or symbol '{arg}' does not exist")
-
 		raise ValueError(f"'arg' must be a str or a float, not a {type(arg)}")
 
 	@classmethod
@@ -92,32 +143,126 @@ class PrefixEnum:
 			value = float(value)
 		except Exception:
 			raise ValueError(f"'value' must be a float, not a {type(value)}")
+		return cls._scale(value, from_, to_)
+
+	@classmethod
+	def get_conversion_factor(cls, from_: Union[str, float, Prefix], to_: Union[str, float, Prefix]) -> float:
+		"""Return the factor to multiply a value defined with 'from_' by to get it with 'to_'.
+		Factors are kept in a bounded LRU cache, cleared when a prefix is added or removed.
+		If 'from_' is None, the value is considered without prefix.
+		"""
+		return cls._get_conversion(from_, to_)[0]
+
+	@classmethod
+	def _scale(cls, values, from_: Union[str, float, Prefix], to_: Union[str, float, Prefix]):
+		"""Convert 'values' (a float or an array) from the prefix 'from_' to the prefix 'to_'"""
+		factor, divisor = cls._get_conversion(from_, to_)
+		if divisor is None:
+			return values * factor
+		return values / divisor
+
+	@classmethod
+	def _get_conversion(cls, from_: Union[str, float, Prefix], to_: Union[str, float, Prefix]) -> Tuple[float, float]:
+		try:
+			return _conversion(from_, to_)
+		except TypeError:
+			raise ValueError(f"'from_' and 'to_' must be a str, float or a Prefix, not a {type(from_)} and a {type(to_)}")
+
+	@classmethod
+	def conversion_cache_info(cls):
+		"""Return the statistics (hits, misses, maxsize, currsize) of the conversion factor cache"""
+		return _conversion.cache_info()
+
+	@classmethod
+	def clear_conversion_cache(cls):
+		_conversion.cache_clear()
+
+	@classmethod
+	def _resolve_prefix(cls, prefix: Union[str, float, Prefix], arg_name: str) -> Prefix:
+		if isinstance(prefix, Prefix):
+			return prefix
+		elif isinstance(prefix, (str, float)):
+			return cls.get_prefix(prefix)
+		raise ValueError(f"'{arg_name}' must be a str, float or a Prefix, not a {type(prefix)}")
+
+
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+def _conversion(from_: Union[str, float, Prefix], to_: Union[str, float, Prefix]) -> Tuple[float, float]:
+	"""Return (factor, divisor) to convert a value from 'from_' to 'to_'.
+	When the factor is a negative power of ten, 'divisor' is its exact inverse: dividing by it
+	is correctly rounded where multiplying by the factor is not. Otherwise 'divisor' is None.
+	"""
+	from_ = PrefixEnum.none if from_ is None else PrefixEnum._resolve_prefix(from_, 'from_')
+	to_ = PrefixEnum._resolve_prefix(to_, 'to_')
+	from_exponent, to_exponent = _decimal_exponent(from_.value), _decimal_exponent(to_.value)
+	if from_exponent is None or to_exponent is None:
+		return from_.value / to_.value, None
+	exponent = from_exponent - to_exponent
+	if exponent >= 0:
+		return float(10 ** exponent), None
+	return 10. ** exponent, float(10 ** -exponent)
+
+
+def _decimal_exponent(value: float) -> Union[int, None]:
+	"""Return n if 'value' is the float nearest to 10**n, else None"""
+	if value <= 0:
+		return None
+	exponent = round(math.log10(value))
+	return exponent if float(10 ** exponent) == value or 10. ** exponent == value else None
 
-		if isinstance(to_, (str, float)):
-			to_ = cls.get_prefix(to_)
-		elif not isinstance(to_, Prefix):
-			raise ValueError(f"'to_' must be a str, float or a Prefix, not a {type(to_)}")
 
-		if isinstance(from_, (str, float)):
-			from_ = cls.get_prefix(from_)
-		elif from_ is None:
-			from_ = cls.none
-		elif not isinstance(from_, Prefix):
-			raise ValueError(f"'from_' must be a str, float or a Prefix, not a {type(from_)}")
+PrefixEnum._build_index()
+_STANDARD_PREFIXES: Dict[str, Prefix] = {prefix.name: prefix for prefix in PrefixEnum._get_all_prefix()}
 
-		return value / (to_.value / from_.value)
+
+# SI base dimensions of BASE_UNITS: the exponents of a unit's dimension follow this order
+DIMENSIONS = ('length', 'mass', 'time', 'temperature', 'amount', 'current', 'luminous_intensity', 'angle', 'solid_angle')
+
+Dimension = Tuple[int, ...]
+
+DIMENSIONLESS: Dimension = (0,) * len(DIMENSIONS)
+
+
+def make_dimension(**exponents: int) -> Dimension:
+	"""Return the dimension with the given exponents, for example make_dimension(length=1, time=-1)"""
+	for name in exponents:
+		if name not in DIMENSIONS:
+			raise ValueError(f"'{name}' is not a dimension, dimensions are {DIMENSIONS}")
+	return tuple(exponents.get(name, 0) for name in DIMENSIONS)
+
+
+def multiply_dimensions(first: Dimension, second: Dimension) -> Dimension:
+	return tuple(a + b for a, b in zip(first, second))
+
+
+def divide_dimensions(first: Dimension, second: Dimension) -> Dimension:
+	return tuple(a - b for a, b in zip(first, second))
+
+
+def power_dimension(dimension: Dimension, exponent: int) -> Dimension:
+	return tuple(a * exponent for a in dimension)
 
 
 class Unit:
-	_name: str = ""
-	_symbol: str = ""
-	_description: str = ""
+	"""A unit with its dimension.
+
+	'dimension' is the tuple of exponents over DIMENSIONS (None if unknown, then units are compatible
+	only with units of the same symbol). A value 'v' in this unit is 'v * scale + offset' in the coherent
+	unit of its dimension (the units of BASE_UNITS, for example the gram for the mass).
+	"""
+	__slots__ = ('_name', '_symbol', '_description', '_dimension', '_scale', '_offset', '_frozen')
 	_base_unit: bool = False
 
-	def __init__(self, name: str, symbol: str, description: str = ""):
+	def __init__(self, name: str, symbol: str, description: str = "", dimension: Dimension = None, scale: float = 1., offset: float = 0.):
+		self._frozen = False
 		self.name = name
 		self.symbol = symbol
 		self.description = description
+		if dimension is not None and (len(dimension) != len(DIMENSIONS) or not all(isinstance(a, int) for a in dimension)):
+			raise ValueError(f"'dimension' must be a tuple of {len(DIMENSIONS)} int, not {dimension}")
+		self._dimension = None if dimension is None else tuple(dimension)
+		self._scale = float(scale)
+		self._offset = float(offset)
 
 	def __repr__(self) -> str:
 		return f"<Units {self.name} ({self.symbol}). {self.description}>"
@@ -125,6 +270,79 @@ class Unit:
 	def __str__(self) -> str:
 		return f"{self.name} ({self.symbol})"
 
+	def __mul__(self, other: 'Unit') -> 'DerivedUnit':
+		"""self * other"""
+		return self._combine('*', other)
+
+	def __truediv__(self, other: 'Unit') -> 'DerivedUnit':
+		"""self / other"""
+		return self._combine('/', other)
+
+	def __pow__(self, exponent: int) -> 'DerivedUnit':
+		"""self ** exponent"""
+		if not isinstance(exponent, int):
+			raise ValueError(f"'exponent' must be a int, not a {type(exponent)}")
+		return self._combine('^', exponent)
+
+	def _combine(self, operator: str, other: Union['Unit', int]) -> 'DerivedUnit':
+		"""Return self * other, self / other or self ^ other. If the operands are interned, the result
+		is interned and kept, so the same operation gives the same unit.
+		"""
+		key = (operator, self, other)
+		unit = _combinations.get(key)
+		if unit is not None:
+			return unit
+
+		if operator == '^':
+			self._check_operand(self)
+			name, symbol = f"{self.name}^{other}", f"{self._operand_symbol('·/^')}^{other}"
+			dimension = None if self._dimension is None else power_dimension(self._dimension, other)
+			scale = self._scale ** other
+		else:
+			self._check_operand(other)
+			if operator == '*':
+				name, symbol = f"{self.name} {other.name}", f"{self._operand_symbol('/')}·{other._operand_symbol('/')}"
+				combine_dimensions, scale = multiply_dimensions, self._scale * other._scale
+			else:
+				name, symbol = f"{self.name} per {other.name}", f"{self._operand_symbol('')}/{other._operand_symbol('·/')}"
+				combine_dimensions, scale = divide_dimensions, self._scale / other._scale
+			dimension = None if self._dimension is None or other._dimension is None else combine_dimensions(self._dimension, other._dimension)
+
+		if self._frozen and (operator == '^' or other._frozen):
+			# the result may be a unit of DERIVED_UNIT (metre / second is DerivedUnit.metre_per_second())
+			unit = _units_by_symbol.get(symbol)
+			if unit is None or unit._dimension != dimension or unit._scale != scale or unit._offset != 0:
+				unit = intern_unit(name, symbol, dimension=dimension, scale=scale)
+			_combinations[key] = unit
+			return unit
+		return DerivedUnit(name, symbol, dimension=dimension, scale=scale)
+
+	def _check_operand(self, other: 'Unit'):
+		if not isinstance(other, Unit):
+			raise ValueError(f"Can't combine a unit with a {type(other)}")
+		if self._offset != 0 or other._offset != 0:
+			raise ValueError(f"Can't combine units with an offset ({self.symbol}, {other.symbol})")
+
+	def __reduce_ex__(self, protocol: int):
+		"""Pickle an interned unit by its key: the symbol for a unit of BASE_UNITS or DERIVED_UNIT,
+		the arguments of 'intern_unit' otherwise, so it's interned again when it's loaded
+		"""
+		if not self._frozen:
+			return object.__reduce_ex__(self, protocol)
+		if _units_by_symbol.get(self._symbol) is self:
+			return get_unit, (self._symbol,)
+		return intern_unit, (self._name, self._symbol, self._description, self._dimension, self._scale, self._offset)
+
+	def _check_mutable(self):
+		if self._frozen:
+			raise AttributeError(f"The unit '{self}' is interned, it can't be modified")
+
+	def _operand_symbol(self, operators: str) -> str:
+		"""Return the symbol, between parentheses if it contains one of 'operators'"""
+		if any(char in self._symbol for char in operators):
+			return f"({self._symbol})"
+		return self._symbol
+
 	@property
 	def name(self) -> str:
 		return self._name
@@ -137,24 +355,124 @@ class Unit:
 	def description(self) -> str:
 		return self._description
 
+	@property
+	def dimension(self) -> Dimension:
+		return self._dimension
+
+	@property
+	def scale(self) -> float:
+		return self._scale
+
+	@property
+	def offset(self) -> float:
+		return self._offset
+
+	@property
+	def frozen(self) -> bool:
+		"""True if the unit is interned (immutable)"""
+		return self._frozen
+
 	@name.setter
 	def name(self, new_name: str):
+		self._check_mutable()
 		if not isinstance(new_name, str):
 			raise ValueError(f"'name' must be a str not a {type(new_name)}")
 		self._name = new_name
 			
 	@symbol.setter
 	def symbol(self, new_symbol: str):
+		self._check_mutable()
 		if not isinstance(new_symbol, str):
-			raise ValueError(f"'symbol' must be a str not a {type(new_name)}")
+			raise ValueError(f"'symbol' must be a str not a {type(new_symbol)}")
 		self._symbol = new_symbol
 
 	@description.setter
 	def description(self, new_desc: str):
+		self._check_mutable()
 		if not isinstance(new_desc, str):
 			raise ValueError(f"'description' must be a str not a {type(new_desc)}")
 		self._description = new_desc
 
+	def is_compatible(self, other: 'Unit') -> bool:
+		"""Return True if a value of 'other' can be converted in this unit (same dimension or
+		connected in conversion.REGISTRY)
+		"""
+		if other is self:
+			return True
+		if self._dimension is None or other._dimension is None:
+			return self._symbol == other._symbol or conversion.REGISTRY.is_connected(self, other)
+		return self._dimension == other._dimension or conversion.REGISTRY.is_connected(self, other)
+
+	def conversion_to(self, other: 'Unit') -> Tuple[float, float]:
+		"""Return (scale, offset) such as a value 'v' in this unit is 'v * scale + offset' in 'other'.
+		The transform of conversion.REGISTRY is used if the units are registered, else it's computed
+		from the scales and offsets of units.
+		"""
+		transform = conversion.REGISTRY.lookup(self, other)
+		if transform is not None:
+			return transform
+		if not self.is_compatible(other):
+			raise ValueError(f"Can't convert '{self}' in '{other}'")
+		return self._scale / other._scale, (self._offset - other._offset) / other._scale
+
+	def convert_from(self, value, unit: 'Unit'):
+		"""Convert 'value' (a float or an array, without prefix) defined with 'unit' in this unit"""
+		if unit is self:
+			return value
+		scale, offset = unit.conversion_to(self)
+		if scale == 1 and offset == 0:
+			return value
+		return value * scale + offset
+
+	def convert_difference_from(self, value, unit: 'Unit'):
+		"""Convert a difference of values (a float or an array) defined with 'unit' in this unit.
+		Unlike 'convert_from', offsets are ignored: a difference of 1 °C is a difference of 1 K.
+		"""
+		if unit is self:
+			return value
+		scale = unit.conversion_to(self)[0]
+		return value if scale == 1 else value * scale
+
+	def difference_unit(self) -> 'Unit':
+		"""Return the unit of the differences of values of this unit, which can be combined with
+		other units: the unit itself if it has no offset, else the unit of BASE_UNITS or DERIVED_UNIT
+		with the same dimension and scale and no offset (K for °C), else the interned unit 'Δ<symbol>'
+		"""
+		if self._offset == 0:
+			return self
+		if self._dimension is not None:
+			for unit in _units_by_symbol.values():
+				if unit._offset == 0 and unit._scale == self._scale and unit._dimension == self._dimension:
+					return unit
+		return intern_unit(f"{self._name} difference", f"Δ{self._symbol}", dimension=self._dimension, scale=self._scale)
+
+	def normalization(self) -> Tuple[float, float, object]:
+		"""Return (scale, offset, key): a value 'v' of this unit is 'v * scale + offset' in the canonical
+		unit of its dimension (or of its group in conversion.REGISTRY), and 'key' identifies this canonical
+		unit. Values of compatible units are equal when their normalized values are equal.
+		"""
+		if _normalizations_version[0] != conversion.REGISTRY._version:
+			_normalizations.clear()
+			_normalizations_version[0] = conversion.REGISTRY._version
+		normalization = _normalizations.get(self)
+		if normalization is None:
+			canonical = None if self._dimension is not None else conversion.REGISTRY.canonical(self)
+			if canonical is not None:
+				representative, (scale, offset) = canonical
+				if representative._dimension is not None:
+					# a unit without dimension connected to units with a dimension
+					scale, offset = scale * representative._scale, offset * representative._scale + representative._offset
+					key = representative._dimension
+				else:
+					key = representative
+			else:
+				scale, offset = self._scale, self._offset
+				key = self._dimension if self._dimension is not None else self._symbol
+			normalization = (scale, offset, key)
+			if self._frozen:
+				_normalizations[self] = normalization
+		return normalization
+
 	def is_base_unit(self) -> bool:
 		return self._base_unit
 
@@ -170,13 +488,14 @@ class Unit:
 
 	def symbol_with_prefix(self, prefix: Union[str, float, Prefix]) -> str:
 		if isinstance(prefix, Prefix):
-			return prefix.symbol + self.name
+			return prefix.symbol + self.symbol
 		elif isinstance(prefix, (str, float)):
 			return PrefixEnum.get_prefix(prefix).symbol + self.symbol
 		raise ValueError(f"'prefix' must be a str or a Prefix, not {type(prefix)}")
 
 
 class BaseUnit(Unit):
+	__slots__ = ()
 	_base_unit = True
 
 	@staticmethod
@@ -220,8 +539,9 @@ class BaseUnit(Unit):
 		return BASE_UNITS['steradian']
 
 
-class DerivedUnit(Unit)
-	
+class DerivedUnit(Unit):
+	__slots__ = ()
+
 	@staticmethod
 	def celcius():
 		return DERIVED_UNIT['celcius']
@@ -230,22 +550,82 @@ class DerivedUnit(Unit)
 	def fahrenheit():
 		return DERIVED_UNIT['fahrenheit']
 
+	@staticmethod
+	def metre_per_second():
+		return DERIVED_UNIT['metre_per_second']
+
 
 BASE_UNITS = {
-	'metre': BaseUnit('Metre', 'm', description="The base unit of lenght."),
-	'meter': BaseUnit('Meter', 'm', description="The base unit of lenght"),
-	'second': BaseUnit('Second', 's', description="The base unit of time"),
-	'gram': BaseUnit('Gram', 'g', description="The base unit of mass"),
-	'kelvin': BaseUnit('Kelvin', 'K', description="The base unit of temperature"),
-	'mole': BaseUnit('Mole', 'mol', description="The base unit of amount of substance"),
-	'ampere': BaseUnit('Ampere', 'A', description="The base unit of electric current"),
-	'candela': BaseUnit('Candela', 'cd', description="The base unit of luminous intensity"),
-	'radian': BaseUnit('Radian', 'rad', description="The base unit of plane angle"),
-	'steradian': BaseUnit('Steradian', 'sr', description="The base unit of solid angle")
+	'metre': BaseUnit('Metre', 'm', description="The base unit of lenght.", dimension=make_dimension(length=1)),
+	'meter': BaseUnit('Meter', 'm', description="The base unit of lenght", dimension=make_dimension(length=1)),
+	'second': BaseUnit('Second', 's', description="The base unit of time", dimension=make_dimension(time=1)),
+	'gram': BaseUnit('Gram', 'g', description="The base unit of mass", dimension=make_dimension(mass=1)),
+	'kelvin': BaseUnit('Kelvin', 'K', description="The base unit of temperature", dimension=make_dimension(temperature=1)),
+	'mole': BaseUnit('Mole', 'mol', description="The base unit of amount of substance", dimension=make_dimension(amount=1)),
+	'ampere': BaseUnit('Ampere', 'A', description="The base unit of electric current", dimension=make_dimension(current=1)),
+	'candela': BaseUnit('Candela', 'cd', description="The base unit of luminous intensity", dimension=make_dimension(luminous_intensity=1)),
+	'radian': BaseUnit('Radian', 'rad', description="The base unit of plane angle", dimension=make_dimension(angle=1)),
+	'steradian': BaseUnit('Steradian', 'sr', description="The base unit of solid angle", dimension=make_dimension(solid_angle=1))
 }
 
 
 DERIVED_UNIT = {
-	'celcius': DerivedUnit('Celcius', '°C', description="The unit of Celcius temperature"),
-	'fahrenheit': DerivedUnit('Fahrenheit', '°F', description="The unit of Fahrenheit temperature")
-}
\ No newline at end of file
+	'celcius': DerivedUnit('Celcius', '°C', description="The unit of Celcius temperature", dimension=make_dimension(temperature=1), offset=273.15),
+	'fahrenheit': DerivedUnit('Fahrenheit', '°F', description="The unit of Fahrenheit temperature", dimension=make_dimension(temperature=1), scale=5/9, offset=459.67 * 5/9),
+	'metre_per_second': DerivedUnit('Metre per second', 'm/s', description="The unit of velocity", dimension=make_dimension(length=1, time=-1)),
+}
+
+# interned units by (name, symbol): the units of BASE_UNITS and DERIVED_UNIT, the units built from a str
+# and the results of operations on interned units
+_interned: Dict[Tuple[str, str], Unit] = {}
+_combinations: Dict[tuple, Unit] = {}  # (operator, unit, operand) -> interned result
+_units_by_symbol: Dict[str, Unit] = {}  # units of BASE_UNITS and DERIVED_UNIT by symbol, the first defined wins
+_intern_lock = threading.Lock()
+_normalizations: Dict[Unit, Tuple[float, float, object]] = {}  # cache of Unit.normalization for interned units
+_normalizations_version = [-1]  # version of conversion.REGISTRY of the cache
+
+
+def intern_unit(name: str, symbol: str = None, description: str = "", dimension: Dimension = None, scale: float = 1., offset: float = 0.) -> Unit:
+	"""Return the interned unit (name, symbol), created as a DerivedUnit the first time.
+	An interned unit is immutable and shared, so units are compared by identity.
+	Raise a ValueError if the unit is already interned with another dimension, scale or offset.
+	"""
+	symbol = name if symbol is None else symbol
+	key = (name, symbol)
+	unit = _interned.get(key)
+	if unit is None:
+		with _intern_lock:
+			unit = _interned.get(key)
+			if unit is None:
+				unit = DerivedUnit(name, symbol, description=description, dimension=dimension, scale=scale, offset=offset)
+				unit._frozen = True
+				_interned[key] = unit
+				return unit
+	if unit._dimension != (None if dimension is None else tuple(dimension)) or unit._scale != float(scale) or unit._offset != float(offset):
+		raise ValueError(f"The unit '{unit}' is already interned with the dimension {unit._dimension}, the scale {unit._scale} and the offset {unit._offset}")
+	return unit
+
+
+def get_unit(symbol: str) -> Unit:
+	"""Return the unit of BASE_UNITS or DERIVED_UNIT with this symbol, else the unit of the expression
+	'symbol' (see parse_unit, a prefix being included in the scale: 'km/s' is the unit of
+	parse_unit('km/s')), else the interned unit (symbol, symbol)
+	"""
+	unit = _units_by_symbol.get(symbol)
+	if unit is None:
+		from .parser import parse_unit, _prefixed_unit
+		try:
+			prefix, unit = parse_unit(symbol)
+		except errors.ParseError:
+			return intern_unit(symbol, symbol)
+		unit = _prefixed_unit(prefix, unit)
+	return unit
+
+
+for _unit in list(BASE_UNITS.values()) + list(DERIVED_UNIT.values()):
+	_unit._frozen = True
+	_interned.setdefault((_unit.name, _unit.symbol), _unit)
+	_units_by_symbol.setdefault(_unit.symbol, _unit)
+del _unit
+
+conversion.REGISTRY.register_units(list(BASE_UNITS.values()) + list(DERIVED_UNIT.values()))
@@ -0,0 +1,212 @@
+"""Compact binary format of quantities, to send them between processes or over a network.
+
+A message is a fixed header, a description of the values then the values:
+
+	magic b'PQ' | version (uint8) | kind (uint8: 0 Quantity, 1 QuantityArray) | length of the
+	description (uint16) | number of values (uint32)  -- little-endian
+	description: the name of the class, the unit and the base prefix (see '_describe')
+	values: float64 values without prefix, little-endian
+
+A unit of BASE_UNITS or DERIVED_UNIT and a prefix of PrefixEnum are written by their symbol and
+name only. The description of a (class, unit, base prefix) is built once and the one read from
+a message is parsed once, so a batch costs a header and 8 bytes per value.
+
+	data = pack(readings)      # a Quantity, a QuantityArray or a sequence of Quantity
+	readings = unpack(data)    # a Quantity or a QuantityArray
+"""
+from typing import Dict, Iterable, Tuple, Union
+import struct
+
+import numpy as np
+
+from . import Unit
+from .unit import Prefix, intern_unit, _STANDARD_PREFIXES, _units_by_symbol
+from .quantity import Quantity
+from .quantityArray import QuantityArray
+from . import errors
+
+
+MAGIC = b'PQ'
+VERSION = 1
+KIND_QUANTITY = 0
+KIND_ARRAY = 1
+
+CACHE_SIZE = 1024  # number of descriptions kept by pack and unpack
+
+_FIXED_HEADER = struct.Struct('<2sBBHI')
+_VALUE = struct.Struct('<d')
+_TRANSFORM = struct.Struct('<dd')
+
+# flags of the description
+_UNIT_BY_SYMBOL = 1
+_STANDARD_PREFIX = 2
+_NO_DIMENSION = 255
+
+_descriptions: Dict[Tuple[type, Unit, Prefix], bytes] = {}  # (class, unit, base prefix) -> description
+_parsed: Dict[bytes, Tuple[type, Unit, Prefix]] = {}  # description -> (class, unit, base prefix)
+
+
+def pack(quantities: Union[Quantity, QuantityArray, Iterable[Quantity]]) -> bytes:
+	"""Return the message of a Quantity, a QuantityArray or a sequence of Quantity (converted in the
+	unit of the first one, and read as a QuantityArray)
+	"""
+	if isinstance(quantities, Quantity):
+		description = _description(type(quantities), quantities._unit, quantities._base_prefix)
+		return _FIXED_HEADER.pack(MAGIC, VERSION, KIND_QUANTITY, len(description), 1) + description + _VALUE.pack(quantities._value)
+	cls = Quantity
+	if not isinstance(quantities, QuantityArray):
+		quantities = list(quantities)
+		cls = type(quantities[0]) if quantities and isinstance(quantities[0], Quantity) else Quantity
+		quantities = QuantityArray.from_quantities(quantities)
+	values = np.ascontiguousarray(quantities._values, dtype='<f8')
+	description = _description(cls, quantities._unit, quantities._base_prefix)
+	return b''.join((_FIXED_HEADER.pack(MAGIC, VERSION, KIND_ARRAY, len(description), len(values)), description, memoryview(values).cast('B')))
+
+
+def unpack(data: Union[bytes, bytearray, memoryview]) -> Union[Quantity, QuantityArray]:
+	"""Read a message written by 'pack': a Quantity (of the class given to 'pack') or a QuantityArray.
+	The values of a QuantityArray are copied from 'data'.
+	"""
+	data = memoryview(data).cast('B')
+	if len(data) < _FIXED_HEADER.size:
+		raise errors.ParseError("The message is too short")
+	magic, version, kind, length, count = _FIXED_HEADER.unpack_from(data)
+	if magic != MAGIC:
+		raise errors.ParseError("The data is not a message of quantities")
+	if version > VERSION:
+		raise errors.ParseError(f"The version {version} of the message is not supported")
+	start = _FIXED_HEADER.size + length
+	if len(data) != start + 8 * count:
+		raise errors.ParseError(f"The message has {len(data)} bytes, not {start + 8 * count}")
+	description = bytes(data[_FIXED_HEADER.size:start])
+	parsed = _parsed.get(description)
+	if parsed is None:
+		parsed = _cache(_parsed, description, _parse(description))
+	cls, unit, base_prefix = parsed
+	if kind == KIND_QUANTITY:
+		if count != 1:
+			raise errors.ParseError(f"A message of a quantity has 1 value, not {count}")
+		return cls._new(_VALUE.unpack_from(data, start)[0], unit, base_prefix)
+	elif kind == KIND_ARRAY:
+		values = np.frombuffer(data, dtype='<f8', count=count, offset=start).astype(np.float64)
+		return QuantityArray._new(values, unit, base_prefix)
+	raise errors.ParseError(f"Unknown kind of message {kind}")
+
+
+def _cache(cache: dict, key, value):
+	if len(cache) >= CACHE_SIZE:
+		cache.clear()
+	cache[key] = value
+	return value
+
+
+def _description(cls: type, unit: Unit, base_prefix: Prefix) -> bytes:
+	key = (cls, unit, base_prefix)
+	description = _descriptions.get(key)
+	if description is None:
+		description = _describe(cls, unit, base_prefix)
+		if unit.frozen:  # the description of a unit which can be changed is not kept
+			_cache(_descriptions, key, description)
+	return description
+
+
+def _describe(cls: type, unit: Unit, base_prefix: Prefix) -> bytes:
+	"""Return the description: flags (uint8), the name of the class, then the symbol of a unit of
+	BASE_UNITS or DERIVED_UNIT, or the name, the symbol, the description, the dimension (number of
+	exponents, 255 without dimension, then int8 exponents), the scale and the offset of the unit,
+	then the name of a prefix of PrefixEnum or the name, the symbol and the value of the prefix.
+	Strings are utf-8, with their length as uint8 (uint16 for the description of the unit).
+	"""
+	flags = 0
+	parts = [_string(cls.__name__ if cls is not Quantity else '')]
+	if _units_by_symbol.get(unit.symbol) is unit:
+		flags |= _UNIT_BY_SYMBOL
+		parts.append(_string(unit.symbol))
+	else:
+		dimension = unit.dimension
+		parts += [
+			_string(unit.name), _string(unit.symbol), _string(unit.description, 'H'),
+			struct.pack('<B', _NO_DIMENSION) if dimension is None else struct.pack(f'<B{len(dimension)}b', len(dimension), *dimension),
+			_TRANSFORM.pack(unit.scale, unit.offset),
+		]
+	parts.append(_string(base_prefix.name))
+	if _STANDARD_PREFIXES.get(base_prefix.name) == base_prefix:
+		flags |= _STANDARD_PREFIX
+	else:
+		parts += [_string(base_prefix.symbol), _VALUE.pack(base_prefix.value)]
+	return struct.pack('<B', flags) + b''.join(parts)
+
+
+def _string(text: str, length_format: str = 'B') -> bytes:
+	encoded = text.encode('utf-8')
+	limit = 255 if length_format == 'B' else 65535
+	if len(encoded) > limit:
+		raise ValueError(f"'{text[:20]}...' is longer than {limit} bytes in utf-8")
+	return struct.pack(f'<{length_format}', len(encoded)) + encoded
+
+
+class _Reader:
+	"""Read the fields of a description"""
+
+	def __init__(self, data: bytes):
+		self.data = data
+		self.position = 0
+
+	def unpack(self, format: str) -> tuple:
+		values = struct.unpack_from(format, self.data, self.position)
+		self.position += struct.calcsize(format)
+		return values
+
+	def string(self, length_format: str = 'B') -> str:
+		length, = self.unpack(f'<{length_format}')
+		text = self.data[self.position:self.position + length].decode('utf-8')
+		self.position += length
+		return text
+
+
+def _parse(description: bytes) -> Tuple[type, Unit, Prefix]:
+	"""Return (class, unit, base prefix) of a description written by '_describe'"""
+	reader = _Reader(description)
+	try:
+		flags, = reader.unpack('<B')
+		cls = _quantity_class(reader.string())
+		if flags & _UNIT_BY_SYMBOL:
+			symbol = reader.string()
+			unit = _units_by_symbol.get(symbol)
+			if unit is None:
+				raise errors.ParseError(f"Unknown unit '{symbol}'")
+		else:
+			name, symbol, text = reader.string(), reader.string(), reader.string('H')
+			size, = reader.unpack('<B')
+			dimension = None if size == _NO_DIMENSION else reader.unpack(f'<{size}b')
+			scale, offset = reader.unpack(_TRANSFORM.format)
+			unit = intern_unit(name, symbol, description=text, dimension=dimension, scale=scale, offset=offset)
+		name = reader.string()
+		if flags & _STANDARD_PREFIX:
+			base_prefix = _STANDARD_PREFIXES.get(name)
+			if base_prefix is None:
+				raise errors.ParseError(f"Unknown prefix '{name}'")
+		else:
+			symbol = reader.string()
+			value, = reader.unpack('<d')
+			base_prefix = Prefix(name, symbol, value)
+	except errors.ParseError:
+		raise
+	except (struct.error, UnicodeDecodeError, ValueError, TypeError) as e:
+		# ValueError: a unit interned with another scale, a malformed unit or prefix
+		raise errors.ParseError(f"Invalid description of quantities: {e}") from None
+	return cls, unit, base_prefix
+
+
+def _quantity_class(name: str) -> type:
+	"""Return the subclass of Quantity with this name (Quantity if it's unknown)"""
+	if not name:
+		return Quantity
+	from . import commonQuantity  # noqa: F401, the common quantities are subclasses of Quantity
+	classes = [Quantity]
+	while classes:
+		cls = classes.pop()
+		if cls.__name__ == name:
+			return cls
+		classes.extend(cls.__subclasses__())
+	return Quantity
@@ -1,4 +1,4 @@
-from pyquantity import PrefixEnum, BaseUnit, Quantity
+from pyquantity import PrefixEnum, BaseUnit, Quantity, QuantityArray, parse_quantity, parse_unit, lazy
 
 
 def test_prefix():
@@ -7,9 +7,38 @@ def test_prefix():
 	
 	PrefixEnum.add_prefix('custom', 'R', 1e30)
 	print(PrefixEnum.custom)
+	assert PrefixEnum.get_prefix('R') is PrefixEnum.get_prefix('custom') is PrefixEnum.get_prefix(1e30) is PrefixEnum.custom
 
 	PrefixEnum.remove_prefix('custom')
 	print([mb for mb in dir(PrefixEnum) if not mb.startswith('_')])
+	from pyquantity import errors
+	for arg in ('R', 'custom', 1e30):
+		try:
+			PrefixEnum.get_prefix(arg)
+			raise AssertionError(f"the prefix {arg} was removed")
+		except errors.PrefixError:
+			pass
+	assert PrefixEnum.get_prefix('k') is PrefixEnum.kilo and PrefixEnum.get_prefix(1e3) is PrefixEnum.kilo
+
+
+def test_conversion_cache():
+	PrefixEnum.clear_conversion_cache()
+	assert PrefixEnum.conversion_cache_info().currsize == 0
+	assert PrefixEnum.get_conversion_factor('k', 'm') == 1e6 and PrefixEnum.get_conversion_factor(PrefixEnum.kilo, PrefixEnum.mili) == 1e6
+	assert PrefixEnum.get_conversion_factor('k', 'm') == 1e6 and PrefixEnum.get_conversion_factor(None, 'k') == 1e-3
+	info = PrefixEnum.conversion_cache_info()
+	print("conversion cache: ", info)
+	assert (info.hits, info.misses, info.currsize) == (1, 3, 3)
+	# the factors are computed again when prefixes change
+	PrefixEnum.add_prefix('custom', 'R', 1e30)
+	try:
+		assert PrefixEnum.conversion_cache_info().currsize == 0
+		assert PrefixEnum.get_conversion_factor('custom', PrefixEnum.none) == 1e30
+		PrefixEnum.add_prefix('custom', 'R', 1e27)
+		assert PrefixEnum.get_conversion_factor('custom', PrefixEnum.none) == 1e27 and PrefixEnum.get_conversion_factor('R', 'k') == 1e24
+	finally:
+		PrefixEnum.remove_prefix('custom')
+	assert PrefixEnum.conversion_cache_info().currsize == 0
 
 
 def base_unit():
@@ -36,12 +65,452 @@ def test_operations():
 	q2 = Quantity(21.3, BaseUnit.meter())
 	print(q1 < q2)
 	print(q1 == q2)
-	print(q1 > 15)
-	print(q2 > 15)
+	print(q1.value > 15)
+	print(q2.value > 15)
+
+
+def test_quantity_array():
+	a = QuantityArray([1.5, 2., 3.], BaseUnit.meter(), prefix=PrefixEnum.kilo)
+	print(a)
+	print('a.k: ', a.k)
+	print('a < 2500: ', a < 2500)
+	print('a == q: ', a == Quantity(2000., BaseUnit.meter()))
+	print('-a: ', -a)
+	print(QuantityArray.from_quantities([Quantity(1., BaseUnit.meter()), Quantity(2., BaseUnit.meter())]))
+	lengths = QuantityArray([1.5, 2.], BaseUnit.meter(), base_prefix=PrefixEnum.kilo)
+	lengths.value = lengths.value
+	print('base prefix: ', lengths)
+
+
+def test_parser():
+	for text in ("12.5 km", "3 ms", "9.81 m/s^2", "4 dam", "2 mmol"):
+		print(f"parse_quantity('{text}'): ", repr(parse_quantity(text)))
+	print("parse_unit('kg'): ", parse_unit('kg'))
+	from pyquantity import errors
+	metre, second, mole, gram = BaseUnit.metre(), BaseUnit.second(), BaseUnit.mole(), BaseUnit.gram()
+	# an exact unit wins over a prefix ('mol', 'cd', 'm'), else the longest prefix ('dam' is deca-metre)
+	for text, (prefix, unit) in (("mmol", (PrefixEnum.mili, mole)), ("mol", (PrefixEnum.none, mole)), ("dam", (PrefixEnum.deca, metre)),
+			("ms", (PrefixEnum.mili, second)), ("m", (PrefixEnum.none, metre)), ("cd", (PrefixEnum.none, BaseUnit.candela())),
+			("kg", (PrefixEnum.kilo, gram)), ("µm", (PrefixEnum.micro, metre)), ("μm", (PrefixEnum.micro, metre))):
+		parsed = parse_unit(text)
+		assert parsed[0] is prefix and parsed[1] is unit, (text, parsed)
+	# the cache and the prefixes of the parser follow PrefixEnum
+	PrefixEnum.add_prefix('custom', 'R', 1e30)
+	try:
+		parsed = parse_unit('Rm')
+		assert parsed[0] is PrefixEnum.custom and parsed[1] is metre
+	finally:
+		PrefixEnum.remove_prefix('custom')
+	try:
+		parse_unit('Rm')
+		raise AssertionError("the prefix 'R' was removed")
+	except errors.ParseError:
+		pass
+
+
+def test_reader():
+	import io
+	from pyquantity import read_quantity_columns
+	source = io.StringIO("distance [km],duration (s)\n1.5,30\n2,45\n0.5,10\n")
+	for chunk in read_quantity_columns(source, chunk_size=2):
+		print("chunk: ", chunk)
+	source = io.StringIO("weight,unit\n30,kg\n45,kg\n10,g\n")
+	for chunk in read_quantity_columns(source, unit_column='unit', as_array=False):
+		print("unit column: ", chunk)
+	try:
+		next(read_quantity_columns(io.StringIO("distance [km]\n1.5\n"), columns=[]))
+	except ValueError as e:
+		print("no column: ", e)
+	from pyquantity import errors
+	try:
+		list(read_quantity_columns(io.StringIO("weight,unit\n30,kg\n45\n"), unit_column='unit'))
+		raise AssertionError("a row without unit must raise a ParseError")
+	except errors.ParseError as e:
+		assert str(e).startswith("Line 3:"), e
+		print("no unit: ", e)
+	# interleaved units are converted in the unit of the first row, the chunks keep their size
+	import math
+	source = io.StringIO("weight,unit\n" + "".join(f"{i + 1},{'kg' if i % 2 == 0 else 'g'}\n" for i in range(8)))
+	chunks = list(read_quantity_columns(source, unit_column='unit', chunk_size=3))
+	assert [len(chunk['weight']) for chunk in chunks] == [3, 3, 2]
+	assert all(chunk['weight'].unit is BaseUnit.gram() and chunk['weight'].base_prefix is PrefixEnum.kilo for chunk in chunks)
+	grams = [value for chunk in chunks for value in chunk['weight'].values.tolist()]
+	expected = [(i + 1) * (1000. if i % 2 == 0 else 1.) for i in range(8)]
+	assert all(math.isclose(value, reference) for value, reference in zip(grams, expected)), grams
+	assert len(list(read_quantity_columns(io.StringIO("weight,unit\n1,kg\n2,g\n3,kg\n4,g\n"), unit_column='unit', chunk_size=100))) == 1
+	try:
+		list(read_quantity_columns(io.StringIO("weight,unit\n1,kg\n2,m\n"), unit_column='unit'))
+		raise AssertionError("a unit incompatible with the first one must raise a ParseError")
+	except errors.ParseError as e:
+		assert str(e).startswith("Line 3:"), e
+
+def test_formatting():
+	from pyquantity import format_quantity, format_quantities, get_unit
+	for text in ("0.00042 m", "1500 m", "0.000001 m^2", "2e-3 m^3", "3000 m/s"):
+		print(f"format_quantity('{text}'): ", format_quantity(parse_quantity(text)))
+	areas = QuantityArray([1e-6, 3., 2e7], BaseUnit.metre() ** 2)
+	print("format_quantities: ", format_quantities(areas, sep=", "), "|", format_quantities([parse_quantity("0.00042 m"), parse_quantity("1e-6 m^2")], sep=", "))
+	# the prefix of the unit is replaced, not stacked ("1 mkm")
+	kilometres = QuantityArray([0.001, 5000.], get_unit('km'))
+	assert [format_quantity(quantity) for quantity in kilometres] == ["1 m", "5 Mm"]
+	assert format_quantities(kilometres, sep=", ") == "1 m, 5 Mm"
+	for text, expected in (("2e-3 m^3", "2 dm^3"), ("2000 cm^3", "2 dm^3"), ("1e-6 m^2", "1 mm^2"), ("3 km/s", "3 km/s"), ("20 °C", "20 °C")):
+		assert format_quantity(parse_quantity(text)) == expected, (text, format_quantity(parse_quantity(text)))
+	# suffixes are cached by (symbol, prefix), and the units displayed are recomputed when prefixes change
+	from pyquantity import formatting
+	format_quantity(parse_quantity("1500 m"))
+	hits = formatting._suffix.cache_info().hits
+	format_quantity(parse_quantity("2500 m"))
+	assert formatting._suffix.cache_info().hits == hits + 1
+	PrefixEnum.add_prefix('custom', 'R', 1e30)
+	try:
+		assert format_quantity(parse_quantity("1500 m")) == "1.5 km" and formatting._display_unit.cache_info().currsize == 1
+	finally:
+		PrefixEnum.remove_prefix('custom')
+
+
+def test_expression():
+	metre, second = BaseUnit.metre(), BaseUnit.second()
+	distances = QuantityArray([1., 2., 3.], metre, base_prefix=PrefixEnum.kilo)
+	offsets = QuantityArray([10., 20., 30.], metre)
+	times = QuantityArray([10., 20., 40.], second)
+	print("eager: ", (distances + offsets) / times)
+	distance, offset, time = lazy(distances, offsets, times)
+	speed = (distance + offset) / time
+	print("lazy: ", speed, speed.evaluate())
+	print("scalar: ", (lazy(Quantity(2., metre)) * 3 + 1).evaluate())
+	# the fused evaluation gives the eager result, element by element, with its unit and base prefix
+	for eager, fused in (((distances + offsets) / times, speed.evaluate()), (distances + offsets, (distance + offset).evaluate()), (distances * 2 - offsets, (distance * 2 - offset).evaluate())):
+		assert fused.values.tolist() == eager.values.tolist(), (fused, eager)
+		assert fused.unit is eager.unit and fused.base_prefix == eager.base_prefix, (fused, eager)
+	assert (distance + offset).evaluate().base_prefix is PrefixEnum.kilo and (distance + offset).evaluate().values.tolist() == [1010., 2020., 3030.]
+	eager, fused = Quantity(2., metre) * 3 + 1, (lazy(Quantity(2., metre)) * 3 + 1).evaluate()
+	assert type(fused) is type(eager) and fused.value == eager.value == 7. and fused.unit is eager.unit and fused.base_prefix == eager.base_prefix
+
+
+def test_temperature():
+	from pyquantity.commonQuantity import AbsoluteTemperature, CelsiusTemperature
+	temperature = AbsoluteTemperature(300.)
+	print("300 K: ", temperature.celcius, "°C", temperature.fahrenheit, "°F")
+	temperature.fahrenheit = 212.
+	print("212 °F: ", temperature)
+	print("K -> °F: ", AbsoluteTemperature.to_fahrenheit_array([0., 273.15, 373.15]))
+	print("°F -> °C: ", CelsiusTemperature.from_fahrenheit_array([-40., 212.]))
+	import math
+	import numpy as np
+	from pyquantity import DerivedUnit
+	from pyquantity.commonQuantity import convert_temperatures, temperature_transform, TRANSFORM_BLOCK_SIZE
+	fahrenheit, kelvin, celcius = DerivedUnit.fahrenheit(), BaseUnit.kelvin(), DerivedUnit.celcius()
+	assert np.allclose(CelsiusTemperature.from_fahrenheit_array([-40., 212.]), [-40., 100.], rtol=1e-14, atol=0)
+	assert np.allclose(AbsoluteTemperature.to_fahrenheit_array([0., 273.15, 373.15]), [-459.67, 32., 212.], rtol=1e-14, atol=0)
+	for values, chain, expected in (([-40., 32., 212.], (fahrenheit, kelvin, celcius), [-40., 0., 100.]), ([-40., 0., 100.], (celcius, kelvin, fahrenheit), [-40., 32., 212.])):
+		result = convert_temperatures(values, *chain).tolist()
+		assert all(math.isclose(value, reference, rel_tol=1e-14, abs_tol=1e-12) for value, reference in zip(result, expected)), result
+	# °F -> K -> °C -> K -> °F round trip, by blocks, in place
+	readings = np.linspace(-100., 300., 3 * TRANSFORM_BLOCK_SIZE + 7)
+	values = readings.copy()
+	convert_temperatures(values, fahrenheit, kelvin, celcius, out=values)
+	convert_temperatures(values, celcius, kelvin, fahrenheit, out=values)
+	assert np.allclose(values, readings, rtol=1e-14, atol=1e-12)
+	scale, offset = temperature_transform(fahrenheit, kelvin, celcius)
+	assert np.array_equal(convert_temperatures(readings, fahrenheit, kelvin, celcius), readings * scale + offset)
+	from pyquantity.commonQuantity import Mass
+	mass = Mass(2.)
+	mass.value = mass.value
+	print("value round trip: ", mass)
+
+
+def test_conversion():
+	from pyquantity import Unit, DerivedUnit, conversion
+	rankine = Unit('Rankine', '°R')
+	conversion.REGISTRY.register(rankine, BaseUnit.kelvin(), scale=5/9)
+	print("°R -> °F: ", conversion.REGISTRY.get_transform(rankine, DerivedUnit.fahrenheit()))
+	print("491.67 °R in °C: ", conversion.REGISTRY.convert(491.67, rankine, DerivedUnit.celcius()))
+	# °R -> K -> °C and °R -> K -> °F come from the transitive closure
+	import math
+	assert math.isclose(conversion.REGISTRY.convert(491.67, rankine, DerivedUnit.celcius()), 0., abs_tol=1e-9)
+	scale, offset = conversion.REGISTRY.get_transform(rankine, DerivedUnit.fahrenheit())
+	assert math.isclose(scale, 1., rel_tol=1e-12) and math.isclose(offset, -459.67, rel_tol=1e-12), (scale, offset)
+
+
+def test_buffer():
+	import numpy as np
+	from array import array
+	samples = array('d', [1.5, 2.5, 3.5])
+	lengths = QuantityArray.from_buffer(samples, BaseUnit.metre())
+	samples[0] = 10.
+	print("shared buffer: ", lengths, np.shares_memory(np.frombuffer(samples), np.asarray(lengths)))
+	print("metadata: ", lengths.metadata)
+	assert np.shares_memory(np.frombuffer(samples), np.asarray(lengths)) and lengths.values.tolist() == [10., 2.5, 3.5]
+	# the buffer exported by the array: to_memoryview on any version, the buffer protocol on 3.12+
+	import sys
+	view = lengths.to_memoryview()
+	view[1] = 20.
+	assert samples[1] == 20. and view.format == 'd' and view.readonly is False
+	if sys.version_info >= (3, 12):
+		assert np.shares_memory(np.frombuffer(memoryview(lengths)), np.frombuffer(samples))
+	# a read-only buffer gives read-only values, a prefix gives a converted copy
+	data = np.array([1., 2.], dtype=np.float64).tobytes()
+	frozen = QuantityArray.from_buffer(data, BaseUnit.metre())
+	assert frozen.values.tolist() == [1., 2.] and not frozen.values.flags.writeable
+	assert np.shares_memory(np.frombuffer(data), np.asarray(frozen))
+	try:
+		frozen += Quantity(1., BaseUnit.metre())
+		raise AssertionError("the values of a bytes object can't be changed in place")
+	except ValueError:
+		pass
+	kilometres = QuantityArray.from_buffer(samples, BaseUnit.metre(), prefix=PrefixEnum.kilo)
+	assert kilometres.values.tolist() == [10000., 20000., 3500.] and not np.shares_memory(np.frombuffer(samples), np.asarray(kilometres))
+
+
+def test_storage():
+	import os
+	import tempfile
+	from pyquantity import write_column, open_column
+	with tempfile.TemporaryDirectory() as directory:
+		path = os.path.join(directory, 'times.pqc')
+		write_column(path, QuantityArray([1.5, 2.5, 3.5], BaseUnit.second(), base_prefix=PrefixEnum.mili), dtype='int64', prefix=PrefixEnum.micro)
+		column = open_column(path)
+		print(column, column[0], column[1:])
+		del column  # unmap the file before the directory is removed
+		# prefixes are stored by their name in PrefixEnum, 'none' included
+		from pyquantity.storage import read_header
+		write_column(path, QuantityArray([1., 2.], BaseUnit.metre()))
+		assert read_header(path)['prefix'] == read_header(path)['base_prefix'] == 'none'
+		column = open_column(path)
+		assert column.prefix is PrefixEnum.none and column.base_prefix is PrefixEnum.none
+		del column
+		# a corrupt header is a ParseError: an unknown prefix, a missing field, a unit conflicting with an interned unit
+		from pyquantity import errors
+		with open(path, 'rb') as file:
+			data = file.read()
+		for old, new in (b'"prefix": "none"', b'"prefix": "nope"'), (b'"dtype"', b'"dtypo"'), (b'"scale": 1.0', b'"scale": 2.0'):
+			with open(path, 'wb') as file:
+				file.write(data.replace(old, new, 1))
+			try:
+				open_column(path)
+				raise AssertionError(f"a header with {new} must raise a ParseError")
+			except errors.ParseError as e:
+				print("corrupt header: ", e)
+
+
+def test_parallel():
+	from pyquantity import DerivedUnit, parallel_convert, parallel_reduce, open_column
+	temperatures = QuantityArray([273.15, 293.15, 373.15], BaseUnit.kelvin())
+	print("serial: ", parallel_convert(temperatures, DerivedUnit.celcius()), parallel_reduce(temperatures, 'mean'))
+	print("parallel: ", parallel_convert(temperatures, DerivedUnit.celcius(), threshold=0, chunk_size=2, workers=2))
+	# with threads, the blocks stay registered in the tracker of this process, which unlinks them
+	from concurrent.futures import ThreadPoolExecutor
+	with ThreadPoolExecutor(2) as executor:
+		converted = parallel_convert(temperatures, DerivedUnit.celcius(), threshold=0, chunk_size=2, executor=executor)
+		mean = parallel_reduce(temperatures, 'mean', threshold=0, chunk_size=2, executor=executor)
+	assert list(converted.values) == list(parallel_convert(temperatures, DerivedUnit.celcius()).values)
+	assert mean == parallel_reduce(temperatures, 'mean')
+	# a column file written again is read again, not through the mapping of a previous call
+	import os
+	import tempfile
+	from pyquantity import write_column
+	with tempfile.TemporaryDirectory() as directory, ThreadPoolExecutor(2) as executor:
+		path = os.path.join(directory, 'values.pqc')
+		for values in ([1., 2., 3.], [10., 20., 30., 40.]):
+			write_column(path, QuantityArray(values, BaseUnit.metre()))
+			total = parallel_reduce(open_column(path), 'sum', threshold=0, chunk_size=2, executor=executor)
+			assert total.value == sum(values), (total, values)
+
+
+def test_intern():
+	from pyquantity import intern_unit
+	print("same unit for 'm': ", Quantity(1., 'm').unit is Quantity(2., 'm').unit is BaseUnit.metre())
+	print("same product: ", BaseUnit.metre() * BaseUnit.second() is BaseUnit.metre() * BaseUnit.second())
+	print("interned: ", intern_unit('Rankine', '°R', scale=5/9) is intern_unit('Rankine', '°R', scale=5/9))
+	print("same unit for 'km/s': ", Quantity(1., 'km/s').unit is parse_quantity('1 km/s').unit, Quantity(1., 'km/s') == parse_quantity('1 km/s'))
+	from pyquantity import get_unit
+	assert Quantity(1., 'm').unit is Quantity(2., 'm').unit is BaseUnit.metre()
+	assert get_unit('m') is get_unit('m') and get_unit('km/s') is get_unit('km/s') is parse_unit('km/s')[1]
+	assert get_unit('furlong') is get_unit('furlong')
+	assert BaseUnit.metre() * BaseUnit.second() is BaseUnit.metre() * BaseUnit.second()
+	from pyquantity import DerivedUnit
+	assert BaseUnit.metre() / BaseUnit.second() is DerivedUnit.metre_per_second() is get_unit('m/s') is parse_unit('m/s')[1]
+	assert Quantity(1., 'km/s') == parse_quantity('1 km/s') and hash(Quantity(1., 'km/s')) == hash(parse_quantity('1 km/s'))
+
+
+def test_sorting():
+	from pyquantity import sorted_quantities, argsort
+	from pyquantity.commonQuantity import AbsoluteTemperature, CelsiusTemperature
+	print("hash: ", hash(parse_quantity('1 km')) == hash(parse_quantity('1000 m')), hash(CelsiusTemperature(0.)) == hash(AbsoluteTemperature(273.15)))
+	lengths = [parse_quantity(text) for text in ('2 km', '30 m', '1.5 km', '400 mm')]
+	print("sorted: ", sorted_quantities(lengths), argsort(lengths, reverse=True))
+	assert hash(parse_quantity('1 km')) == hash(parse_quantity('1000 m')) and parse_quantity('1 km') == parse_quantity('1000 m')
+	assert hash(CelsiusTemperature(0.)) == hash(AbsoluteTemperature(273.15)) and CelsiusTemperature(0.) == AbsoluteTemperature(273.15)
+	assert [id(quantity) for quantity in sorted_quantities(lengths)] == [id(lengths[index]) for index in (3, 1, 2, 0)]
+	assert sorted_quantities(lengths) == sorted(lengths) == sorted(lengths, key=Quantity.sort_key)
+	assert argsort(lengths, reverse=True) == [0, 2, 1, 3]
+	assert argsort(iter(lengths), reverse=True) == [0, 2, 1, 3] and sorted_quantities(quantity for quantity in lengths) == sorted(lengths)
+	# a number is never equal to a quantity, as their hashes can't agree, nor ordered with it
+	assert Quantity(5., 'm') != 5 and not Quantity(5., 'm') == 5 and len({Quantity(5., 'm'), 5}) == 2
+	for compare in (lambda q: q < 6, lambda q: q <= 5, lambda q: q >= 5, lambda q: 4 < q):
+		try:
+			compare(Quantity(5., 'm'))
+			raise AssertionError("a quantity can't be ordered with a number")
+		except TypeError:
+			pass
+	assert Quantity(5., 'm').value == 5 and Quantity(5., 'm') <= Quantity(5., 'm') and Quantity(5., 'm') < Quantity(6., 'm')
+	print("foreign keys: ", parse_quantity('1 km') == None, parse_quantity('1 km') == parse_quantity('1 kg'), parse_quantity('1 km') in {None, 'km'})
+	import random
+	random.seed(0)
+	for _ in range(20000):
+		value = round(random.uniform(-1e3, 1e3), 3)
+		first = parse_quantity(f"{value} mm")
+		second = random.choice((parse_quantity(f"{value / 1e3} m"), parse_quantity(f"{value / 1e6} km"), Quantity(value / 1e3, 'm')))
+		assert first != second or hash(first) == hash(second), (first, second)
+		assert (first == second) == (first.sort_key() == second.sort_key()), (first, second)
+
+
+def test_aggregation():
+	from pyquantity.aggregation import Sum, MeanVariance, MinMax, Histogram, aggregate
+	from pyquantity.commonQuantity import Mass
+	total, statistics, extrema = aggregate((Mass(value) for value in (68.5, 72., 80.25)), Sum(), MeanVariance(), MinMax())
+	print(total.result(), statistics.mean(), statistics.std(), extrema.minimum(), extrema.maximum())
+	histogram = Histogram(parse_quantity('0 m'), parse_quantity('1 km'), 4).add(QuantityArray([10., 300., 420., 1200.], 'm'))
+	print(histogram.counts, histogram.overflow, statistics.merge(MeanVariance().add(Mass(75.))).mean())
+	from pyquantity.commonQuantity import CelsiusTemperature
+	temperatures = MeanVariance().extend([CelsiusTemperature(20.), CelsiusTemperature(30.)])
+	print("°C: ", temperatures.mean(), temperatures.std(), temperatures.variance())
+	assert str(temperatures.std()) == '5.0 K' and str(temperatures.variance()) == '25.0 K^2'
+
+
+def test_streaming():
+	import asyncio
+	from pyquantity import convert_stream
+	from pyquantity.commonQuantity import AbsoluteTemperature
+
+	async def readings():
+		for reading in [(21.5, '°C'), (300.,), (70., '°F')]:
+			yield reading
+
+	async def main():
+		async for batch in convert_stream(readings(), AbsoluteTemperature):
+			print(batch)
+
+	asyncio.run(main())
+
+	# a batch of at least offload_threshold readings is converted in the executor
+	from concurrent.futures import ThreadPoolExecutor
+	from pyquantity import StreamConverter
+
+	class CountingExecutor(ThreadPoolExecutor):
+		submitted = 0
+
+		def submit(self, *args, **kwargs):
+			CountingExecutor.submitted += 1
+			return super().submit(*args, **kwargs)
+
+	async def offload(executor):
+		converter = StreamConverter(AbsoluteTemperature, batch_size=8, offload_threshold=4, executor=executor)
+		for value in range(10):
+			converter.put_nowait(float(value), '°C')
+		converter.close()
+		return [batch.values.tolist() async for batch in converter]
+
+	with CountingExecutor(1) as executor:
+		batches = asyncio.run(offload(executor))
+	assert batches == [[value + 273.15 for value in range(8)], [8 + 273.15, 9 + 273.15]]
+	assert CountingExecutor.submitted == 1  # the batch of 2 readings is converted in the event loop
+	assert StreamConverter(AbsoluteTemperature, batch_size=100)._offload_threshold == 100
+	try:
+		StreamConverter(AbsoluteTemperature, batch_size=8, offload_threshold=16)
+		raise AssertionError("a threshold above the batch size must be rejected")
+	except ValueError:
+		pass
+
+
+def test_serialization():
+	import pickle
+	from pyquantity import wire
+	from pyquantity.commonQuantity import Mass
+	mass = Mass(2.5)
+	print("pickle: ", pickle.loads(pickle.dumps(mass)) == mass, len(pickle.dumps(mass)), "bytes")
+	print("wire: ", wire.unpack(wire.pack(mass)), wire.unpack(wire.pack([Mass(1.), Mass(2.)])), len(wire.pack(mass)), "bytes")
+	# a description conflicting with an interned unit is a ParseError, as any decoding failure
+	import struct
+	from pyquantity import errors
+	from pyquantity.unit import intern_unit
+	data = wire.pack(Quantity(1., intern_unit('wire_test', 'wt', dimension=BaseUnit.metre().dimension, scale=2.)))
+	try:
+		wire.unpack(data.replace(struct.pack('<d', 2.), struct.pack('<d', 3.), 1))
+		raise AssertionError("a conflicting unit must raise a ParseError")
+	except errors.ParseError as e:
+		print("conflicting unit: ", e)
+	# a message of a quantity without its value
+	single = wire.pack(mass)
+	try:
+		wire.unpack(single[:6] + struct.pack('<I', 0) + single[10:-8])
+		raise AssertionError("a message of a quantity without value must raise a ParseError")
+	except errors.ParseError as e:
+		print("no value: ", e)
+
+
+def test_converters():
+	from pyquantity import compile_converter, PrefixView
+	to_kelvin = compile_converter('°F', 'K')
+	to_km = compile_converter('mm', 'km', vectorized=True)
+	print("compiled: ", to_kelvin(70.), to_km([1e6, 2.5e6]))
+	kilo = PrefixView(PrefixEnum.kilo)
+	lengths = [parse_quantity('1500 m'), parse_quantity('20 km')]
+	print("view: ", kilo(lengths[0]), kilo.values(lengths))
+	import math
+	assert math.isclose(to_kelvin(70.), (70. + 459.67) * 5 / 9, rel_tol=1e-14) and math.isclose(to_kelvin(70.), 294.2611111111111, rel_tol=1e-14)
+	assert list(to_km([1e6, 2.5e6])) == [1., 2.5]
+	assert kilo(lengths[0]) == 1.5 and list(kilo.values(lengths)) == [1.5, 20.]
+
+
+def test_pandas():
+	import pandas as pd
+	import pyquantity.pandasExtension
+	distances = pd.Series(['1500 m', '30 m', '0.4 km'], dtype='quantity[m]')
+	print("series: ", distances.dtype, distances.tolist())
+	print("to km: ", distances.pq.to('k').tolist(), distances.pq.magnitude('k').tolist())
+	print("sorted: ", distances.sort_values().tolist(), distances.max(), distances.mean())
+	frame = pd.DataFrame({'sensor': ['a', 'b', 'a'], 'distance': distances})
+	print("groupby: ", frame.groupby('sensor')['distance'].sum().tolist())
+	from pyquantity.commonQuantity import CelsiusTemperature
+	temperatures = pd.Series([CelsiusTemperature(20.), CelsiusTemperature(30.)], dtype='quantity')
+	print("°C: ", type(temperatures[0]).__name__, temperatures.mean(), temperatures.std(), temperatures.var())
+	assert str(temperatures.std()) == str(pd.DataFrame({'k': [1, 1], 't': temperatures}).groupby('k')['t'].std().iloc[0]) == '7.0710678118654755 K'
+
+
+def test_instrumentation():
+	from pyquantity.instrumentation import instrumented, snapshot
+	distances = QuantityArray([1., 2., 3.], BaseUnit.metre())
+	with instrumented():
+		distances.value_to_prefix(PrefixEnum.kilo)
+		Quantity(2., BaseUnit.metre(), PrefixEnum.kilo)
+	functions = snapshot()['functions']
+	print("instrumentation: ", {label: stat['calls'] for label, stat in functions.items()})
+	assert functions['PrefixEnum._scale']['calls'] >= 2 and functions['PrefixEnum._get_conversion']['calls'] >= 2
 
 
 if __name__ == '__main__':
 	#test_prefix()
+	#test_conversion_cache()
 	#base_unit()
 	#test_quantity()
 	test_operations()
+	#test_quantity_array()
+	#test_parser()
+	#test_reader()
+	#test_formatting()
+	#test_expression()
+	#test_temperature()
+	#test_conversion()
+	#test_buffer()
+	#test_storage()
+	#test_parallel()
+	#test_intern()
+	#test_sorting()
+	#test_aggregation()
+	#test_streaming()
+	#test_serialization()
+	#test_converters()
+	#test_pandas()
+	#test_instrumentation()